@@ -0,0 +1,7 @@
+"""
+Sorting algorithm visualization.
+
+The core modules (sort_engine, metrics, distributions, replay, benchmark, ...) do not import tkinter, so
+headless runs and worker processes start without it. Only gui and render need tkinter; they are imported
+when the GUI is started.
+"""
@@ -0,0 +1,54 @@
+"""
+Command line entry point: python -m sorting_visualizer [COMMAND] [options]
+
+Without a command the GUI is started. The commands run headless and never import tkinter; -h or --help
+lists them.
+"""
+
+import importlib
+import sys
+
+
+### Command -> module with a main(argv) function
+COMMANDS = {
+    "benchmark": "benchmark",
+    "record": "replay",
+    "sonify": "sonify",
+    "export": "export",
+    "recommend": "recommend",
+    "external": "external",
+    "records": "records",
+    "stream": "stream",
+    "batch": "batch",
+}
+
+USAGE = """usage: python -m sorting_visualizer [-h] [COMMAND [options]]
+
+Without a command the GUI is started. Commands, each with its own --help:
+    {commands}"""
+
+
+def main(argv=None):
+    """
+    This function runs a headless command or the GUI.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv[:1] and argv[0] in COMMANDS:
+        module = importlib.import_module(f".{COMMANDS[argv[0]]}", __package__)
+        return module.main(argv[1:])
+
+    if argv[:1] in (["-h"], ["--help"]):
+        print(USAGE.format(commands="\n    ".join(COMMANDS)))
+        return 0
+
+    from . import gui
+    return gui.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
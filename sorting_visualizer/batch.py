@@ -0,0 +1,245 @@
+"""
+Batch mode: many small arrays sorted at once with NumPy, e.g. millions of rows of 2 to 10 elements.
+
+Usage:
+    $ python visualize_sorting.py batch --rows 1000000 --size 8
+    $ python visualize_sorting.py batch --rows 100000 --size 8 --algorithm "Bitonic Sort" --trace row.trace
+
+The algorithms are sorting networks: fixed sequences of compare-exchanges, which do not depend on the data.
+The rows are stored column by column, so one compare-exchange of columns i and j is a numpy.minimum and a
+numpy.maximum over all rows. The throughput is reported next to numpy.sort(axis=1). One sampled row is also
+sorted event by event like the algorithms in sort_engine, so that its trace can be replayed in the GUI.
+"""
+
+import argparse
+import sys
+import time
+
+from . import distributions
+from . import sort_engine
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+### Rows sorted at once: 16384 rows of 8 int64 columns are 1 MB
+BLOCK_ROWS = 16384
+
+
+def bubble_network(n):
+    """
+    Bubble Sort without the early exit: pass p moves the largest of the first n - p elements to the end.
+
+    :param n: Number of elements
+    :return: Generator of stages, each a (list of lower columns, list of upper columns)
+    """
+
+    for p in range(n - 1):
+        for i in range(n - 1 - p):
+            yield [i], [i + 1]
+
+
+def insertion_network(n):
+    """
+    Insertion Sort by columns: column j sinks to its place through all columns before it.
+
+    :param n: Number of elements
+    :return: Generator of stages
+    """
+
+    for j in range(1, n):
+        for i in range(j - 1, -1, -1):
+            yield [i], [i + 1]
+
+
+def odd_even_network(n):
+    """
+    Odd-even transposition sort: n rounds, alternately on the pairs starting at even and at odd columns.
+
+    :param n: Number of elements
+    :return: Generator of stages
+    """
+
+    for r in range(n):
+        yield list(range(r % 2, n - 1, 2)), list(range(r % 2 + 1, n, 2))
+
+
+def bitonic_network(n):
+    """
+    Bitonic sort in the form where every compare-exchange puts the minimum into the lower column: each merge of
+    blocks of length k starts by comparing the columns mirrored in the block, then halves with distance j.
+    The network of the next power of two is used; its compare-exchanges with columns >= n are left out, since
+    in this form padding at the end would never move.
+
+    :param n: Number of elements
+    :return: Generator of stages
+    """
+
+    size = 1 << max(0, n - 1).bit_length()
+    k = 2
+    while k <= size:
+        lower = [i for i in range(size) if i % k < k // 2]
+        yield _within(n, lower, [i - i % k + k - 1 - i % k for i in lower])
+        j = k // 4
+        while j:
+            lower = [i for i in range(size) if not i & j]
+            yield _within(n, lower, [i + j for i in lower])
+            j //= 2
+        k *= 2
+
+
+def _within(n, lower, upper):
+    """
+    :return: The stage without the compare-exchanges beyond column n - 1
+    """
+
+    pairs = [(i, j) for i, j in zip(lower, upper) if j < n]
+    return [i for i, j in pairs], [j for i, j in pairs]
+
+
+### Name -> network; the names of Bubble Sort and Insertion Sort are the ones of sort_engine
+NETWORKS = {
+    "Odd-Even Transposition Sort": odd_even_network,
+    "Bitonic Sort": bitonic_network,
+    "Insertion Sort": insertion_network,
+    "Bubble Sort": bubble_network,
+}
+
+
+def sort_rows(rows, name):
+    """
+    This function sorts every row of a 2-dimensional NumPy array with a network.
+
+    :param rows: NumPy array of shape (M, n)
+    :param name: Name from NETWORKS
+    :return: New NumPy array of shape (M, n) with the sorted rows
+    """
+
+    count, n = rows.shape
+    pairs = [pair for lower, upper in NETWORKS[name](n) for pair in zip(lower, upper)]
+    minimum, maximum = numpy.minimum, numpy.maximum
+    result = numpy.empty_like(rows)
+
+    ### The rows are sorted in blocks whose columns stay in the cache for the whole network
+    for start in range(0, count, BLOCK_ROWS):
+        block = rows[start:start + BLOCK_ROWS]
+
+        ### Column-major copy: each column of the block is one contiguous vector
+        columns = list(numpy.array(block.T, order="C"))
+        spare = numpy.empty(len(block), dtype=rows.dtype)
+        for i, j in pairs:
+            ### The minimum goes to the spare vector, which becomes column i; the old column i is the next spare
+            minimum(columns[i], columns[j], out=spare)
+            maximum(columns[i], columns[j], out=columns[j])
+            columns[i], spare = spare, columns[i]
+
+        for k, column in enumerate(columns):
+            result[start:start + len(block), k] = column
+
+    return result
+
+
+def row_events(name, a):
+    """
+    This function sorts one row with a network and yields its events like the algorithms in sort_engine:
+    a comparison for every compare-exchange and a swap if the pair was out of order.
+
+    :param name: Name from NETWORKS
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    for lower, upper in NETWORKS[name](len(a)):
+        for i, j in zip(lower, upper):
+            yield sort_engine.COMPARE, i, j
+            if a[i] > a[j]:
+                a[i], a[j] = a[j], a[i]
+                yield sort_engine.SWAP, i, j
+
+
+def throughput(function, rows, repeats=3):
+    """
+    :return: (best time of the function on the rows in seconds, sorted rows)
+    """
+
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def generate(count, n, distribution="uniform", seed=0, high=None):
+    """
+    This function generates count rows of n elements from one seeded sequence of a distribution.
+
+    :return: NumPy array of shape (count, n) with dtype int64
+    """
+
+    values = distributions.generate(distribution, count * n, seed, high)
+    return numpy.frombuffer(values, dtype="i8").reshape(count, n)
+
+
+def main(argv=None):
+    """
+    Command line entry point: sort rows in bulk and report the throughput.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="batch", description="Sort many small arrays at once with NumPy.")
+    parser.add_argument("--rows", type=int, default=1000000, help="number of arrays (default: 1000000)")
+    parser.add_argument("--size", type=int, default=8, help="elements per array (default: 8)")
+    parser.add_argument("--algorithm", nargs="+", default=list(NETWORKS), choices=list(NETWORKS), metavar="NAME",
+                        help="networks to run (default: all)")
+    parser.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    parser.add_argument("--high", type=int, default=1000, help="values are in [0, high) (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs, the minimum is reported")
+    parser.add_argument("--trace", metavar="PATH", help="save the trace of one sampled row of the first network")
+    parser.add_argument("--sample", type=int, default=0, help="index of the row of --trace (default: 0)")
+    args = parser.parse_args(argv)
+
+    if numpy is None:
+        parser.error("the batch mode needs NumPy")
+    if args.rows < 1 or args.size < 1:
+        parser.error("--rows and --size must be at least 1")
+
+    rows = generate(args.rows, args.size, args.distribution, args.seed, args.high)
+    baseline, expected = throughput(lambda data: numpy.sort(data, axis=1), rows, args.repeats)
+
+    print(f"{args.rows} rows of {args.size} elements, {args.distribution}")
+    print(f"{'algorithm':28s} {'stages':>7s} {'pairs':>6s} {'time':>9s} {'rows/s':>14s} {'vs numpy.sort':>14s}")
+    print(f"{'numpy.sort(axis=1)':28s} {'':>7s} {'':>6s} {baseline:8.3f}s {args.rows / baseline:14,.0f} {1:13.2f}x")
+
+    for name in args.algorithm:
+        elapsed, result = throughput(lambda data: sort_rows(data, name), rows, args.repeats)
+        if not numpy.array_equal(result, expected):
+            print(f"{name} did not sort all rows", file=sys.stderr)
+            return 1
+        stages, pairs = 0, 0
+        for lower, upper in NETWORKS[name](args.size):
+            stages += bool(lower)
+            pairs += len(lower)
+        print(f"{name:28s} {stages:7d} {pairs:6d} {elapsed:8.3f}s {args.rows / elapsed:14,.0f} {baseline / elapsed:13.2f}x")
+
+    if args.trace:
+        ### The trace is replayed like any other, e.g. with "Load trace" in the GUI
+        from . import replay
+
+        name = args.algorithm[0]
+        row = rows[args.sample % args.rows].tolist()
+        trace = sort_engine.record(lambda a: row_events(name, a), row, f"{name} (row {args.sample % args.rows})")
+        replay.save(args.trace, trace)
+        print(f"{args.trace}: {len(trace)} events of row {args.sample % args.rows}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+Headless benchmark of the algorithms in sort_engine.
+
+Usage:
+    $ python visualize_sorting.py benchmark --sizes 10 100 1000 10000 --json results.json
+
+Every algorithm is run on seeded inputs of each size and distribution. The results contain wall time,
+comparisons, swaps, writes, auxiliary and peak memory, plus a growth exponent fitted over the sizes.
+With --instrument an extra run counts the element accesses through a tracked.TrackedArray.
+The rows also contain the profile of the input, so that 'recommend --calibration' can fit its cost model to them.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from . import distributions
+from . import recommend
+from . import sort_engine
+from . import tracked
+from .metrics import Metrics
+
+
+### Algorithms which are skipped above --max-quadratic elements
+QUADRATIC = ("Bubble Sort", "Selection Sort", "Insertion Sort")
+
+CSV_FIELDS = ("algorithm", "distribution", "size", "seed", "repeats", "time_min", "time_median",
+              "comparisons", "swaps", "reads", "writes", "aux_memory", "peak_memory", "array_reads", "array_writes",
+              "far_accesses", "runs", "inversions", "distinct", "value_range", "time_exponent", "comparison_exponent")
+
+
+def measure(algorithm, values):
+    """
+    This function runs an algorithm on the values and counts its events without storing a trace.
+
+    :param algorithm: Generator function from sort_engine.ALGORITHMS
+    :param values: Mutable sequence, sorted in place
+    :return: Metrics of the run
+    """
+
+    metrics = Metrics()
+    count = metrics.count
+
+    start = time.perf_counter()
+    for op, a, b in algorithm(values):
+        count(op, a, b)
+    metrics.elapsed = time.perf_counter() - start
+
+    return metrics
+
+
+def peak_memory(algorithm, values):
+    """
+    This function measures the peak of the memory allocated by Python while running an algorithm.
+
+    :param algorithm: Generator function from sort_engine.ALGORITHMS
+    :param values: Mutable sequence, sorted in place
+    :return: Peak in bytes
+    """
+
+    tracemalloc.start()
+    try:
+        for event in algorithm(values):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_access(algorithm, values):
+    """
+    This function runs an algorithm on a tracked copy of the values and counts every element access.
+
+    :param algorithm: Generator function from sort_engine.ALGORITHMS
+    :param values: The input sequence
+    :return: tracked.TrackedArray after the run
+    """
+
+    array = tracked.TrackedArray(list(values))
+    for event in algorithm(array):
+        pass
+    return array
+
+
+def fit_exponent(sizes, costs):
+    """
+    This function fits cost = c * size^k by least squares in log-log space.
+
+    :param sizes: Input sizes
+    :param costs: Measured costs
+    :return: The exponent k, None with less than two usable points
+    """
+
+    points = [(math.log(size), math.log(cost)) for size, cost in zip(sizes, costs) if size > 1 and cost > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = statistics.fmean(x for x, y in points)
+    mean_y = statistics.fmean(y for x, y in points)
+    var_x = sum((x - mean_x) ** 2 for x, y in points)
+    if var_x == 0:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def run(algorithms, sizes, inputs, repeats=3, seed=0, max_quadratic=5000, memory=True, instrument=False, log=None):
+    """
+    This function benchmarks every combination of algorithm, distribution and size.
+    The input of a combination only depends on the seed, the distribution and the size; every repetition sorts
+    a copy of the same input, so that the times and the counts belong together.
+
+    :param algorithms: Names from sort_engine.ALGORITHMS
+    :param sizes: Input sizes
+    :param inputs: Names from distributions.DISTRIBUTIONS
+    :param repeats: Number of timed runs per combination
+    :param seed: Base seed of the inputs
+    :param max_quadratic: Largest size for the O(n^2) algorithms
+    :param memory: Measure the peak memory in an extra run
+    :param instrument: Count the element accesses and their distances in an extra run
+    :param log: Optional stream for progress messages
+    :return: (list of result dictionaries, list of growth dictionaries)
+    """
+
+    results = list()
+    growth = list()
+
+    for name in algorithms:
+        algorithm = sort_engine.ALGORITHMS[name]
+
+        for distribution in inputs:
+            rows = list()
+
+            for size in sizes:
+                if name in QUADRATIC and size > max_quadratic:
+                    continue
+
+                source = distributions.generate(distribution, size, f"{seed}-{size}-0")
+                ### The profile of the input calibrates the cost model of recommend
+                shape = recommend.profile(list(source))
+
+                times = list()
+                for repeat in range(repeats):
+                    metrics = measure(algorithm, list(source))
+                    times.append(metrics.elapsed)
+
+                row = {"algorithm": name, "distribution": distribution, "size": size, "seed": seed, "repeats": repeats,
+                       "time_min": min(times), "time_median": statistics.median(times),
+                       "comparisons": metrics.comparisons, "swaps": metrics.swaps, "reads": metrics.reads,
+                       "writes": metrics.writes, "aux_memory": metrics.aux_peak}
+                row.update(shape.fields())
+
+                if memory:
+                    row["peak_memory"] = peak_memory(algorithm, list(source))
+                else:
+                    row["peak_memory"] = None
+
+                if instrument:
+                    array = measure_access(algorithm, source)
+                    row["array_reads"], row["array_writes"] = array.reads, array.writes
+                    row["far_accesses"] = array.far_share()
+                    row["access_histogram"] = array.trimmed_histogram()
+                else:
+                    row["array_reads"] = row["array_writes"] = row["far_accesses"] = None
+
+                if log:
+                    far = f"  {row['far_accesses']:6.1%} far" if instrument else ""
+                    print(f"{name:28s} {distribution:13s} {size:>8d} {row['time_min']:10.4f}s "
+                          f"{row['comparisons']:>12d} comparisons{far}", file=log)
+                rows.append(row)
+
+            exponents = {"algorithm": name, "distribution": distribution,
+                         "time_exponent": fit_exponent([r["size"] for r in rows], [r["time_min"] for r in rows]),
+                         "comparison_exponent": fit_exponent([r["size"] for r in rows], [r["comparisons"] for r in rows])}
+            for row in rows:
+                row["time_exponent"] = exponents["time_exponent"]
+                row["comparison_exponent"] = exponents["comparison_exponent"]
+
+            growth.append(exponents)
+            results.extend(rows)
+
+    return results, growth
+
+
+def scaling(sizes, inputs, max_workers, repeats=3, seed=0, log=None):
+    """
+    This function measures the parallel algorithms with 1 to max_workers processes on the same inputs.
+    Speedup and efficiency are relative to the same algorithm with one process.
+
+    :param sizes: Input sizes
+    :param inputs: Names from distributions.DISTRIBUTIONS
+    :param max_workers: Largest number of processes
+    :param repeats: Number of timed runs per combination, the minimum is reported
+    :param seed: Base seed of the inputs
+    :param log: Optional stream for progress messages
+    :return: List of result dictionaries
+    """
+
+    ### The process pool machinery is only loaded when the scaling is measured
+    from . import parallel
+
+    results = list()
+
+    for workers in range(1, max_workers + 1):
+        executor, workers = parallel.start(workers)
+        try:
+            for name in parallel.ALGORITHMS:
+                for distribution in inputs:
+                    for size in sizes:
+                        values = distributions.generate(distribution, size, f"{seed}-{size}-0")
+                        times = list()
+                        for repeat in range(repeats):
+                            elapsed, result = parallel.measure(name, values, executor, workers)
+                            times.append(elapsed)
+                        results.append({"algorithm": name, "distribution": distribution, "size": size,
+                                        "workers": workers, "time_min": min(times)})
+        finally:
+            executor.shutdown()
+
+    ### The runs with one process are the baseline
+    baseline = {(r["algorithm"], r["distribution"], r["size"]): r["time_min"] for r in results if r["workers"] == 1}
+    for row in results:
+        single = baseline[(row["algorithm"], row["distribution"], row["size"])]
+        row["speedup"] = single / row["time_min"]
+        row["efficiency"] = row["speedup"] / row["workers"]
+
+    results.sort(key=lambda r: (r["algorithm"], r["distribution"], r["size"], r["workers"]))
+    if log:
+        for row in results:
+            print(f"{row['algorithm']:28s} {row['distribution']:13s} {row['size']:>8d} {row['workers']:>3d} workers "
+                  f"{row['time_min']:10.4f}s  speedup {row['speedup']:5.2f}  efficiency {row['efficiency']:6.1%}", file=log)
+
+    return results
+
+
+def write_json(path, config, results, growth, scaling_results=None):
+    """
+    This function writes the results as JSON, "-" writes to stdout.
+
+    :return: None
+    """
+
+    document = {"config": config, "results": results, "growth": growth}
+    if scaling_results is not None:
+        document["scaling"] = scaling_results
+    if path == "-":
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    else:
+        with open(path, "w") as file:
+            json.dump(document, file, indent=2)
+
+
+def write_csv(path, results):
+    """
+    This function writes one CSV row per result, "-" writes to stdout.
+
+    :return: None
+    """
+
+    file = sys.stdout if path == "-" else open(path, "w", newline="")
+    try:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+
+def main(argv=None):
+    """
+    Command line entry point of the benchmark.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="benchmark", description="Benchmark the sorting algorithms headless.")
+    parser.add_argument("--algorithms", nargs="+", default=list(sort_engine.ALGORITHMS), metavar="NAME",
+                        help="algorithms to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000, 10000], help="input sizes")
+    parser.add_argument("--distributions", nargs="+", default=["uniform", "sorted", "reversed"],
+                        choices=list(distributions.DISTRIBUTIONS), help="input distributions")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per input, the minimum is reported")
+    parser.add_argument("--seed", type=int, default=0, help="base seed of the inputs")
+    parser.add_argument("--max-quadratic", type=int, default=5000, help="largest size for the O(n^2) algorithms")
+    parser.add_argument("--no-memory", action="store_true", help="skip the extra run measuring the peak memory")
+    parser.add_argument("--instrument", action="store_true",
+                        help="count element accesses and the share of far accesses (>= 8 elements apart) in an extra run")
+    parser.add_argument("--scaling", type=int, metavar="N",
+                        help="also measure the parallel algorithms with 1 to N worker processes")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--csv", metavar="PATH", help="write the results as CSV ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.algorithms if name not in sort_engine.ALGORITHMS]
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(unknown)}")
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+
+    ### Progress goes to stderr when a result file is written to stdout
+    log = sys.stderr if "-" in (args.json, args.csv) else sys.stdout
+    results, growth = run(args.algorithms, args.sizes, args.distributions, args.repeats, args.seed,
+                          args.max_quadratic, not args.no_memory, args.instrument, log)
+
+    config = {"algorithms": args.algorithms, "sizes": args.sizes, "distributions": args.distributions,
+              "repeats": args.repeats, "seed": args.seed, "max_quadratic": args.max_quadratic, "instrument": args.instrument,
+              "scaling": args.scaling, "cpu_count": os.cpu_count(),
+              "python": platform.python_version(), "platform": platform.platform()}
+    scaling_results = None
+    if args.scaling:
+        print("\nScaling of the parallel algorithms:", file=log)
+        scaling_results = scaling(args.sizes, args.distributions, args.scaling, args.repeats, args.seed, log)
+
+    if args.json:
+        write_json(args.json, config, results, growth, scaling_results)
+    if args.csv:
+        write_csv(args.csv, results)
+
+    print("\nGrowth exponents (time, comparisons):", file=log)
+    for exponents in growth:
+        time_exponent, comparison_exponent = exponents["time_exponent"], exponents["comparison_exponent"]
+        print(f"{exponents['algorithm']:28s} {exponents['distribution']:13s} "
+              f"{'-' if time_exponent is None else f'{time_exponent:.2f}':>6s} "
+              f"{'-' if comparison_exponent is None else f'{comparison_exponent:.2f}':>6s}", file=log)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Stepping backwards through a trace and conditional breakpoints. No tkinter in here.
+
+A swap is its own inverse and a comparison or a mark does not change the data, so most events are undone
+without any extra information. For writes the undo log keeps the overwritten value, for memory events the
+previous peak; with it every step backwards is O(1).
+"""
+
+from array import array
+
+from . import sort_engine
+
+
+def undo_log(trace):
+    """
+    This function computes the information needed to undo each event of a trace in one pass.
+
+    :param trace: sort_engine.Trace
+    :return: array('q') with one entry per event: the overwritten value of a WRITE, the previous peak of an AUX, else 0
+    """
+
+    values = list(trace.initial)
+    log = array("q", bytes(8 * len(trace)))
+    aux, peak = 0, 0
+
+    for step, (op, a, b) in enumerate(trace.events()):
+        if op == sort_engine.SWAP:
+            values[a], values[b] = values[b], values[a]
+        elif op == sort_engine.WRITE:
+            log[step] = values[a]
+            values[a] = b
+        elif op == sort_engine.AUX:
+            log[step] = peak
+            aux += a
+            peak = max(peak, aux)
+
+    return log
+
+
+class Breakpoint:
+    """
+    A condition on the events of a trace at which a replay stops.
+    """
+
+    __slots__ = ("kind", "value")
+
+    ### Kinds of conditions, each compared with one integer value
+    KINDS = ("swap distance >", "comparison #", "write to index", "step #")
+
+    def __init__(self, kind, value):
+        """
+        Init breakpoint
+
+        :param kind: One of KINDS
+        :param value: Integer the condition is checked against
+        """
+
+        if kind not in self.KINDS:
+            raise ValueError(f"'{kind}' is not a kind of breakpoint")
+        self.kind = kind
+        self.value = value
+
+    def __str__(self):
+        return f"{self.kind} {self.value}"
+
+    def hit(self, step, op, a, b, metrics):
+        """
+        This function checks the condition after an event was counted.
+
+        :param step: Index of the event in the trace
+        :param op: Event code
+        :param a: First operand
+        :param b: Second operand
+        :param metrics: Metrics including the event
+        :return: True if the replay has to stop after this event
+        """
+
+        kind = self.kind
+        if kind == "swap distance >":
+            return op == sort_engine.SWAP and abs(a - b) > self.value
+        if kind == "comparison #":
+            return op == sort_engine.COMPARE and metrics.comparisons == self.value
+        if kind == "write to index":
+            return (op == sort_engine.WRITE and a == self.value) or (op == sort_engine.SWAP and self.value in (a, b))
+        return step + 1 == self.value
@@ -0,0 +1,181 @@
+"""
+Seeded input distributions for the sorting algorithms.
+
+Every distribution is built in bulk from the bytes of one random.Random(seed) and returned as an
+array('q'). NumPy is used for the arithmetic when it is installed; both paths consume the same random
+bytes, so a seed gives the same sequence with and without NumPy.
+"""
+
+from array import array
+from statistics import NormalDist
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _words(rng, size, itemsize=4):
+    """
+    :return: size random unsigned integers with itemsize bytes each, as array or NumPy array
+    """
+
+    data = rng.randbytes(itemsize * size)
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype=f"=u{itemsize}")
+    return array("I" if itemsize == 4 else "H", data)
+
+
+def _to_array(values):
+    """
+    :return: array('q') from a list or a NumPy array
+    """
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        result = array("q")
+        result.frombytes(values.astype("=i8").tobytes())
+        return result
+    return array("q", values)
+
+
+def _ramp(size, high):
+    """
+    :return: The ascending sequence 0 ... high-1 stretched to size elements
+    """
+
+    if numpy is not None:
+        return _to_array(numpy.arange(size, dtype="i8") * high // size)
+    return array("q", [i * high // size for i in range(size)])
+
+
+def uniform(size, rng, high):
+    """
+    Uniformly distributed values in [0, high).
+    """
+
+    words = _words(rng, size)
+    if numpy is not None:
+        return _to_array(words % high)
+    return array("q", [word % high for word in words])
+
+
+def ascending(size, rng, high):
+    """
+    Already sorted values.
+    """
+
+    return _ramp(size, high)
+
+
+def descending(size, rng, high):
+    """
+    Values sorted in reverse order.
+    """
+
+    values = _ramp(size, high)
+    values.reverse()
+    return values
+
+
+def nearly_sorted(size, rng, high, swaps=None):
+    """
+    Sorted values with a number of random swaps, by default 1% of the size.
+    """
+
+    values = _ramp(size, high)
+    if swaps is None:
+        swaps = max(1, size // 100)
+
+    for i in range(swaps):
+        j, k = rng.randrange(size), rng.randrange(size)
+        values[j], values[k] = values[k], values[j]
+    return values
+
+
+def few_unique(size, rng, high, distinct=8):
+    """
+    Random values from only a few distinct keys.
+    """
+
+    step = max(1, high // distinct)
+    words = _words(rng, size)
+    if numpy is not None:
+        return _to_array(words % distinct * step)
+    return array("q", [word % distinct * step for word in words])
+
+
+def organ_pipe(size, rng, high):
+    """
+    Ascending up to the middle, then descending.
+    """
+
+    if numpy is not None:
+        index = numpy.arange(size, dtype="i8")
+        return _to_array(numpy.minimum(index, size - 1 - index) * 2 * high // size)
+    values = array("q", [i * 2 * high // size for i in range(-(-size // 2))])
+    tail = values[:size // 2]
+    tail.reverse()
+    return values + tail
+
+
+def sawtooth(size, rng, high, teeth=8):
+    """
+    A number of ascending runs.
+    """
+
+    period = max(1, -(-size // teeth))
+    if numpy is not None:
+        return _to_array(numpy.arange(size, dtype="i8") % period * high // period)
+    return array("q", [i % period * high // period for i in range(size)])
+
+
+### Resolution of the lookup table of the normal distribution
+_GAUSSIAN_LEVELS = 4096
+
+
+def gaussian(size, rng, high):
+    """
+    Normally distributed values around high / 2 with a standard deviation of high / 6, clipped to [0, high).
+    The values are looked up in a table of quantiles, so no transcendental function is evaluated per element.
+    """
+
+    normal = NormalDist(high / 2, high / 6)
+    table = [min(high - 1, max(0, int(normal.inv_cdf((k + 0.5) / _GAUSSIAN_LEVELS)))) for k in range(_GAUSSIAN_LEVELS)]
+
+    words = _words(rng, size, 2)
+    if numpy is not None:
+        return _to_array(numpy.asarray(table, dtype="i8")[words % _GAUSSIAN_LEVELS])
+    return array("q", [table[word % _GAUSSIAN_LEVELS] for word in words])
+
+
+### Name -> function(size, rng, high, **params)
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "sorted": ascending,
+    "reversed": descending,
+    "nearly-sorted": nearly_sorted,
+    "few-unique": few_unique,
+    "organ-pipe": organ_pipe,
+    "sawtooth": sawtooth,
+    "gaussian": gaussian,
+}
+
+
+def generate(name, size, seed, high=None, **params):
+    """
+    This function generates an input sequence.
+
+    :param name: Name from DISTRIBUTIONS
+    :param size: Number of elements
+    :param seed: Seed of the random numbers (int or str)
+    :param high: Values are in [0, high), default is the size
+    :param params: Parameters of the distribution, e.g. swaps for "nearly-sorted"
+    :return: array('q')
+    """
+
+    if size <= 0:
+        return array("q")
+
+    rng = random.Random(seed)
+    return DISTRIBUTIONS[name](size, rng, high or size, **params)
@@ -0,0 +1,372 @@
+"""
+Headless export of a sort animation as animated PNG or raw RGB frames. No tkinter in here.
+
+The trace is replayed into a software framebuffer of palette indices with the same colors as the bar chart
+of the GUI. Only the columns touched in a frame are redrawn, and an APNG frame only covers the range of
+columns that changed. The frames are compressed by zlib in a thread pool, zlib releases the GIL.
+
+Usage:
+    $ python visualize_sorting.py export quick.png --algorithm "Quick Sort (Hoare)" --size 100000 --duration 10
+    $ python visualize_sorting.py export - --format raw --size 1000 | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1000x320 -r 30 -i - quick.mp4
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import struct
+import sys
+import zlib
+
+from . import distributions
+from . import replay
+from . import sonify
+from . import sort_engine
+
+
+### Palette indices, the colors are those of the GUI
+BACKGROUND, BAR, SWAPPED, COMPARED, WRITTEN, SORTED = range(6)
+PALETTE = ("#ffffff", "#5555ff", "#ee0000", "#55cc55", "#ff9900", "#00ff00")
+
+### Frames compressed ahead of the writer per worker
+QUEUE_PER_WORKER = 4
+
+
+class FrameView:
+    """
+    Bar chart in a bytearray of palette indices, with the interface of the views in render.
+
+    The pixels are stored column by column, so drawing a bar is one slice assignment.
+    """
+
+    def __init__(self, values, width=1000, height=320):
+        """
+        Init view and draw the whole chart
+
+        :param values: The sequence to show
+        :param width: Maximum width of the chart in pixels
+        :param height: Height of the chart in pixels
+        """
+
+        self.data = list(values)
+
+        ### Each column shows one element; with more elements than pixels only every stride-th element is shown
+        count = len(self.data)
+        if count <= width:
+            self.stride = 1
+            self.bar_width = width // count
+        else:
+            self.stride = -(-count // width)
+            self.bar_width = 1
+        self.columns = -(-count // self.stride)
+        self.width = self.columns * self.bar_width
+        self.height = height
+
+        ### Scale the values to the height of the chart
+        self.low = min(self.data)
+        self.scale = (height - 1) / ((max(self.data) - self.low) or 1)
+
+        self.pixels = bytearray(self.width * height)
+        self.sorted_indices = set()
+        self.highlight = dict()
+        self.dirty = set(range(self.columns))
+
+    def __len__(self):
+        return len(self.data)
+
+    def values(self):
+        """
+        :return: List of the displayed values
+        """
+
+        return list(self.data)
+
+    def swap(self, index_left, index_right):
+        data = self.data
+        data[index_left], data[index_right] = data[index_right], data[index_left]
+        self.set_highlight(index_left // self.stride, SWAPPED)
+        self.set_highlight(index_right // self.stride, SWAPPED)
+
+    def compare(self, index_left, index_right):
+        ### A swap in the same frame stays red
+        for column in (index_left // self.stride, index_right // self.stride):
+            if column not in self.highlight:
+                self.set_highlight(column, COMPARED)
+
+    def write(self, index, value):
+        self.data[index] = value
+        self.set_highlight(index // self.stride, WRITTEN)
+
+    def mark(self, index):
+        self.sorted_indices.add(index)
+        self.dirty.add(index // self.stride)
+
+    def set_highlight(self, column, color):
+        self.highlight[column] = color
+        self.dirty.add(column)
+
+    def clear_highlight(self):
+        self.dirty.update(self.highlight)
+        self.highlight = dict()
+
+    def flush(self):
+        """
+        This function redraws the columns changed since the last flush.
+
+        :return: (first, last) pixel column of the changed range (last exclusive), None if nothing changed
+        """
+
+        if not self.dirty:
+            return None
+
+        for column in self.dirty:
+            self.draw_column(column)
+        first, last = min(self.dirty), max(self.dirty) + 1
+        self.dirty = set()
+        return first * self.bar_width, last * self.bar_width
+
+    def draw_column(self, column):
+        """
+        This function draws one column: background on top, the bar below.
+
+        :param column: Index of the column
+        :return: None
+        """
+
+        index = column * self.stride
+        bar = 1 + int((self.data[index] - self.low) * self.scale)
+        color = self.highlight.get(column)
+        if color is None:
+            color = SORTED if index in self.sorted_indices else BAR
+
+        pixels = bytes((BACKGROUND,)) * (self.height - bar) + bytes((color,)) * bar
+        height = self.height
+        for x in range(column * self.bar_width, (column + 1) * self.bar_width):
+            self.pixels[x * height:(x + 1) * height] = pixels
+
+    def rows(self, first, last):
+        """
+        This function transposes the pixel columns [first, last) into rows.
+
+        :return: List of bytes, one per row from top to bottom
+        """
+
+        height = self.height
+        pixels = self.pixels
+        return [bytes(pixels[first * height + y:last * height:height]) for y in range(height)]
+
+
+def frames(trace, events_per_frame, width=1000, height=320):
+    """
+    This function replays a trace and yields the changed part of the chart after each frame.
+    The first frame shows the whole input, the last one the sorted sequence without highlighting.
+
+    :param trace: sort_engine.Trace
+    :param events_per_frame: Events shown in one frame, may be fractional
+    :param width: Maximum width of the chart in pixels
+    :param height: Height of the chart in pixels
+    :return: Generator of (view, first, last) with the changed pixel columns [first, last) of view.pixels
+    """
+
+    view = FrameView(trace.initial, width, height)
+    first, last = view.flush()
+    yield view, first, last
+
+    budget = events_per_frame
+    for op, a, b in trace.events():
+
+        if op == sort_engine.COMPARE:
+            view.compare(a, b)
+        elif op == sort_engine.SWAP:
+            view.swap(a, b)
+        elif op == sort_engine.WRITE:
+            view.write(a, b)
+        elif op == sort_engine.MARK:
+            view.mark(a)
+
+        ### Paced like the GUI
+        budget -= sort_engine.STEPS[op]
+        if budget < 0:
+            changed = view.flush() or (0, 1)
+            yield view, changed[0], changed[1]
+            view.clear_highlight()
+            budget += events_per_frame
+
+    ### The end of the last frame, then the sorted sequence without highlighting
+    for final in range(2):
+        changed = view.flush()
+        if changed:
+            yield view, changed[0], changed[1]
+        view.clear_highlight()
+
+
+def _color(code):
+    """
+    :return: (r, g, b) of a color like "#rrggbb"
+    """
+
+    return tuple(bytes.fromhex(code[1:]))
+
+
+def _chunk(kind, data):
+    """
+    :return: One PNG chunk
+    """
+
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _compress(rows):
+    """
+    This function compresses the rows of a frame as PNG image data, filter type 0 for every row. Runs in the pool.
+
+    :param rows: List of bytes
+    :return: Compressed bytes
+    """
+
+    return zlib.compress(b"".join(b"\0" + row for row in rows), 6)
+
+
+def write_apng(path, trace, events_per_frame, fps=30, width=1000, height=320, workers=None):
+    """
+    This function writes the animation of a trace as animated PNG.
+
+    :param path: Path of the file
+    :param trace: sort_engine.Trace
+    :param events_per_frame: Events shown in one frame
+    :param fps: Frames per second
+    :param width: Maximum width of the chart in pixels
+    :param height: Height of the chart in pixels
+    :param workers: Number of compressing threads, default is the number of cores
+    :return: Number of frames
+    """
+
+    ### The number of frames is part of the header, it is patched when all frames are written
+    workers = workers or os.cpu_count() or 1
+    count = 0
+    sequence = 0
+
+    with open(path, "wb") as file, ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        def write_frame():
+            nonlocal sequence
+            first, frame_width, data = pending.popleft()
+            data = data.result()
+            control = struct.pack(">IIIIIHHBB", sequence, frame_width, height, first, 0, 1, fps, 0, 0)
+            file.write(_chunk(b"fcTL", control))
+            sequence += 1
+            if sequence == 1:
+                file.write(_chunk(b"IDAT", data))
+            else:
+                file.write(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+
+        for view, first, last in frames(trace, events_per_frame, width, height):
+            if count == 0:
+                height = view.height
+                file.write(b"\x89PNG\r\n\x1a\n")
+                file.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", view.width, view.height, 8, 3, 0, 0, 0)))
+                file.write(_chunk(b"PLTE", b"".join(bytes(_color(color)) for color in PALETTE)))
+                frame_count_offset = file.tell() + 8
+                file.write(_chunk(b"acTL", struct.pack(">II", 0, 0)))
+
+            pending.append((first, last - first, executor.submit(_compress, view.rows(first, last))))
+            count += 1
+            if len(pending) >= QUEUE_PER_WORKER * workers:
+                write_frame()
+
+        while pending:
+            write_frame()
+        file.write(_chunk(b"IEND", b""))
+
+        ### Patch the number of frames and the checksum of acTL
+        actl = struct.pack(">II", count, 0)
+        file.seek(frame_count_offset)
+        file.write(actl + struct.pack(">I", zlib.crc32(b"acTL" + actl)))
+
+    return count
+
+
+def write_raw(path, trace, events_per_frame, width=1000, height=320):
+    """
+    This function writes every frame as full RGB image (rgb24, row by row), "-" writes to stdout.
+
+    :param path: Path of the file
+    :param trace: sort_engine.Trace
+    :param events_per_frame: Events shown in one frame
+    :param width: Maximum width of the chart in pixels
+    :param height: Height of the chart in pixels
+    :return: (number of frames, width, height)
+    """
+
+    ### One translation table per color channel maps the palette indices to the channel values
+    tables = [bytes(_color(PALETTE[i])[channel] if i < len(PALETTE) else 0 for i in range(256)) for channel in range(3)]
+
+    file = sys.stdout.buffer if path == "-" else open(path, "wb")
+    count = 0
+    try:
+        for view, first, last in frames(trace, events_per_frame, width, height):
+            indices = b"".join(view.rows(0, view.width))
+            rgb = bytearray(3 * len(indices))
+            for channel in range(3):
+                rgb[channel::3] = indices.translate(tables[channel])
+            file.write(rgb)
+            count += 1
+    finally:
+        if file is not sys.stdout.buffer:
+            file.close()
+
+    return count, view.width, view.height
+
+
+def main(argv=None):
+    """
+    Command line entry point: export the animation of a sort or of a trace file.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="export", description="Export the animation of a sort without a display.")
+    parser.add_argument("path", help="output file ('-' for stdout with --format raw)")
+    parser.add_argument("--format", choices=["apng", "raw"], help="animated PNG or raw rgb24 frames (default: from the file name)")
+    parser.add_argument("--trace", metavar="FILE", help="trace file written by 'record' or the GUI instead of a new sort")
+    parser.add_argument("--algorithm", default="Quick Sort (Hoare)", choices=list(sort_engine.ALGORITHMS), metavar="NAME")
+    parser.add_argument("--size", type=int, default=1000, help="number of elements")
+    parser.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=10.0, help="length of the animation in seconds (default: 10)")
+    parser.add_argument("--fps", type=int, default=30, help="frames per second")
+    parser.add_argument("--width", type=int, default=1000, help="maximum width in pixels")
+    parser.add_argument("--height", type=int, default=320, help="height in pixels")
+    parser.add_argument("--workers", type=int, help="compressing threads (default: number of cores)")
+    args = parser.parse_args(argv)
+
+    file_format = args.format or ("apng" if args.path.lower().endswith((".png", ".apng")) else "raw")
+    if file_format == "apng" and args.path == "-":
+        parser.error("an animated PNG cannot be written to stdout")
+
+    if args.trace:
+        trace, keyframes = replay.load(args.trace)
+    else:
+        values = distributions.generate(args.distribution, args.size, args.seed)
+        trace = sort_engine.record(sort_engine.ALGORITHMS[args.algorithm], values, args.algorithm)
+
+    if len(trace.initial) < 2:
+        parser.error("at least 2 elements are needed")
+
+    events_per_frame = sonify.rate_for(trace, args.duration) / args.fps
+    if file_format == "apng":
+        count = write_apng(args.path, trace, events_per_frame, args.fps, args.width, args.height, args.workers)
+        size = ""
+    else:
+        count, width, height = write_raw(args.path, trace, events_per_frame, args.width, args.height)
+        size = f" of {width}x{height}"
+
+    print(f"{args.path}: {count} frames{size} for {len(trace)} events", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
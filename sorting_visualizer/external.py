@@ -0,0 +1,370 @@
+"""
+External merge sort of binary files of fixed-width integers, for data which does not fit into memory.
+
+Usage:
+    $ python visualize_sorting.py external keys.bin sorted.bin --memory 256M --fan-in 16
+    $ python visualize_sorting.py external keys.bin sorted.bin --generate 10000000 --trace external.trace
+
+The input is mapped with mmap and cut into runs of at most --memory bytes, which are sorted in memory and
+written to temporary files. The runs are merged --fan-in at a time with a heap, reading and writing
+sequentially in blocks of --buffer bytes, until one run is left. The sort is a generator of events like the
+algorithms in sort_engine, on a view of a fixed number of slots which sample the file evenly: RUN events
+show the formed runs, MERGE events the runs merged next and WRITE events the merged values.
+"""
+
+from array import array
+from itertools import chain, islice
+import argparse
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+import time
+
+from . import distributions
+from . import sort_engine
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+### Default memory budget of a run, number of runs merged at once and size of the I/O blocks in bytes
+MEMORY = 64 << 20
+FAN_IN = 16
+BUFFER = 1 << 20
+
+### Item width in bytes -> array typecode
+TYPECODES = {4: "i", 8: "q"}
+
+### Number of slots of the view in a recorded trace
+SLOTS = 1000
+
+
+class Stats:
+    """
+    I/O counters of one external sort.
+    """
+
+    __slots__ = ("items", "runs", "passes", "bytes_read", "bytes_written", "elapsed")
+
+    def __init__(self, items=0):
+        self.items = items
+        self.runs = 0
+        self.passes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.elapsed = 0.0
+
+    def __str__(self):
+        return (f"{self.items} items, {self.runs} runs, {self.passes} passes, {self.bytes_read / 1e6:.1f} MB read, "
+                f"{self.bytes_written / 1e6:.1f} MB written, {self.elapsed:.2f} s")
+
+
+class View:
+    """
+    Evenly spaced sample of the items of a file: slot s shows item s * items // slots.
+    Sampled values are clamped to the range of the input sample, so that they fit the chart drawn from it.
+    """
+
+    __slots__ = ("items", "slots", "low", "high")
+
+    def __init__(self, items, slots, initial):
+        self.items = items
+        self.slots = slots
+        self.low = min(initial, default=0)
+        self.high = max(initial, default=0)
+
+    def first(self, index):
+        """
+        :return: First slot showing an item at or after index
+        """
+
+        return -(-index * self.slots // self.items)
+
+    def writes(self, values, start):
+        """
+        This function yields the WRITE events of the slots showing items of a block.
+
+        :param values: Values of the items [start, start + len(values))
+        :param start: Index of the first item
+        :return: Generator of events
+        """
+
+        low, high = self.low, self.high
+        for slot in range(self.first(start), self.first(start + len(values))):
+            yield sort_engine.WRITE, slot, min(max(values[slot * self.items // self.slots - start], low), high)
+
+
+def sample(path, slots, width=8):
+    """
+    This function reads the items of a file shown on a view.
+
+    :param path: Path of the file
+    :param slots: Number of slots of the view
+    :param width: Bytes per item, see TYPECODES
+    :return: (list of the sampled values, View)
+    """
+
+    items = os.path.getsize(path) // width
+    if not items:
+        return [], View(0, 0, [])
+    slots = min(slots, items)
+
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            values = memoryview(mapping).cast(TYPECODES[width])
+            initial = [values[slot * items // slots] for slot in range(slots)]
+            values.release()
+
+    return initial, View(items, slots, initial)
+
+
+def _sort_run(data, typecode):
+    """
+    :return: The items in the bytes sorted, as bytes
+    """
+
+    if numpy is not None:
+        run = numpy.frombuffer(data, dtype=f"={typecode}").copy()
+        run.sort()
+        return run.tobytes()
+    run = array(typecode)
+    run.frombytes(data)
+    return array(typecode, sorted(run)).tobytes()
+
+
+def _read_blocks(path, typecode, buffer, stats):
+    """
+    This function reads a run file sequentially in blocks.
+
+    :return: Generator of arrays
+    """
+
+    with open(path, "rb", buffering=0) as file:
+        while data := file.read(buffer):
+            stats.bytes_read += len(data)
+            block = array(typecode)
+            block.frombytes(data)
+            yield block
+
+
+def sort_file(source, target, memory=MEMORY, fan_in=FAN_IN, buffer=BUFFER, width=8, view=None, tmpdir=None):
+    """
+    This function sorts a binary file of native-endian integers into another file; source and target may be the same.
+    With a view, see sample(), the events of the sort are yielded on its slots.
+    The memory budget counts the raw bytes of a run; sorting it without NumPy needs a list of ints.
+
+    :param source: Path of the input file
+    :param target: Path of the output file
+    :param memory: Bytes per run
+    :param fan_in: Number of runs merged at once, at least 2
+    :param buffer: Bytes per block read from a run or written to the output
+    :param width: Bytes per item, see TYPECODES
+    :param view: View of the source, None for no events
+    :param tmpdir: Directory of the temporary run files, by default the one of the target
+    :return: Generator of events, returns Stats
+    """
+
+    typecode = TYPECODES[width]
+    if fan_in < 2:
+        raise ValueError("the fan-in must be at least 2")
+
+    start_time = time.perf_counter()
+    size = os.path.getsize(source)
+    if size % width:
+        raise ValueError(f"'{source}' is no file of {width} byte integers")
+    stats = Stats(size // width)
+    run_items = max(1, memory // width)
+    buffer_items = max(1, buffer // width)
+
+    with tempfile.TemporaryDirectory(dir=tmpdir or os.path.dirname(os.path.abspath(target))) as directory:
+
+        ### Pass 1: sort runs of the memory budget from the mapped input
+        runs = list()
+        with open(source, "rb") as file:
+            ### An empty file cannot be mapped
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            try:
+                for lo in range(0, stats.items, run_items):
+                    hi = min(lo + run_items, stats.items)
+                    data = _sort_run(mapping[lo * width:hi * width], typecode)
+                    stats.bytes_read += len(data)
+
+                    path = os.path.join(directory, f"run-{len(runs)}")
+                    with open(path, "wb", buffering=0) as run:
+                        run.write(data)
+                    stats.bytes_written += len(data)
+                    runs.append((path, lo, hi))
+
+                    if view:
+                        yield sort_engine.RUN, view.first(lo), view.first(hi)
+                        yield from view.writes(memoryview(data).cast(typecode), lo)
+            finally:
+                if size:
+                    mapping.close()
+        stats.runs = len(runs)
+        stats.passes = 1
+
+        ### Merge passes: fan_in runs at a time into one, until one run is left
+        while len(runs) > 1:
+            merged = list()
+            for group in range(0, len(runs), fan_in):
+                batch = runs[group:group + fan_in]
+                lo, hi = batch[0][1], batch[-1][2]
+                path = os.path.join(directory, f"run-{stats.passes}-{len(merged)}")
+
+                if len(batch) == 1:
+                    merged.append(batch[0])
+                    continue
+
+                if view:
+                    yield sort_engine.MERGE, view.first(lo), view.first(hi)
+                readers = [chain.from_iterable(_read_blocks(run[0], typecode, buffer, stats)) for run in batch]
+                values = heapq.merge(*readers)
+                position = lo
+                with open(path, "wb", buffering=0) as output:
+                    while block := array(typecode, islice(values, buffer_items)):
+                        output.write(block)
+                        stats.bytes_written += len(block) * width
+                        if view:
+                            yield from view.writes(block, position)
+                        position += len(block)
+
+                for run in batch:
+                    os.remove(run[0])
+                merged.append((path, lo, hi))
+
+            runs = merged
+            stats.passes += 1
+
+        ### The last run replaces the target
+        if runs:
+            os.replace(runs[0][0], target)
+        else:
+            open(target, "wb").close()
+
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
+
+
+def complete(events, trace=None, cancel=None):
+    """
+    This function runs a sort_file() generator to the end.
+
+    :param events: Generator of sort_file()
+    :param trace: sort_engine.Trace which records the events, None to drop them
+    :param cancel: threading.Event which stops the sort, None to run to the end
+    :return: Stats
+    :raise sort_engine.Cancelled: If the sort was cancelled; its run files are removed
+    """
+
+    extend = None if trace is None else trace.ops.extend
+    step = 0
+    while True:
+        try:
+            event = next(events)
+        except StopIteration as stop:
+            return stop.value
+        if extend:
+            extend(event)
+        step += 1
+        if cancel is not None and step % sort_engine.CANCEL_EVERY == 0 and cancel.is_set():
+            events.close()
+            raise sort_engine.Cancelled("External Merge Sort")
+
+
+def record(values, runs=8, fan_in=4, cancel=None):
+    """
+    This function sorts a sequence through temporary files and records the trace on a view which shows every item.
+    Used by the GUI, where the budget is chosen to form a number of runs.
+
+    :param values: The input sequence
+    :param runs: Number of runs formed
+    :param fan_in: Number of runs merged at once
+    :param cancel: threading.Event which stops the sort, None to run to the end
+    :return: (sort_engine.Trace, Stats)
+    """
+
+    values = array("q", values)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "input")
+        with open(path, "wb") as file:
+            file.write(values)
+
+        initial, view = sample(path, len(values))
+        trace = sort_engine.Trace(initial, "External Merge Sort")
+        ### Small blocks, so that the merges advance in many steps
+        events = sort_file(path, path, memory=-(-len(values) // runs) * 8, fan_in=fan_in, buffer=8 * 64,
+                           view=view, tmpdir=directory)
+        return trace, complete(events, trace, cancel)
+
+
+### Name shown in the GUI -> runs formed, fan-in
+ALGORITHMS = {
+    "External Merge Sort": (8, 4),
+}
+
+
+def parse_size(text):
+    """
+    :return: Number of bytes of e.g. "512K", "64M" or "2G"
+    """
+
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    if text[-1:].upper() in units:
+        return int(float(text[:-1]) * units[text[-1].upper()])
+    return int(text)
+
+
+def main(argv=None):
+    """
+    Command line entry point: sort a binary file of integers.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="external", description="Sort a binary file of integers with an external merge sort.")
+    parser.add_argument("source", help="input file of native-endian integers")
+    parser.add_argument("target", help="output file, may be the input file")
+    parser.add_argument("--memory", type=parse_size, default=MEMORY, help="bytes per run, e.g. 256M (default: 64M)")
+    parser.add_argument("--fan-in", type=int, default=FAN_IN, help=f"runs merged at once (default: {FAN_IN})")
+    parser.add_argument("--buffer", type=parse_size, default=BUFFER, help="bytes per I/O block (default: 1M)")
+    parser.add_argument("--width", type=int, default=8, choices=list(TYPECODES), help="bytes per integer")
+    parser.add_argument("--tmpdir", help="directory of the run files (default: the one of the target)")
+    parser.add_argument("--generate", type=int, metavar="N", help="first write N seeded integers to the input file")
+    parser.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", metavar="PATH", help="record the runs and merges on a view of --slots items")
+    parser.add_argument("--slots", type=int, default=SLOTS, help=f"items of the recorded view (default: {SLOTS})")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        values = distributions.generate(args.distribution, args.generate, args.seed)
+        if args.width == 4:
+            values = array("i", values)
+        with open(args.source, "wb") as file:
+            file.write(values)
+
+    options = dict(memory=args.memory, fan_in=args.fan_in, buffer=args.buffer, width=args.width, tmpdir=args.tmpdir)
+    if args.trace:
+        ### The trace is replayed like any other, e.g. with "Load trace" in the GUI
+        from . import replay
+
+        initial, view = sample(args.source, args.slots, args.width)
+        trace = sort_engine.Trace(initial, "External Merge Sort")
+        stats = complete(sort_file(args.source, args.target, view=view, **options), trace)
+        replay.save(args.trace, trace)
+        print(f"{args.trace}: {len(trace)} events on {len(initial)} slots", file=sys.stderr)
+    else:
+        stats = complete(sort_file(args.source, args.target, **options))
+
+    print(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
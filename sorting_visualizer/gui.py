@@ -0,0 +1,1437 @@
+"""
+The tkinter GUI. Imported only when the GUI is started, the headless commands never load tkinter.
+"""
+
+import tkinter
+from tkinter import ttk
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import resources
+import math
+import os
+import random
+import threading
+import time
+import tkinter.messagebox
+import tkinter.filedialog
+import tkinter.simpledialog
+
+from . import debugger
+from . import distributions
+from . import external
+from . import layout
+from . import parallel
+from . import profiler
+from . import race
+from . import recommend
+from . import records
+from . import render
+from . import replay
+from . import sonify
+from . import sort_engine
+from .metrics import Metrics
+
+
+### Number of frames per second while sorting, at most one per display refresh
+FRAME_RATE = 60
+
+### Share of a frame used for pulling and drawing events, the rest is left to Tk
+FRAME_BUDGET = 0.75 / FRAME_RATE
+
+### Positions of the speed slider: 10 per decade from 1 op/s, the last position is "as fast as possible"
+SPEED_STEPS = 60
+
+### Colors of the worker processes of a parallel algorithm
+WORKER_COLORS = ("#ee0000", "#ff9900", "#00aa00", "#aa00cc", "#00aacc", "#cccc00", "#ff66aa", "#886600")
+
+### Methods which render the frames of a run, timed while it is profiled
+PROFILED_FRAMES = ("tick", "race_tick", "finished")
+
+### Algorithms selected in the race dialog by default
+RACE_DEFAULT = ("Insertion Sort", "Merge Sort", "Quick Sort (Hoare)", "Heap Sort")
+
+
+class SortingVisualizer:
+    """
+    Main GUI
+    """
+
+    def __init__(self, main):
+        """
+        Init GUI
+
+        :param main: tkinter.Tk()
+        """
+
+        self.FINISHED_SORTING = False
+        self.phase = "idle"
+        self.tick_id = None
+        self.race_executor = None
+        self.race_cancel = None
+        self.record_executor = None
+        self.record_cancel = None
+        self.calibration_executor = None
+        self.stability_executor = None
+        self.stability_id = None
+        self.cost_model = None
+        self.predictions = None
+        self.table = None
+        self.profiler = None
+        self.trace = None
+        self.workers = None
+        self.undo = None
+        self.breakpoint = None
+        self.recording = False
+        self.replay_step = 0
+        self.box_color = "#5555ff"
+
+        ###### Basic Layout ######
+        """_______________________________________
+          |       Frame: Buttons and Labels       |
+          |---------------------------------------|
+          |                                       |
+          |       Frame: Canvas + Scrollbar       |
+          |                                       |
+          |_______________________________________|
+        """
+
+        ### Init root
+        self.main = main
+        self.main.bind("<Key>", self._main_window_action)
+        self.main.title("Sorting Algorithm Visualization")
+        self.main.maxsize(1500, 600)
+        self.main.config(bg="#000000")
+
+        ### Icon, shipped as package data so the GUI starts from any working directory
+        with resources.as_file(resources.files(__package__) / "icons" / "icons8-ascending-sorting-48.png") as path:
+            icon_main = tkinter.PhotoImage(file=str(path))
+        self.main.iconphoto(False, icon_main)
+
+        ### Frame: Canvas + Scrollbar
+        self.lower_part = tkinter.Frame(self.main, bg="#ddddff")
+        ### Bind/Unbind the mousewheel for scrolling
+        self.lower_part.bind('<Enter>', self._bound_to_mousewheel)
+        self.lower_part.bind('<Leave>', self._unbound_to_mousewheel)
+        self.lower_part.grid(row=1, column=0, padx=10, pady=10)
+
+        ### Control-panel
+        self.control_panel = tkinter.Frame(self.main, width=1200, height=180, bg="#444444",
+                                           highlightbackground="#ffffff", highlightthickness=2)
+        self.control_panel.grid(row=0, column=0, padx=20, pady=10)
+
+
+        ### Canvas
+        self.canvas = tkinter.Canvas(self.lower_part, width=1100, height=380, bg="#ffffff",
+                                     scrollregion=(0,0,2000,1000))
+        self.canvas.grid(row=0, column=0, padx=10, pady=10)
+
+        ###### Basic Layout End ######
+
+
+
+        ###### Labels, Buttons, ... ######
+
+        ### Label
+        self.label_algorithm = tkinter.Label(self.control_panel, text="Algorithm", height=1,
+                                             font=("italic", 13, "normal"), bg="#ddddff")
+        self.label_algorithm.grid(row=0, column=0, sticky=tkinter.W, padx=(15,2), pady=5)
+
+        ### Combobox to select algorithm from
+        self.algorithm_selection = ttk.Combobox(self.control_panel, textvariable=tkinter.StringVar(),
+                                                values=list(sort_engine.ALGORITHMS) + list(parallel.ALGORITHMS) + list(external.ALGORITHMS),
+                                                width=25, font=("italic", 13, "normal"))
+        self.algorithm_selection.grid(row=0, column=1, padx=(2,15), pady=5)
+        self.algorithm_selection.current(0)
+
+        ### Seperator
+        self.seperator1 = ttk.Separator(self.control_panel)
+        self.seperator1.grid(row=0, column=2, sticky="ns")
+
+        ### Label
+        self.number_samples_label = tkinter.Label(self.control_panel, text="Number of elements",
+                                                  height=1, font=("italic", 13, "normal"), bg="#ddddff")
+        self.number_samples_label.grid(row=0, column=3, padx=(15,2), pady=5)
+
+        ### Combobox to select the number of random elements
+        self.number_samples = ttk.Combobox(self.control_panel, textvariable=tkinter.StringVar(),
+                                           values=list(range(2, 11)) + [100, 1000, 10000, 100000], width=7, font=("italic", 13, "normal"))
+        self.number_samples.grid(row=0, column=4, padx=(2,15), pady=5)
+        self.number_samples.current(0)
+
+        ### Label
+        self.distribution_label = tkinter.Label(self.control_panel, text="Distribution",
+                                                height=1, font=("italic", 13, "normal"), bg="#ddddff")
+        self.distribution_label.grid(row=1, column=3, sticky=tkinter.W, padx=(15,2), pady=5)
+
+        ### Combobox to select the distribution of the generated elements
+        self.distribution = ttk.Combobox(self.control_panel, textvariable=tkinter.StringVar(),
+                                         values=list(distributions.DISTRIBUTIONS), width=12, font=("italic", 13, "normal"))
+        self.distribution.grid(row=1, column=4, padx=(2,15), pady=5)
+        self.distribution.current(0)
+
+        ### Label
+        self.seed_label = tkinter.Label(self.control_panel, text="Seed", height=1, font=("italic", 13, "normal"), bg="#ddddff")
+        self.seed_label.grid(row=1, column=6, sticky=tkinter.E, padx=(15,2), pady=5)
+
+        ### Entry for the seed of the generated elements; empty for a new random seed each time
+        self.seed = tkinter.Entry(self.control_panel, width=10, font=("italic", 13, "normal"))
+        self.seed.grid(row=1, column=7, padx=(2,15), pady=5)
+
+        ### Seperator
+        self.seperator1 = ttk.Separator(self.control_panel)
+        self.seperator1.grid(row=0, column=5, sticky="ns")
+
+        ### Label
+        self.speed_label = tkinter.Label(self.control_panel, text="Sorting speed", font=("italic", 13, "normal"), bg="#ddddff")
+        self.speed_label.grid(row=0, column=6, padx=(15,2), pady=5)
+
+        ### Slider to select the sorting speed in operations per second, logarithmic
+        self.speed = tkinter.Scale(self.control_panel, from_=0, to=SPEED_STEPS, orient=tkinter.HORIZONTAL, length=150,
+                                   showvalue=False, command=self._on_speed, bg="#ddddff", highlightthickness=0)
+        self.speed.grid(row=0, column=7, padx=(2,15), pady=(5,0), sticky="n")
+        self.speed_value = tkinter.Label(self.control_panel, text="1 ops/s", font=("italic", 10, "normal"), bg="#444444", fg="#ffffff")
+        self.speed_value.grid(row=0, column=7, padx=(2,15), pady=(0,2), sticky="s")
+
+        ### Seperator
+        self.seperator1 = ttk.Separator(self.control_panel)
+        self.seperator1.grid(row=0, column=8, sticky="ns")
+
+        ### Button to generate a sequence of random numbers
+        self.button_generate = tkinter.Button(self.control_panel, command=self.setup_sorting, text="Generate numbers",
+                                              font=("italic", 13, "normal"), pady=0)
+        self.button_generate.bind("<Enter>", self._button_generate_enter)
+        self.button_generate.bind("<Leave>", self._button_generate_leave)
+        self.button_generate.grid(row=0, column=9, padx=(15,2), pady=5)
+
+        ### Button to start sorting
+        self.button_sort = tkinter.Button(self.control_panel, command=self.sort, text="Start sorting",
+                                          font=("italic", 13, "normal"), pady=0)
+        self.button_sort.bind("<Enter>", self._button_start_enter)
+        self.button_sort.bind("<Leave>", self._button_start_leave)
+        self.button_sort.grid(row=0, column=10, padx=(2,15), pady=5)
+
+        ### Button to race several algorithms on the current sequence
+        self.button_race = tkinter.Button(self.control_panel, command=self.race, text="Race",
+                                          font=("italic", 13, "normal"), pady=0)
+        self.button_race.grid(row=1, column=10, padx=(2,15), pady=5)
+
+        ### Button to profile the current sequence and preselect the algorithm predicted to be the fastest
+        self.button_recommend = tkinter.Button(self.control_panel, command=self.recommend_algorithm, text="Recommend",
+                                               font=("italic", 13, "normal"), pady=0)
+        self.button_recommend.grid(row=1, column=1, padx=(2,15), pady=5)
+
+        ### Button to save the audio track of the last trace
+        self.button_save_audio = tkinter.Button(self.control_panel, command=self.save_audio, text="Save audio",
+                                                font=("italic", 13, "normal"), pady=0)
+        self.button_save_audio.grid(row=1, column=9, padx=(15,2), pady=5)
+
+        ### Label
+        self.replay_label = tkinter.Label(self.control_panel, text="Replay", height=1, font=("italic", 13, "normal"), bg="#ddddff")
+        self.replay_label.grid(row=2, column=0, sticky=tkinter.W, padx=(15,2), pady=5)
+
+        ### Scrub bar to jump to any step of the last trace
+        self.scrub = tkinter.Scale(self.control_panel, from_=0, to=0, orient=tkinter.HORIZONTAL, length=700,
+                                   showvalue=True, bg="#ddddff", highlightthickness=0)
+        self.scrub.bind("<B1-Motion>", self._on_scrub)
+        self.scrub.bind("<ButtonRelease-1>", self._on_scrub)
+        self.scrub.grid(row=2, column=1, columnspan=6, sticky="we", padx=(2,15), pady=5)
+
+        ### Button to replay the trace from the position of the scrub bar
+        self.button_replay = tkinter.Button(self.control_panel, command=self.replay, text="Play",
+                                            font=("italic", 13, "normal"), pady=0)
+        self.button_replay.grid(row=2, column=7, padx=(2,15), pady=5)
+
+        ### Buttons to save and load traces
+        self.button_save_trace = tkinter.Button(self.control_panel, command=self.save_trace, text="Save trace",
+                                                font=("italic", 13, "normal"), pady=0)
+        self.button_save_trace.grid(row=2, column=9, padx=(15,2), pady=5)
+        self.button_load_trace = tkinter.Button(self.control_panel, command=self.load_trace, text="Load trace",
+                                                font=("italic", 13, "normal"), pady=0)
+        self.button_load_trace.grid(row=2, column=10, padx=(2,15), pady=5)
+
+        ### Debugger: pause the replay, step through the trace and stop at a breakpoint
+        self.debugger_label = tkinter.Label(self.control_panel, text="Debugger", height=1, font=("italic", 13, "normal"), bg="#ddddff")
+        self.debugger_label.grid(row=3, column=0, sticky=tkinter.W, padx=(15,2), pady=5)
+
+        self.button_step_back = tkinter.Button(self.control_panel, command=lambda: self.step(-1), text="Step back",
+                                               font=("italic", 13, "normal"), pady=0)
+        self.button_step_back.grid(row=3, column=1, padx=(2,2), pady=5)
+        self.button_pause = tkinter.Button(self.control_panel, command=self.pause, text="Pause",
+                                           font=("italic", 13, "normal"), pady=0)
+        self.button_pause.grid(row=3, column=3, padx=(2,2), pady=5)
+        self.button_step = tkinter.Button(self.control_panel, command=lambda: self.step(1), text="Step",
+                                          font=("italic", 13, "normal"), pady=0)
+        self.button_step.grid(row=3, column=4, padx=(2,15), pady=5)
+
+        ### Condition and value of the breakpoint
+        self.breakpoint_kind = ttk.Combobox(self.control_panel, textvariable=tkinter.StringVar(),
+                                            values=["no breakpoint"] + list(debugger.Breakpoint.KINDS),
+                                            width=15, font=("italic", 13, "normal"))
+        self.breakpoint_kind.grid(row=3, column=6, padx=(15,2), pady=5)
+        self.breakpoint_kind.current(0)
+        self.breakpoint_value = tkinter.Entry(self.control_panel, width=10, font=("italic", 13, "normal"))
+        self.breakpoint_value.grid(row=3, column=7, padx=(2,15), pady=5)
+
+        ### Button to abort the running sort, race or replay
+        self.button_cancel = tkinter.Button(self.control_panel, command=self.cancel, text="Cancel",
+                                            font=("italic", 13, "normal"), pady=0)
+        self.button_cancel.grid(row=3, column=10, padx=(2,15), pady=5)
+
+        ### Button to load the keys of the records of a CSV or JSON Lines file
+        self.button_load_records = tkinter.Button(self.control_panel, command=self.load_records, text="Load records",
+                                                  font=("italic", 13, "normal"), pady=0)
+        self.button_load_records.grid(row=3, column=9, padx=(15,2), pady=5)
+
+        ### Toggle to profile the next runs, see begin_profile()
+        self.profiling = tkinter.BooleanVar(value=False)
+        self.profile_toggle = tkinter.Checkbutton(self.control_panel, text="Profile", variable=self.profiling,
+                                                  font=("italic", 13, "normal"), bg="#ddddff")
+        self.profile_toggle.grid(row=3, column=8, padx=(15,2), pady=5)
+
+        ### Make the Canvas scrollable
+        ### Horizontal scrollbar
+        self.hbar = tkinter.Scrollbar(self.lower_part, orient=tkinter.HORIZONTAL)
+        self.hbar.grid(row=1, column=0)
+        self.hbar.config(command=self.canvas.xview)
+        self.canvas.config(xscrollcommand=self.hbar.set)
+
+        ### Vertical scrollbar
+        self.vbar = tkinter.Scrollbar(self.lower_part, orient=tkinter.VERTICAL)
+        self.vbar.grid(row=0, column=1)
+        self.vbar.config(command=self.canvas.yview)
+        self.canvas.config(yscrollcommand=self.vbar.set)
+
+
+
+    ######### Event handling functions #########
+
+    ### Quit GUI with q; Display help with h; Cancel the run with Escape. Letters typed into an entry are text, no shortcuts
+    def _main_window_action(self, event):
+        if isinstance(event.widget, (tkinter.Entry, ttk.Combobox)) and event.keysym != 'Escape':
+            return
+        if event.char == 'q':
+            self.main.quit()
+        elif event.keysym == 'Escape':
+            self.cancel()
+        elif event.char == 'h':
+            tkinter.messagebox.showinfo(title="Help", message="1. Select algorithm\n"
+                                                              "2. Select number of elements\n"
+                                                              "3. Select speed\n"
+                                                              "4. Generate sequence\n"
+                                                              "5. Start sorting")
+    ### Change start-button color on <Enter>
+    def _button_start_enter(self, event):
+        self.button_sort.config(bg="#55ff55")
+
+    ### Change start-button color on <Leave>
+    def _button_start_leave(self, event):
+        self.button_sort.config(bg="#ffffff")
+
+    ### Change generate-button color on <Enter>
+    def _button_generate_enter(self, event):
+        self.button_generate.config(bg=self.box_color, font=("italic", 13, "normal"))
+
+    ### Change generate-button color on <Leave>
+    def _button_generate_leave(self, event):
+        self.button_generate.config(bg="#ffffff", font=("italic", 13, "normal"))
+
+    ### Enable scrolling canvas on <Enter>
+    def _bound_to_mousewheel(self, event):
+        self.canvas.bind("<MouseWheel>", self._on_vertical)
+        self.canvas.bind('<Shift-MouseWheel>', self._on_horizontal)
+
+    ### Disbale scrolling canvas on <Leave>
+    def _unbound_to_mousewheel(self, event):
+        self.canvas.unbind_all("<MouseWheel>")
+
+    ### Scroll vertical when using the MouseWheel
+    def _on_vertical(self, event):
+        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+
+    ### Scroll horizontal when using Shift + MouseWheel
+    def _on_horizontal(self, event):
+        self.canvas.xview_scroll(int(-1 * (event.delta / 120)), "units")
+
+    ### Show the selected speed next to the slider
+    def _on_speed(self, value):
+        rate = self.get_rate()
+        self.speed_value.config(text="max" if rate is None else f"{rate:,.0f} ops/s")
+
+    ### Jump to the step of the scrub bar when it is dragged or clicked
+    def _on_scrub(self, event):
+        if self.scrub.get() != self.replay_step:
+            self.seek(self.scrub.get())
+
+    ######################################################################
+
+
+    def setup_sorting(self):
+        """
+        This function generates a sequence of random numbers on the canvas depending on the chosen length.
+        The function is called when clicking the "Generate" button.
+
+        :return: None
+        """
+
+        ### A running sort is cancelled, its boxes are replaced
+        self.stop()
+
+        ### Reset variable when generating a new sequence
+        self.FINISHED_SORTING = False
+
+        ### Check if the number of elements is not between 2 and the maximum
+        ### If True: Show warning and set deafult value 10
+        if ((n := int(self.number_samples.get())) > render.BarView.MAX_ELEMENTS) or n < 2:
+            tkinter.messagebox.showwarning(title="Warning", message=f"'{n}' is not a valid number of elements!")
+            self.number_samples.set(str(10))
+            return
+
+        ### Check if the distribution is valid
+        ### If not: Set the default "uniform" and return
+        if self.distribution.get() not in distributions.DISTRIBUTIONS:
+            tkinter.messagebox.showwarning(title="Warning", message=f"'{self.distribution.get()}' is not a valid distribution!")
+            self.distribution.set("uniform")
+            return
+
+        ### Use the given seed, without a seed the sequence is random but can be reproduced with the shown seed
+        seed = self.seed.get().strip() or str(random.randrange(10**6))
+
+        ### Boxes show values from 0 to 100
+        high = 101 if n <= render.BoxView.MAX_ELEMENTS else n
+        values = list(distributions.generate(self.distribution.get(), n, seed, high))
+
+        self.show_sequence(values, f"{self.distribution.get()}, seed {seed}")
+
+
+    def show_sequence(self, values, caption):
+        """
+        This function draws a new sequence on the cleared canvas and resets the counters and the trace.
+
+        :param values: The sequence
+        :param caption: Text shown in the upper right corner
+        :return: None
+        """
+
+        ### CLear the canvas
+        self.canvas.delete("all")
+        n = len(values)
+
+        ### Few elements are shown as boxes with their value, more as a bar chart
+        if n <= render.BoxView.MAX_ELEMENTS:
+            self.view = render.BoxView(self.canvas, values, self.box_color, layout.Layout(n))
+        else:
+            self.view = render.BarView(self.canvas, values, self.box_color)
+
+        ### Set the counters back to 0
+        self.metrics = Metrics()
+        self.counter_text = ("0", "")
+        self.comparison_label = self.canvas.create_text(100, 20, text="Number of comparisons:", font=("italic", 11, "normal"))
+        self.comparison_number = self.canvas.create_text(200, 20, text="0", font=("italic", 11, "normal"))
+        self.operation_counter = self.canvas.create_text(260, 20, text="", anchor="w", font=("italic", 11, "normal"))
+        self.caption = self.canvas.create_text(1090, 20, text=caption, anchor="e", font=("italic", 11, "normal"))
+        self.sequence_caption = caption
+        self.sequence = list(values)
+
+        ### There is no trace of the new sequence yet
+        self.trace = None
+        self.workers = None
+        self.keyframes = None
+        self.undo = None
+        self.replay_step = 0
+        self.scrub.config(to=0)
+        self.scrub.set(0)
+        self.predictions = None
+        self.table = None
+        self.drop_stability()
+
+
+    def finished(self, index=0):
+        """
+        This function marks the end of the sorting algorithm by shortly coloring all elements green in ascending order.
+        Each call colors one block of elements and schedules the next one.
+
+        :param index: Index of the first element to color
+        :return: None
+        """
+
+        self.view.clear_highlight()
+
+        ### Boxes are colored one by one, bars in blocks so that the sweep takes one second
+        count = len(self.view)
+        if count <= render.BoxView.MAX_ELEMENTS:
+            rate = self.get_rate()
+            block, delay = 1, 1000 // FRAME_RATE if rate is None else max(1000 // FRAME_RATE, int(500 / rate))
+        else:
+            block, delay = -(-count // FRAME_RATE), 1000 // FRAME_RATE
+
+        ### Color the previous block back
+        if index > 0:
+            self.view.color_range(index - block, index)
+
+        ### Color elements green for a short time in ascending order
+        if index < count:
+            self.view.color_range(index, index + block, "#00ff00")
+            self.view.flush()
+            self.phase = "finishing"
+            self.tick_id = self.main.after(delay, self.finished, index + block)
+            return
+
+        ### Color all elements green to indicate the end
+        self.view.color_range(0, count, "#00ff00")
+        self.view.flush()
+
+        self.tick_id = None
+        self.phase = "idle"
+        self.FINISHED_SORTING = True
+        self.end_profile()
+
+
+    @property
+    def SORTING(self):
+        """
+        True while a run is in any phase: "sorting" live, "recording" traces in the background, "replaying" a trace,
+        "racing" or "finishing" with the final sweep.
+        """
+
+        return self.phase != "idle"
+
+
+    def stop(self):
+        """
+        This function ends the current run: the next frame is cancelled and the pools recording traces are shut down.
+        The canvas keeps the state of the last frame.
+
+        :return: None
+        """
+
+        if self.tick_id is not None:
+            self.main.after_cancel(self.tick_id)
+            self.tick_id = None
+
+        ### Running recordings check their cancel flags and stop, the processes of the race are killed
+        for cancel in (self.race_cancel, self.record_cancel):
+            if cancel is not None:
+                cancel.set()
+        if self.race_executor is not None:
+            parallel.terminate(self.race_executor)
+        for executor in (self.record_executor, self.calibration_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.race_executor = self.record_executor = self.calibration_executor = None
+        self.race_cancel = self.record_cancel = None
+
+        ### The profile of an aborted run is dropped
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler = None
+            self.unwrap_frames()
+
+        self.phase = "idle"
+
+
+    def cancel(self):
+        """
+        This function aborts the current run. A sort, a race or a recording shows the sequence it started with again,
+        with the counters at 0; a replay goes back to the start of its trace; the final sweep jumps to its end.
+        The function is called when clicking the "Cancel" button or pressing Escape.
+
+        :return: None
+        """
+
+        phase = self.phase
+        if phase == "idle":
+            return
+        self.stop()
+
+        if phase == "replaying":
+            self.seek(0)
+        elif phase == "finishing":
+            self.view.clear_highlight()
+            self.view.color_range(0, len(self.view), "#00ff00")
+            self.view.flush()
+            self.FINISHED_SORTING = True
+        else:
+            self.FINISHED_SORTING = False
+            self.show_sequence(self.run_input, self.sequence_caption)
+
+
+    def seek(self, step):
+        """
+        This function shows the state of the trace before the given step.
+        A running replay is stopped, the live sort cannot be seeked.
+
+        :param step: Index of the next event
+        :return: None
+        """
+
+        if not self.trace_complete():
+            return
+
+        ### Stop the replay
+        self.stop()
+
+        ### The keyframes are computed on the first seek
+        if self.keyframes is None:
+            self.keyframes = replay.Keyframes(self.trace)
+
+        values, self.metrics = self.keyframes.seek(int(step))
+        self.replay_step = int(step)
+        self.FINISHED_SORTING = self.replay_step == len(self.trace)
+
+        self.view.clear_highlight()
+        self.view.show(values)
+        self.view.flush()
+        self.update_counter()
+        self.scrub.set(self.replay_step)
+
+
+    def replay(self):
+        """
+        This function plays the recorded trace from the position of the scrub bar, at the end from the start.
+
+        :return: None
+        """
+
+        if self.trace is None or self.SORTING:
+            return
+
+        ### The breakpoint is checked for every event of the replay
+        self.breakpoint = self.get_breakpoint()
+        if self.breakpoint is False:
+            return
+
+        if self.replay_step >= len(self.trace):
+            self.seek(0)
+
+        self.events = self.trace.events(self.replay_step)
+        self.recording = False
+        self.FINISHED_SORTING = False
+        self.event_budget = 1.0
+        self.phase = "replaying"
+        self.begin_profile(f"Replay of {self.trace.algorithm}")
+        self.tick_id = self.main.after(0, self.tick)
+
+
+    def trace_complete(self):
+        """
+        This function checks if there is a trace which is recorded completely, so that it can be seeked and saved.
+
+        :return: True or False
+        """
+
+        return self.trace is not None and self.phase not in ("sorting", "recording")
+
+
+    def save_trace(self):
+        """
+        This function saves the trace of the last sort with its keyframes to a binary file.
+
+        :return: None
+        """
+
+        if not self.trace_complete():
+            tkinter.messagebox.showwarning(title="Warning", message="There is no finished sort to save!")
+            return
+
+        path = tkinter.filedialog.asksaveasfilename(defaultextension=".trace", filetypes=[("Sort traces", "*.trace")])
+        if not path:
+            return
+
+        try:
+            self.keyframes = replay.save(path, self.trace, self.keyframes)
+        except OSError as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Could not save '{path}':\n{error}")
+
+
+    def save_audio(self):
+        """
+        This function writes the audio track of the last trace as WAV file, at the selected speed.
+        At "as fast as possible" the track lasts sonify.DURATION seconds.
+
+        :return: None
+        """
+
+        if not self.trace_complete():
+            tkinter.messagebox.showwarning(title="Warning", message="There is no finished sort to save!")
+            return
+
+        path = tkinter.filedialog.asksaveasfilename(defaultextension=".wav", filetypes=[("WAV audio", "*.wav")])
+        if path:
+            rate = self.get_rate() or sonify.rate_for(self.trace, sonify.DURATION)
+            sonify.write(path, self.trace, rate, FRAME_RATE)
+
+
+    def load_trace(self):
+        """
+        This function loads a trace file and shows its input sequence, ready to be replayed.
+
+        :return: None
+        """
+
+        path = tkinter.filedialog.askopenfilename(filetypes=[("Sort traces", "*.trace"), ("All files", "*")])
+        if not path:
+            return
+
+        try:
+            trace, keyframes = replay.load(path)
+        except (OSError, ValueError) as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Could not load '{path}':\n{error}")
+            return
+
+        if not 2 <= len(trace.initial) <= render.BarView.MAX_ELEMENTS:
+            tkinter.messagebox.showwarning(title="Warning", message=f"A trace of {len(trace.initial)} elements cannot be shown!")
+            return
+
+        ### A running sort is cancelled
+        self.stop()
+        self.FINISHED_SORTING = False
+        self.show_sequence(list(trace.initial), f"{trace.algorithm}, {len(trace)} steps")
+        self.trace, self.keyframes = trace, keyframes
+        self.undo = None
+        self.scrub.config(to=len(trace))
+
+
+    def load_records(self):
+        """
+        This function loads the keys of the records of a CSV or JSON Lines file and shows them, ready to be sorted.
+        A file with more records than a view can show is shown as an evenly spaced sample of its records.
+
+        :return: None
+        """
+
+        path = tkinter.filedialog.askopenfilename(filetypes=[("Records", "*.csv *.jsonl *.ndjson"), ("All files", "*")])
+        if not path:
+            return
+        column = tkinter.simpledialog.askstring(title="Key", prompt="Sort the records by the column:", parent=self.main)
+        if not column:
+            return
+
+        try:
+            table = records.load(path, column)
+        except (OSError, ValueError) as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Could not load '{path}':\n{error}")
+            return
+
+        if len(table) < 2:
+            tkinter.messagebox.showwarning(title="Warning", message=f"'{path}' has less than 2 records!")
+            return
+
+        ### The built-in sort of all records, for comparison with the algorithms on the sample
+        start = time.perf_counter()
+        records.order(table.keys)
+        elapsed = time.perf_counter() - start
+
+        ### A running sort is cancelled
+        self.stop()
+        step = -(-len(table) // render.BarView.MAX_ELEMENTS)
+        self.FINISHED_SORTING = False
+        self.show_sequence(table.keys[::step].tolist(), f"{os.path.basename(path)}: {len(table)} records by '{column}'"
+                                                        f"{f', every {step}th shown' if step > 1 else ''}, all sorted in {elapsed:.2f} s")
+        self.table = table
+
+
+    def show_stability(self):
+        """
+        This function checks in the background if the finished sort kept the order of records with equal keys.
+        The algorithm runs once more on keys tagged with their rows in a worker process, see records.algorithm_order(),
+        and _poll_stability() shows the result.
+
+        :return: None
+        """
+
+        if self.table is None or self.trace.algorithm not in sort_engine.ALGORITHMS:
+            return
+
+        self.drop_stability()
+        self.stability_executor = ProcessPoolExecutor(max_workers=1)
+        future = self.stability_executor.submit(records.algorithm_order, self.trace.algorithm, self.trace.initial)
+        self.canvas.itemconfig(self.caption, text=f"{self.trace.algorithm}: checking the stability ...")
+        self.stability_id = self.main.after(100, self._poll_stability, self.trace, future)
+
+
+    def _poll_stability(self, trace, future):
+        """
+        This function shows the result of the stability check of a trace when it is ready.
+
+        :param trace: The trace which was checked
+        :param future: Future of records.algorithm_order()
+        :return: None
+        """
+
+        if not future.done():
+            self.stability_id = self.main.after(100, self._poll_stability, trace, future)
+            return
+
+        self.stability_id = None
+        self.drop_stability()
+        try:
+            rows = future.result()
+        except Exception as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Checking the stability failed:\n{error}")
+            return
+
+        wrong = records.unstable_pairs(trace.initial, rows)
+        self.canvas.itemconfig(self.caption, text=f"{trace.algorithm}: " + ("stable, equal keys kept their order" if not wrong
+                                                  else f"not stable, {wrong} pairs of equal keys changed their order"))
+
+
+    def drop_stability(self):
+        """
+        This function abandons a running stability check, e.g. when a new sequence is shown.
+
+        :return: None
+        """
+
+        if self.stability_id is not None:
+            self.main.after_cancel(self.stability_id)
+            self.stability_id = None
+        if self.stability_executor is not None:
+            self.stability_executor.shutdown(wait=False, cancel_futures=True)
+            self.stability_executor = None
+
+
+    def begin_profile(self, label):
+        """
+        This function starts profiling a run if the "Profile" toggle is set. Without it nothing is measured,
+        the frames of the run take no extra time.
+
+        :param label: Name of the run in the summary
+        :return: None
+        """
+
+        if self.profiling.get():
+            self.profiler = profiler.Profiler(label)
+            self.profiler.start()
+            ### The frames are wrapped for the time of the run, so that the waiting between them is measured
+            for name in PROFILED_FRAMES:
+                setattr(self, name, self.profiler.frame(getattr(self, name)))
+
+
+    def unwrap_frames(self):
+        """
+        This function removes the wrappers of begin_profile() from the frames.
+
+        :return: None
+        """
+
+        for name in PROFILED_FRAMES:
+            self.__dict__.pop(name, None)
+
+
+    def end_profile(self):
+        """
+        This function stops profiling the finished run and shows where its time went, see profiler.Profiler.summary().
+        The profile can be saved as pstats or JSON from the dialog.
+
+        :return: None
+        """
+
+        if self.profiler is None:
+            return
+        profile, self.profiler = self.profiler, None
+        profile.stop()
+        self.unwrap_frames()
+
+        dialog = tkinter.Toplevel(self.main)
+        dialog.title("Profile")
+        dialog.config(bg="#444444")
+        summary = tkinter.Label(dialog, text=profile.summary(), justify=tkinter.LEFT, font=("courier", 11, "normal"), bg="#ddddff")
+        summary.grid(row=0, column=0, columnspan=2, padx=10, pady=10)
+
+        def save(extension, filetypes):
+            path = tkinter.filedialog.asksaveasfilename(parent=dialog, defaultextension=extension, filetypes=filetypes)
+            if not path:
+                return
+            try:
+                profile.save(path)
+            except OSError as error:
+                tkinter.messagebox.showerror(title="Error", message=f"Saving the profile failed:\n{error}")
+
+        tkinter.Button(dialog, text="Save pstats", font=("italic", 13, "normal"), pady=0,
+                       command=lambda: save(".pstats", [("pstats", "*.pstats *.prof"), ("All files", "*")])).grid(row=1, column=0, pady=(0,10))
+        tkinter.Button(dialog, text="Save JSON", font=("italic", 13, "normal"), pady=0,
+                       command=lambda: save(".json", [("JSON", "*.json"), ("All files", "*")])).grid(row=1, column=1, pady=(0,10))
+
+
+    def get_rate(self):
+        """
+        This function returns the speed selected with the slider.
+
+        :return: Events per second, None for "as fast as possible"
+        """
+
+        position = int(self.speed.get())
+        if position >= SPEED_STEPS:
+            return None
+        return 10 ** (position / 10)
+
+
+    def add_budget(self):
+        """
+        This function adds the events due in one frame to self.event_budget.
+        The budget never exceeds one frame, so a slow frame is not made up by a burst later.
+
+        :return: None
+        """
+
+        rate = self.get_rate()
+        if rate is None:
+            self.event_budget = math.inf
+        else:
+            per_frame = rate / FRAME_RATE
+            self.event_budget = min(self.event_budget + per_frame, per_frame + 1)
+
+
+    def schedule(self, callback, frame_start):
+        """
+        This function schedules the next frame so that frames start 1 / FRAME_RATE seconds apart.
+
+        :param callback: Function rendering the next frame
+        :param frame_start: time.perf_counter() at the start of the current frame
+        :return: None
+        """
+
+        remaining = 1 / FRAME_RATE - (time.perf_counter() - frame_start)
+        self.tick_id = self.main.after(max(1, int(remaining * 1000)), callback)
+
+
+    def update_counter(self):
+        """
+        This function shows the current counters of self.metrics on the canvas.
+        Called once per frame; items whose text did not change are not touched.
+
+        :return: None
+        """
+
+        comparisons = str(self.metrics.comparisons)
+        operations = (f"Swaps: {self.metrics.swaps}    Reads: {self.metrics.reads}    Writes: {self.metrics.writes}    "
+                      f"Algorithm time: {self.metrics.elapsed:.3f} s")
+
+        if comparisons != self.counter_text[0]:
+            self.canvas.itemconfig(self.comparison_number, text=comparisons)
+        if operations != self.counter_text[1]:
+            self.canvas.itemconfig(self.operation_counter, text=operations)
+        self.counter_text = (comparisons, operations)
+
+
+    def tick(self):
+        """
+        This function renders one frame of the running sort and schedules the next one.
+        Depending on the speed several events are pulled from the algorithm per frame, intermediate steps
+        are not drawn. Never more events are pulled than fit into FRAME_BUDGET.
+
+        :return: None
+        """
+
+        frame_start = time.perf_counter()
+
+        ### Number of events due in this frame
+        self.add_budget()
+
+        ### The highlighting of the last event stays until the next event is shown
+        if self.event_budget >= 1:
+            self.view.clear_highlight()
+
+        while self.event_budget >= 1:
+
+            pull_start = time.perf_counter()
+            event = next(self.events, None)
+            self.metrics.elapsed += time.perf_counter() - pull_start
+
+            if event is None:
+                self.view.flush()
+                self.update_counter()
+                self.update_scrub()
+                if self.recording:
+                    self.show_prediction()
+                    self.show_stability()
+                self.finished()
+                return
+
+            self.event_budget -= sort_engine.STEPS[event[0]]
+            if self.recording:
+                self.trace.append(*event)
+            self.metrics.count(*event)
+            render.show_event(self.view, *event)
+            if self.workers is not None:
+                self.show_worker(self.replay_step, *event)
+            self.replay_step += 1
+
+            ### Stop the replay after an event matching the breakpoint
+            if self.breakpoint and not self.recording and self.breakpoint.hit(self.replay_step - 1, *event, self.metrics):
+                self.view.flush()
+                self.update_counter()
+                self.update_scrub()
+                self.canvas.itemconfig(self.caption, text=f"Breakpoint: {self.breakpoint} at step {self.replay_step}")
+                self.tick_id = None
+                self.phase = "idle"
+                self.end_profile()
+                return
+
+            ### Keep the frame time bounded, the remaining events are due in the next frame
+            if time.perf_counter() - frame_start > FRAME_BUDGET:
+                break
+
+        self.view.flush()
+        self.update_counter()
+        self.update_scrub()
+        self.schedule(self.tick, frame_start)
+
+
+    def update_scrub(self):
+        """
+        This function moves the scrub bar to the current step; while recording the bar grows with the trace.
+
+        :return: None
+        """
+
+        if self.recording:
+            self.scrub.config(to=self.replay_step)
+        self.scrub.set(self.replay_step)
+
+
+    def show_worker(self, step, op, a, b):
+        """
+        This function colors the elements of an event of a parallel algorithm with the color of its worker.
+
+        :param step: Index of the event in the trace
+        :param op: Event code
+        :param a: First operand
+        :param b: Second operand
+        :return: None
+        """
+
+        if op == sort_engine.AUX or op == sort_engine.MARK:
+            return
+
+        color = WORKER_COLORS[self.workers[step] % len(WORKER_COLORS)]
+        self.view.color_range(a, a + 1, color)
+        if op != sort_engine.WRITE:
+            self.view.color_range(b, b + 1, color)
+
+
+    def get_breakpoint(self):
+        """
+        This function reads the breakpoint from the debugger panel.
+
+        :return: debugger.Breakpoint, None without a breakpoint, False if the value is invalid
+        """
+
+        kind = self.breakpoint_kind.get()
+        if kind not in debugger.Breakpoint.KINDS:
+            return None
+
+        try:
+            return debugger.Breakpoint(kind, int(self.breakpoint_value.get()))
+        except ValueError:
+            tkinter.messagebox.showwarning(title="Warning", message=f"'{self.breakpoint_value.get()}' is not a valid value for '{kind}'!")
+            return False
+
+
+    def pause(self):
+        """
+        This function pauses a replay; "Play" continues it.
+
+        :return: None
+        """
+
+        if self.phase == "replaying":
+            self.stop()
+
+
+    def step(self, direction):
+        """
+        This function shows the next or undoes the last event of the trace. Memory events are passed silently.
+        Stepping backwards is O(1) per event with the undo log, which is computed on the first step back.
+
+        :param direction: 1 for a step forward, -1 for a step backward
+        :return: None
+        """
+
+        if self.trace is None or self.SORTING:
+            return
+
+        self.view.clear_highlight()
+
+        if direction > 0:
+            while self.replay_step < len(self.trace):
+                op, a, b = self.trace[self.replay_step]
+                self.metrics.count(op, a, b)
+                render.show_event(self.view, op, a, b)
+                if self.workers is not None:
+                    self.show_worker(self.replay_step, op, a, b)
+                self.replay_step += 1
+                if op != sort_engine.AUX:
+                    break
+
+        else:
+            if self.undo is None:
+                self.undo = debugger.undo_log(self.trace)
+
+            while self.replay_step > 0:
+                self.replay_step -= 1
+                op, a, b = self.trace[self.replay_step]
+                old = self.undo[self.replay_step]
+                self.metrics.uncount(op, a, b, old)
+
+                ### Show the state before the event, with the event highlighted
+                if op == sort_engine.WRITE:
+                    self.view.write(a, old)
+                elif op == sort_engine.MARK:
+                    self.view.unmark(a)
+                elif op != sort_engine.AUX:
+                    render.show_event(self.view, op, a, b)
+                if op != sort_engine.AUX:
+                    break
+
+        self.FINISHED_SORTING = self.replay_step == len(self.trace)
+        self.view.flush()
+        self.update_counter()
+        self.scrub.set(self.replay_step)
+
+
+    def race(self):
+        """
+        This function opens a dialog to choose the algorithms which race on the current sequence.
+
+        :return: None
+        """
+
+        if self.SORTING:
+            return
+
+        dialog = tkinter.Toplevel(self.main)
+        dialog.title("Race")
+        dialog.config(bg="#444444")
+
+        ### One checkbox per algorithm in two columns
+        selection = dict()
+        for i, name in enumerate(sort_engine.ALGORITHMS):
+            selection[name] = tkinter.BooleanVar(value=name in RACE_DEFAULT)
+            checkbox = tkinter.Checkbutton(dialog, text=name, variable=selection[name], anchor="w",
+                                           font=("italic", 13, "normal"), bg="#ddddff")
+            checkbox.grid(row=i // 2, column=i % 2, sticky="we", padx=5, pady=2)
+
+        button_start = tkinter.Button(dialog, text="Start race", font=("italic", 13, "normal"),
+                                      command=lambda: self.start_race(dialog, [name for name, var in selection.items() if var.get()]))
+        button_start.grid(row=len(selection) // 2 + 1, column=0, columnspan=2, pady=10)
+
+
+    def start_race(self, dialog, names):
+        """
+        This function records the traces of the lanes in a process pool; _poll_race() waits for them.
+
+        :param dialog: The dialog of race()
+        :param names: Names of the selected algorithms
+        :return: None
+        """
+
+        if not 2 <= len(names) <= race.MAX_LANES:
+            tkinter.messagebox.showwarning(title="Warning", message=f"Please select 2 to {race.MAX_LANES} algorithms!", parent=dialog)
+            return
+
+        dialog.destroy()
+        if self.SORTING:
+            return
+
+        ### The lanes race on the sequence as it was generated or loaded, not on the result of an earlier run
+        values = list(self.sequence)
+        self.race_executor, self.race_futures, self.race_cancel = race.start(names, values)
+        self.race_values = values
+        self.run_input = values
+
+        self.canvas.itemconfig(self.caption, text=f"Recording {len(names)} lanes ...")
+        self.phase = "recording"
+        self.tick_id = self.main.after(50, self._poll_race)
+
+
+    def _poll_race(self):
+        """
+        This function checks if the traces of the race are recorded, then draws one lane per algorithm and starts the race.
+
+        :return: None
+        """
+
+        if not all(future.done() for future in self.race_futures):
+            self.tick_id = self.main.after(50, self._poll_race)
+            return
+
+        self.race_executor.shutdown(wait=False)
+        self.race_executor = self.race_cancel = None
+        try:
+            lanes = [race.Lane(*future.result()) for future in self.race_futures]
+        except Exception as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Recording the race failed:\n{error}")
+            self.phase = "idle"
+            return
+
+        ### Split the canvas into lanes, each with a label and a bar chart
+        self.canvas.delete("all")
+        lane_height = 360 // len(lanes)
+        self.race_views = list()
+        self.race_labels = list()
+        for i, lane in enumerate(lanes):
+            y = 10 + i * lane_height
+            self.race_labels.append(self.canvas.create_text(50, y, text=lane.name, anchor="nw", font=("italic", 10, "normal")))
+            self.race_views.append(render.BarView(self.canvas, self.race_values, self.box_color,
+                                                  x=50, y=y + 16, width=1000, height=lane_height - 20))
+
+        self.race_state = race.Race(lanes)
+        self.race_step_cost = 1e-5 * len(lanes)
+        self.view = self.race_views[0]
+        self.trace = None
+        self.event_budget = 1.0
+        self.phase = "racing"
+        self.begin_profile(f"Race of {len(lanes)} algorithms")
+        self.tick_id = self.main.after(0, self.race_tick)
+
+
+    def recommend_algorithm(self):
+        """
+        This function profiles the current sequence, predicts the cost of every algorithm and selects the fastest one.
+        On first use the cost model is calibrated with a short benchmark in a background process, see _poll_calibration().
+
+        :return: None
+        """
+
+        if self.SORTING:
+            return
+
+        if self.cost_model is None:
+            self.run_input = self.view.values()
+            self.calibration_executor = ProcessPoolExecutor(max_workers=1)
+            self.calibration_future = self.calibration_executor.submit(recommend.calibrate)
+            self.canvas.itemconfig(self.caption, text="Calibrating the cost model ...")
+            self.phase = "recording"
+            self.tick_id = self.main.after(50, self._poll_calibration)
+            return
+
+        shape = recommend.profile(self.view.values())
+        predictions = self.cost_model.predict(shape)
+        self.predictions = dict(predictions)
+        winner, prediction = predictions[0]
+        if prediction["time_min"] is None:
+            self.canvas.itemconfig(self.caption, text="No reliable prediction of the time for this sequence")
+        else:
+            self.algorithm_selection.set(winner)
+            self.canvas.itemconfig(self.caption, text=f"Recommended: {winner}, predicted "
+                                                      f"{recommend.format_value(prediction['comparisons'], ',.0f')} "
+                                                      f"comparisons in {prediction['time_min']:.3f} s")
+
+        ### Table of all predictions, the fastest first
+        dialog = tkinter.Toplevel(self.main)
+        dialog.title("Recommendation")
+        dialog.config(bg="#444444")
+        lines = [str(shape), "", f"{'algorithm':28s} {'comparisons':>14s} {'writes':>14s} {'time':>10s}"]
+        lines += [recommend.format_prediction(name, p) for name, p in predictions]
+        lines += ["", f"-: left out, off by more than {recommend.MAX_ERROR:.0%} on calibration inputs of a similar shape"]
+        table = tkinter.Label(dialog, text="\n".join(lines), justify=tkinter.LEFT, font=("courier", 11, "normal"), bg="#ddddff")
+        table.grid(row=0, column=0, padx=10, pady=10)
+
+
+    def _poll_calibration(self):
+        """
+        This function checks if the cost model is calibrated, then recommends an algorithm for the current sequence.
+
+        :return: None
+        """
+
+        if not self.calibration_future.done():
+            self.tick_id = self.main.after(50, self._poll_calibration)
+            return
+
+        self.calibration_executor.shutdown(wait=False)
+        self.calibration_executor = None
+        self.tick_id = None
+        self.phase = "idle"
+        self.canvas.itemconfig(self.caption, text=self.sequence_caption)
+        try:
+            self.cost_model = self.calibration_future.result()
+        except Exception as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Calibrating the cost model failed:\n{error}")
+            return
+
+        self.recommend_algorithm()
+
+
+    def show_prediction(self):
+        """
+        This function shows the predicted figures of the finished sort next to the measured ones.
+
+        :return: None
+        """
+
+        if not self.predictions or self.trace.algorithm not in self.predictions:
+            return
+
+        prediction = self.predictions[self.trace.algorithm]
+        comparisons, writes, seconds = (recommend.format_value(prediction[target], spec, unit)
+                                        for target, spec, unit in (("comparisons", ",.0f", " comparisons"),
+                                                                   ("writes", ",.0f", " writes"), ("time_min", ".3f", " s")))
+        self.canvas.itemconfig(self.caption, text=f"predicted {comparisons}, {writes}, "
+                                                  f"{seconds} / measured {self.metrics.comparisons:,d} comparisons, "
+                                                  f"{self.metrics.writes:,d} writes, {self.metrics.elapsed:.3f} s")
+
+
+    def _poll_recording(self):
+        """
+        This function checks if the trace of a parallel algorithm or of the external merge sort is recorded, then plays it.
+        The events of a parallel algorithm are shown with the colors of the workers.
+
+        :return: None
+        """
+
+        if not self.record_future.done():
+            self.tick_id = self.main.after(50, self._poll_recording)
+            return
+
+        self.record_executor.shutdown(wait=False)
+        self.record_executor = self.record_cancel = None
+        self.phase = "idle"
+        try:
+            trace, result = self.record_future.result()
+        except Exception as error:
+            tkinter.messagebox.showerror(title="Error", message=f"Recording {self.algorithm_selection.get()} failed:\n{error}")
+            return
+
+        ### The external merge sort returns its I/O counters, a parallel algorithm the workers of the events
+        if isinstance(result, external.Stats):
+            self.canvas.itemconfig(self.caption, text=f"{trace.algorithm}: {result.runs} runs, {result.passes} passes, "
+                                                      f"{result.bytes_read:,d} bytes read, {result.bytes_written:,d} written")
+            self.trace, self.workers = trace, None
+        else:
+            count = len(set(result))
+            self.canvas.itemconfig(self.caption, text=f"{trace.algorithm}, {count} worker{'s' if count != 1 else ''}")
+            self.trace, self.workers = trace, result
+        self.keyframes = None
+        self.undo = None
+        self.replay_step = 0
+        self.scrub.config(to=len(trace))
+        self.replay()
+
+
+    def race_tick(self):
+        """
+        This function renders one frame of the race: all lanes advance by the same number of steps.
+
+        :return: None
+        """
+
+        frame_start = time.perf_counter()
+        lanes = self.race_state.lanes
+
+        ### Number of steps due in this frame, bounded by the measured cost of one step so that the frame fits into FRAME_BUDGET
+        self.add_budget()
+        max_steps = max(1, int(FRAME_BUDGET / self.race_step_cost))
+        steps = max_steps if self.event_budget == math.inf else min(int(self.event_budget), max_steps)
+        self.event_budget -= steps
+
+        if steps:
+            for view in self.race_views:
+                view.clear_highlight()
+
+            for lane, events in self.race_state.advance(steps):
+                view = self.race_views[lanes.index(lane)]
+                for op, a, b in events:
+                    render.show_event(view, op, a, b)
+
+            for lane, view, label in zip(lanes, self.race_views, self.race_labels):
+                view.flush()
+                text = (f"{lane.name}:  {lane.step} steps    {lane.metrics.comparisons} comparisons    "
+                        f"{lane.metrics.swaps} swaps    {lane.metrics.writes} writes")
+                if lane.place:
+                    text += f"    finished #{lane.place}"
+                elif lane.done:
+                    text += f"    stopped at {lane.step} steps"
+                self.canvas.itemconfig(label, text=text)
+
+            self.race_step_cost = (self.race_step_cost + (time.perf_counter() - frame_start) / steps) / 2
+
+        if self.race_state.done:
+            self.tick_id = None
+            self.phase = "idle"
+            self.FINISHED_SORTING = True
+            self.end_profile()
+            return
+
+        self.schedule(self.race_tick, frame_start)
+
+
+    def sort(self):
+        """
+        This function starts the sorting procedure with the selected algorithm.
+
+        :return: None
+        """
+
+        ### Ignore the button while a sort is running
+        if self.SORTING:
+            return
+
+        if self.FINISHED_SORTING == True:
+            if len(self.view) <= render.BoxView.MAX_ELEMENTS:
+                sorted_sequence = f"Sequence {self.view.values()}"
+            else:
+                sorted_sequence = f"The sequence of {len(self.view)} elements"
+            tkinter.messagebox.showwarning(title="Warning", message=f"{sorted_sequence} is already sorted!\nPlease generate a new sequence!")
+            return
+
+        ### Get the selected algorithm from the combobox
+        algorithm = self.algorithm_selection.get()
+
+        ### Start sorting
+        ### If the sorting algorithm is invalid: Set the default to "Bubble Sort" and return
+        if algorithm in sort_engine.ALGORITHMS:
+            ### The events are pulled from the algorithm frame by frame, see tick()
+            values = self.view.values()
+            self.run_input = list(values)
+            self.trace = sort_engine.Trace(values, algorithm)
+            self.workers = None
+            self.keyframes = None
+            self.undo = None
+            self.replay_step = 0
+            self.events = sort_engine.ALGORITHMS[algorithm](values)
+            self.recording = True
+            self.event_budget = 1.0
+            self.phase = "sorting"
+            self.begin_profile(algorithm)
+            self.tick_id = self.main.after(0, self.tick)
+        elif algorithm in parallel.ALGORITHMS:
+            ### The trace is recorded by a process pool in the background, then played like a replay
+            self.run_input = self.view.values()
+            self.record_executor = ThreadPoolExecutor(max_workers=1)
+            self.record_cancel = threading.Event()
+            self.record_future = self.record_executor.submit(parallel.record, algorithm, self.run_input, None, self.record_cancel)
+            self.canvas.itemconfig(self.caption, text=f"Recording {algorithm} ...")
+            self.phase = "recording"
+            self.tick_id = self.main.after(50, self._poll_recording)
+        elif algorithm in external.ALGORITHMS:
+            ### The sequence is sorted through temporary files in the background, then played like a replay
+            self.run_input = self.view.values()
+            self.record_executor = ThreadPoolExecutor(max_workers=1)
+            self.record_cancel = threading.Event()
+            self.record_future = self.record_executor.submit(external.record, self.run_input, *external.ALGORITHMS[algorithm],
+                                                             self.record_cancel)
+            self.canvas.itemconfig(self.caption, text=f"Recording {algorithm} ...")
+            self.phase = "recording"
+            self.tick_id = self.main.after(50, self._poll_recording)
+        else:
+            tkinter.messagebox.showwarning(title="Warning", message=f"'{self.algorithm_selection.get()}' is not a valid sorting algorithm!\n"
+                                                                    f"Please select a different algorithm!")
+            self.algorithm_selection.set("Bubble Sort")
+            return
+
+
+
+def main():
+    """
+    Entry point of the GUI.
+
+    :return: Exit code
+    """
+
+    root = tkinter.Tk()
+
+    app = SortingVisualizer(root)
+
+    root.mainloop()
+    return 0
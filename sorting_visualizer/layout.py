@@ -0,0 +1,57 @@
+"""
+Positions of the boxes on the canvas, kept in arrays so they never have to be queried from Tk.
+No tkinter in here, the layout can be computed and checked headless.
+"""
+
+from array import array
+
+
+class Layout:
+    """
+    Maps every index to the slot of its box. The slots are computed once for a sequence.
+    """
+
+    __slots__ = ("x", "y", "width", "height", "spacing")
+
+    def __init__(self, count, x=200, y=100, width=50, height=50, spacing=25):
+        """
+        Init layout with one slot per index in a row from left to right
+
+        :param count: Number of elements
+        :param x: Left border of the first box
+        :param y: Top border of the boxes
+        :param width: Width of a box
+        :param height: Height of a box
+        :param spacing: Gap between two boxes
+        """
+
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+        self.x = array("d", [x + i * (width + spacing) for i in range(count)])
+        self.y = array("d", [y]) * count
+
+    def __len__(self):
+        return len(self.x)
+
+    def box(self, index):
+        """
+        :return: (x_tl, y_tl, x_br, y_br) of the box at the index
+        """
+
+        x, y = self.x[index], self.y[index]
+        return x, y, x + self.width, y + self.height
+
+    def center(self, index):
+        """
+        :return: (x, y) of the center of the box at the index, where its text is placed
+        """
+
+        return self.x[index] + self.width / 2, self.y[index] + self.height / 2
+
+    def arrow(self, index_left, index_right):
+        """
+        :return: (x_left, y, x_right, y) of an arrow between the boxes at two indices
+        """
+
+        return self.x[index_left] + self.width, self.y[index_left] + self.height / 2, self.x[index_right], self.y[index_right] + self.height / 2
@@ -0,0 +1,124 @@
+"""
+Operation counters of a sorting run, kept as plain integers.
+"""
+
+from . import sort_engine
+
+
+class Metrics:
+    """
+    Counts comparisons, swaps, array reads/writes and auxiliary memory of the events of one run.
+    Reads and writes are derived from the events: a comparison reads two elements, a swap reads and
+    writes two elements, a write event writes one element.
+    """
+
+    __slots__ = ("comparisons", "swaps", "reads", "writes", "aux", "aux_peak", "elapsed")
+
+    FIELDS = ("comparisons", "swaps", "reads", "writes", "aux_peak", "elapsed")
+
+    def __init__(self):
+        """
+        Init all counters with 0
+        """
+
+        self.reset()
+
+    def reset(self):
+        """
+        This function sets all counters back to 0.
+
+        :return: None
+        """
+
+        self.comparisons = 0
+        self.swaps = 0
+        self.reads = 0
+        self.writes = 0
+        self.aux = 0
+        self.aux_peak = 0
+        self.elapsed = 0.0
+
+    def count(self, op, a, b):
+        """
+        This function counts a single event.
+
+        :param op: Event code
+        :param a: First operand
+        :param b: Second operand
+        :return: None
+        """
+
+        if op == sort_engine.COMPARE:
+            self.comparisons += 1
+            self.reads += 2
+        elif op == sort_engine.SWAP:
+            self.swaps += 1
+            self.reads += 2
+            self.writes += 2
+        elif op == sort_engine.WRITE:
+            self.writes += 1
+        elif op == sort_engine.AUX:
+            self.aux += a
+            if self.aux > self.aux_peak:
+                self.aux_peak = self.aux
+
+    def uncount(self, op, a, b, old_peak):
+        """
+        This function takes back the counting of a single event, see debugger.undo_log().
+
+        :param op: Event code
+        :param a: First operand
+        :param b: Second operand
+        :param old_peak: Peak of the auxiliary memory before the event
+        :return: None
+        """
+
+        if op == sort_engine.COMPARE:
+            self.comparisons -= 1
+            self.reads -= 2
+        elif op == sort_engine.SWAP:
+            self.swaps -= 1
+            self.reads -= 2
+            self.writes -= 2
+        elif op == sort_engine.WRITE:
+            self.writes -= 1
+        elif op == sort_engine.AUX:
+            self.aux -= a
+            self.aux_peak = old_peak
+
+    def count_all(self, events):
+        """
+        This function counts all events of an iterable, e.g. a Trace.
+
+        :param events: Iterable of (op, a, b)
+        :return: self
+        """
+
+        count = self.count
+        for op, a, b in events:
+            count(op, a, b)
+        return self
+
+    def snapshot(self):
+        """
+        :return: Tuple of all counters except the time, see restore()
+        """
+
+        return self.comparisons, self.swaps, self.reads, self.writes, self.aux, self.aux_peak
+
+    def restore(self, counters):
+        """
+        This function sets the counters from a snapshot.
+
+        :param counters: Tuple from snapshot()
+        :return: None
+        """
+
+        self.comparisons, self.swaps, self.reads, self.writes, self.aux, self.aux_peak = counters
+
+    def as_dict(self):
+        """
+        :return: Dictionary with the counters in FIELDS
+        """
+
+        return {field: getattr(self, field) for field in self.FIELDS}
@@ -0,0 +1,481 @@
+"""
+Parallel sorting algorithms on a process pool. No tkinter in here.
+
+The array lives in a multiprocessing.shared_memory buffer of int64. An algorithm runs in rounds; the tasks
+of a round work on disjoint parts of the array, so they run in any order on any worker. Every task
+returns its events, and the events of a round are interleaved into one Trace together with the number of
+the worker which produced each event.
+"""
+
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, wait
+from itertools import zip_longest
+from multiprocessing import resource_tracker, shared_memory
+import os
+import random
+import time
+
+from . import sort_engine
+
+
+### Tasks of the final round per worker, more tasks balance uneven partitions
+TASKS_PER_WORKER = 2
+
+### Samples per bucket from which the splitters of SampleSort are chosen
+OVERSAMPLING = 16
+
+### Shared memory attachments kept open per worker process
+ATTACHMENTS = 2
+
+### Seconds between two checks of the cancel flag while a round runs
+CANCEL_POLL = 0.1
+
+### Attachments of this worker process: name -> (SharedMemory, memoryview of int64)
+_attached = dict()
+
+
+def _attach(name, length):
+    """
+    This function maps a shared buffer into the worker, the last ATTACHMENTS buffers stay mapped.
+
+    :param name: Name of the shared memory
+    :param length: Number of int64 elements
+    :return: memoryview of the elements
+    """
+
+    if name not in _attached:
+        while len(_attached) >= ATTACHMENTS:
+            shm, view = _attached.pop(next(iter(_attached)))
+            view.release()
+            shm.close()
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = (shm, shm.buf.cast("q"))
+    return _attached[name][1][:length]
+
+
+def _collect(events, offset, trace):
+    """
+    This function runs a generator of events to its end and stores the events moved by an offset.
+
+    :param events: Generator of events on a copy of a part of the array
+    :param offset: Index of the first element of the part
+    :param trace: array('q') for the events, None to only run the generator
+    :return: The return value of the generator
+    """
+
+    while True:
+        try:
+            op, a, b = next(events)
+        except StopIteration as stop:
+            return stop.value
+
+        if trace is not None:
+            if op == sort_engine.COMPARE or op == sort_engine.SWAP:
+                trace.extend((op, a + offset, b + offset))
+            elif op == sort_engine.MARK or op == sort_engine.WRITE:
+                trace.extend((op, a + offset, b))
+            else:
+                trace.extend((op, a, b))
+
+
+def _task(name, length, kind, lo, hi, param, record):
+    """
+    This function runs one task of a round. Runs in a worker process.
+
+    :param name: Name of the shared memory with the array
+    :param length: Number of elements of the array
+    :param kind: "sort", "partition", "merge", "classify", "scatter" or "exchange"
+    :param lo: First index of the part
+    :param hi: Last index of the part (exclusive)
+    :param param: Parameter of the kind, see the functions of the algorithms
+    :param record: Return the events
+    :return: (process id, array('q') of events or None, result of the task)
+    """
+
+    view = _attach(name, length)
+    trace = array("q") if record else None
+    result = None
+
+    if kind == "exchange":
+        result = _exchange(view, length, lo, hi, param, trace)
+
+    elif kind == "classify":
+        ### Number of elements of the part in each bucket
+        splitters = param
+        result = [0] * (len(splitters) + 1)
+        for value in view[lo:hi]:
+            result[bisect_right(splitters, value)] += 1
+
+    elif kind == "scatter":
+        ### Copy the elements of the part to their buckets in the scratch buffer
+        splitters, offsets, scratch_name = param
+        scratch = _attach(scratch_name, length)
+        offsets = list(offsets)
+        for value in view[lo:hi].tolist():
+            bucket = bisect_right(splitters, value)
+            scratch[offsets[bucket]] = value
+            if trace is not None:
+                trace.extend((sort_engine.WRITE, offsets[bucket], value))
+            offsets[bucket] += 1
+
+    else:
+        ### The other kinds work on a copy of the part, which is written back at the end
+        part = view[lo:hi].tolist()
+        if kind == "sort":
+            _collect(sort_engine.ALGORITHMS[param](part), lo, trace)
+        elif kind == "partition":
+            left_hi, right_lo = _collect(sort_engine._median_of_three_partition(part, 0, len(part) - 1), lo, trace)
+            result = (lo + left_hi + 1, lo + right_lo)
+        elif kind == "merge":
+            _collect(sort_engine._merge(part, 0, param - lo, len(part)), lo, trace)
+        view[lo:hi] = array("q", part)
+
+    return os.getpid(), trace, result
+
+
+def _exchange(view, length, lo, hi, param, trace):
+    """
+    This function does the compare-exchanges of one step of the bitonic network for the pairs [lo, hi).
+    Pair p consists of the element i, which is p with a zero bit inserted at the bit of the distance, and its partner.
+    Partners beyond the end of the array are treated as +infinity, so they are never exchanged.
+
+    :param param: (distance j, True if the partner of i is mirrored in its block of 2j instead of i + j)
+    :return: None
+    """
+
+    distance, mirror = param
+    low_mask = distance - 1
+    partner_mask = 2 * distance - 1 if mirror else distance
+
+    for p in range(lo, hi):
+        i = ((p & ~low_mask) << 1) | (p & low_mask)
+        j = i ^ partner_mask
+        if j >= length:
+            continue
+        if trace is not None:
+            trace.extend((sort_engine.COMPARE, i, j))
+        if view[i] > view[j]:
+            view[i], view[j] = view[j], view[i]
+            if trace is not None:
+                trace.extend((sort_engine.SWAP, i, j))
+
+
+def _bounds(lo, hi, parts):
+    """
+    :return: List of (lo, hi) of up to parts consecutive, nearly equal and non-empty ranges of [lo, hi)
+    """
+
+    parts = max(1, min(parts, hi - lo))
+    return [(lo + k * (hi - lo) // parts, lo + (k + 1) * (hi - lo) // parts) for k in range(parts)]
+
+
+class Run:
+    """
+    One run of a parallel algorithm: the shared array, the pool and the collected trace.
+    """
+
+    def __init__(self, executor, workers, values, name="", record=True, cancel=None):
+        """
+        Init run and copy the values into shared memory
+
+        :param executor: ProcessPoolExecutor with the workers
+        :param workers: Number of worker processes
+        :param values: The input sequence
+        :param name: Name of the algorithm for the trace
+        :param record: Collect the events
+        :param cancel: threading.Event which cancels the run between and during its rounds, None to run to the end
+        """
+
+        self.executor = executor
+        self.workers = workers
+        self.length = len(values)
+        self.record = record
+        self.cancel = cancel
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * self.length))
+        self.view = self.shm.buf.cast("q")[:self.length]
+        self.view[:] = array("q", values)
+        self.scratch_shm = None
+
+        self.trace = sort_engine.Trace(values, name) if record else None
+        self.worker_ids = array("B")
+        self.pids = dict()
+
+    def round(self, kind, tasks):
+        """
+        This function runs the tasks of one round in the pool and waits for all of them.
+        The events of the tasks are interleaved one by one, as they would appear when running at the same speed.
+
+        :param kind: Kind of the tasks, see _task()
+        :param tasks: List of (lo, hi, param)
+        :return: List of the results in the order of the tasks
+        :raise sort_engine.Cancelled: If the cancel flag is set
+        """
+
+        futures = [self.executor.submit(_task, self.shm.name, self.length, kind, lo, hi, param, self.record)
+                   for lo, hi, param in tasks]
+        if self.cancel is not None:
+            while not self.cancel.is_set() and wait(futures, timeout=CANCEL_POLL)[1]:
+                pass
+            if self.cancel.is_set():
+                raise sort_engine.Cancelled(kind)
+        results = [future.result() for future in futures]
+
+        if self.record:
+            parts = list()
+            for pid, events, result in results:
+                worker = self.pids.setdefault(pid, len(self.pids))
+                parts.append([(worker, events[k:k+3]) for k in range(0, len(events), 3)])
+
+            extend = self.trace.ops.extend
+            for step in zip_longest(*parts):
+                for event in step:
+                    if event is not None:
+                        extend(event[1])
+                        self.worker_ids.append(event[0])
+
+        return [result for pid, events, result in results]
+
+    def scratch(self):
+        """
+        :return: Name of a second shared buffer of the same length, created on the first call
+        """
+
+        if self.scratch_shm is None:
+            self.scratch_shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * self.length))
+        return self.scratch_shm.name
+
+    def copy_scratch(self):
+        """
+        This function copies the scratch buffer into the array.
+
+        :return: None
+        """
+
+        scratch = self.scratch_shm.buf.cast("q")
+        self.view[:] = scratch[:self.length]
+        scratch.release()
+
+    def values(self):
+        """
+        :return: List of the current values
+        """
+
+        return self.view.tolist()
+
+    def close(self):
+        """
+        This function frees the shared memory.
+
+        :return: None
+        """
+
+        self.view.release()
+        for shm in (self.shm, self.scratch_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+def parallel_merge_sort(run):
+    """
+    This function sorts one part per worker with MergeSort, then merges neighbouring parts in rounds.
+
+    :param run: Run
+    :return: None
+    """
+
+    ranges = _bounds(0, run.length, run.workers)
+    run.round("sort", [(lo, hi, "Merge Sort") for lo, hi in ranges])
+
+    while len(ranges) > 1:
+        pairs = [(ranges[k][0], ranges[k+1][1], ranges[k][1]) for k in range(0, len(ranges) - 1, 2)]
+        run.round("merge", pairs)
+        merged = [(lo, hi) for lo, hi, mid in pairs]
+        if len(ranges) % 2:
+            merged.append(ranges[-1])
+        ranges = merged
+
+
+def parallel_quick_sort(run):
+    """
+    This function partitions the array in rounds until there are enough parts for all workers,
+    then every part is sorted by QuickSort as its own task. The pool hands the parts to free workers.
+
+    :param run: Run
+    :return: None
+    """
+
+    ranges = [(0, run.length)]
+    target = TASKS_PER_WORKER * run.workers
+    small = max(16, run.length // (4 * target))
+
+    while len(ranges) < target:
+        large = [(lo, hi, None) for lo, hi in ranges if hi - lo > small]
+        if not large:
+            break
+        ranges = [(lo, hi) for lo, hi in ranges if hi - lo <= small]
+        for (lo, hi, param), (left_hi, right_lo) in zip(large, run.round("partition", large)):
+            ranges.extend(((lo, left_hi), (right_lo, hi)))
+        ranges.sort()
+
+    run.round("sort", [(lo, hi, "Quick Sort (median of 3)") for lo, hi in ranges if hi - lo > 1])
+
+
+def sample_sort(run):
+    """
+    This function chooses splitters from a sample, distributes the elements of each part into buckets
+    in a scratch buffer and sorts every bucket as its own task.
+
+    :param run: Run
+    :return: None
+    """
+
+    buckets = TASKS_PER_WORKER * run.workers
+    rng = random.Random(run.length)
+    sample = sorted(run.view[rng.randrange(run.length)] for k in range(OVERSAMPLING * buckets))
+    splitters = sample[OVERSAMPLING::OVERSAMPLING][:buckets - 1]
+
+    ### Count the elements per part and bucket, then compute where each part writes into each bucket
+    parts = _bounds(0, run.length, run.workers)
+    counts = run.round("classify", [(lo, hi, splitters) for lo, hi in parts])
+
+    offsets = [[0] * len(counts[0]) for part in parts]
+    position = 0
+    starts = list()
+    for bucket in range(len(counts[0])):
+        starts.append(position)
+        for part in range(len(parts)):
+            offsets[part][bucket] = position
+            position += counts[part][bucket]
+    starts.append(position)
+
+    scratch = run.scratch()
+    run.round("scatter", [(lo, hi, (splitters, offsets[part], scratch)) for part, (lo, hi) in enumerate(parts)])
+    run.copy_scratch()
+
+    run.round("sort", [(starts[k], starts[k+1], "Quick Sort (median of 3)")
+                       for k in range(len(starts) - 1) if starts[k+1] - starts[k] > 1])
+
+
+def bitonic_sort(run):
+    """
+    This function runs the bitonic sorting network for the next power of two, all steps sort ascending.
+    Every step is one round, its pairs are split evenly between the workers.
+
+    :param run: Run
+    :return: None
+    """
+
+    size = 1
+    while size < run.length:
+        size *= 2
+    pairs = _bounds(0, size // 2, run.workers)
+
+    block = 2
+    while block <= size:
+        run.round("exchange", [(lo, hi, (block // 2, True)) for lo, hi in pairs])
+        distance = block // 4
+        while distance >= 1:
+            run.round("exchange", [(lo, hi, (distance, False)) for lo, hi in pairs])
+            distance //= 2
+        block *= 2
+
+
+### Name -> function(run)
+ALGORITHMS = {
+    "Parallel Merge Sort": parallel_merge_sort,
+    "Parallel Quick Sort": parallel_quick_sort,
+    "Sample Sort": sample_sort,
+    "Bitonic Sort": bitonic_sort,
+}
+
+
+def start(workers=None):
+    """
+    This function starts a pool and waits until all its processes are running.
+
+    :param workers: Number of processes, default is the number of cores
+    :return: (executor, number of workers); shut the executor down when done
+    """
+
+    ### The workers have to share the resource tracker of this process, otherwise each of them
+    ### would remove the shared memory it attached to when it exits
+    resource_tracker.ensure_running()
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    for future in [executor.submit(os.getpid) for k in range(2 * workers)]:
+        future.result()
+    return executor, workers
+
+
+def terminate(executor):
+    """
+    This function drops the pending tasks of a pool and kills its processes, so that a cancelled recording
+    does not keep the cores busy.
+
+    :param executor: ProcessPoolExecutor
+    :return: None
+    """
+
+    ### ProcessPoolExecutor kills its workers itself only from Python 3.14 on
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+    processes = list((executor._processes or dict()).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def record(name, values, workers=None, cancel=None):
+    """
+    This function records the trace of a parallel algorithm.
+
+    :param name: Name from ALGORITHMS
+    :param values: The input sequence
+    :param workers: Number of processes, default is the number of cores
+    :param cancel: threading.Event which cancels the recording and terminates the pool, None to run to the end
+    :return: (sort_engine.Trace, array('B') with the worker of every event)
+    :raise sort_engine.Cancelled: If the recording was cancelled
+    """
+
+    executor, workers = start(workers)
+    try:
+        run = Run(executor, workers, values, name, cancel=cancel)
+        try:
+            if len(values) > 1:
+                ALGORITHMS[name](run)
+        finally:
+            run.close()
+    except sort_engine.Cancelled:
+        terminate(executor)
+        raise
+    finally:
+        executor.shutdown()
+
+    return run.trace, run.worker_ids
+
+
+def measure(name, values, executor, workers):
+    """
+    This function times a parallel algorithm without recording events.
+
+    :param name: Name from ALGORITHMS
+    :param values: The input sequence
+    :param executor: Running pool, see start()
+    :param workers: Number of processes of the pool
+    :return: (wall time in seconds, sorted list)
+    """
+
+    start_time = time.perf_counter()
+    run = Run(executor, workers, values, name, record=False)
+    try:
+        if len(values) > 1:
+            ALGORITHMS[name](run)
+        result = run.values()
+    finally:
+        run.close()
+    return time.perf_counter() - start_time, result
@@ -0,0 +1,233 @@
+"""
+Profile of a run: where the wall time and the memory go, to find the bottlenecks as the size grows.
+
+A run is profiled with cProfile and tracemalloc from its start to its end. The time of every function is
+attributed to the algorithm, the metrics, the rendering or the GUI by the module it is defined in; the time
+of a builtin goes to the functions which called it. The waiting time is measured between the end of one frame
+and the start of the next, see frame(); the rest of the wall time is the overhead of the measurement itself.
+Nothing is measured while no run is profiled.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+
+### Parts of the program in the breakdown
+CATEGORIES = ("algorithm", "metrics", "render", "gui", "wait", "overhead")
+
+### Module -> part of the program; tkinter is "render", all other modules are "gui"
+MODULES = {
+    "sort_engine.py": "algorithm",
+    "parallel.py": "algorithm",
+    "external.py": "algorithm",
+    "race.py": "algorithm",
+    "metrics.py": "metrics",
+    "render.py": "render",
+    "layout.py": "render",
+}
+
+### Exceptions from MODULES: (module, function) -> part of the program
+FUNCTIONS = {
+    ("sort_engine.py", "append"): "gui",        ### Trace.append records the live sort
+}
+
+### Frames stored per allocation and number of allocation sites in the summary
+TRACEBACK_FRAMES = 1
+TOP_ALLOCATIONS = 8
+
+### Functions shown per part of the program and width of the bars
+TOP_FUNCTIONS = 4
+BAR_WIDTH = 30
+
+
+def category(key):
+    """
+    :param key: (file, line, function) of pstats
+    :return: Part of the program of a function
+    """
+
+    path, line, function = key
+    module = os.path.basename(path)
+    if (module, function) in FUNCTIONS:
+        return FUNCTIONS[(module, function)]
+    if os.sep + "tkinter" + os.sep in path:
+        return "render"
+    return MODULES.get(module, "gui")
+
+
+def _bar(share):
+    full = round(share * BAR_WIDTH)
+    return "|" + "█" * full + " " * (BAR_WIDTH - full) + "|"
+
+
+class Profiler:
+    """
+    cProfile and tracemalloc around one run.
+    """
+
+    __slots__ = ("label", "profile", "tracing", "start_time", "wall", "snapshot", "peak", "waiting", "frame_end", "depth")
+
+    def __init__(self, label):
+        """
+        :param label: Name of the run, e.g. the algorithm
+        """
+
+        self.label = label
+        self.profile = cProfile.Profile()
+        self.tracing = False
+        self.start_time = 0.0
+        self.wall = 0.0
+        self.snapshot = None
+        self.peak = 0
+        self.waiting = 0.0
+        self.frame_end = None
+        self.depth = 0
+
+    def start(self):
+        """
+        This function starts measuring.
+
+        :return: None
+        """
+
+        ### An outer tracemalloc session is left running
+        self.tracing = tracemalloc.is_tracing()
+        if not self.tracing:
+            tracemalloc.start(TRACEBACK_FRAMES)
+        tracemalloc.reset_peak()
+        self.start_time = self.frame_end = time.perf_counter()
+        self.profile.enable()
+
+    def frame(self, callback):
+        """
+        This function wraps a callback which renders a frame, so that the time between two frames is measured.
+        Frames called from within a frame, e.g. the first step of the final sweep, belong to the outer one.
+
+        :param callback: Function scheduled with after()
+        :return: Function with the same arguments
+        """
+
+        def timed(*args):
+            if self.depth == 0:
+                self.waiting += time.perf_counter() - self.frame_end
+            self.depth += 1
+            try:
+                return callback(*args)
+            finally:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.frame_end = time.perf_counter()
+
+        return timed
+
+    def stop(self):
+        """
+        This function stops measuring and keeps the allocations of the run.
+
+        :return: None
+        """
+
+        self.profile.disable()
+        self.wall = time.perf_counter() - self.start_time
+        self.peak = tracemalloc.get_traced_memory()[1]
+        self.snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        if not self.tracing:
+            tracemalloc.stop()
+
+    def breakdown(self):
+        """
+        This function attributes the measured time to the parts of the program.
+
+        :return: (dictionary part -> seconds, list of (seconds, part, function) sorted by time)
+        """
+
+        times = dict.fromkeys(CATEGORIES, 0.0)
+        functions = list()
+        busy = 0.0
+
+        for key, (cc, nc, tt, ct, callers) in pstats.Stats(self.profile).stats.items():
+            busy += tt
+            path, line, function = key
+            if path != "~":
+                part = category(key)
+                times[part] += tt
+                functions.append((tt, part, f"{function} ({os.path.basename(path)}:{line})"))
+                continue
+
+            ### A builtin is split among its callers by the time it took for each of them
+            if not callers:
+                times["gui"] += tt
+                functions.append((tt, "gui", function))
+                continue
+            total = sum(values[2] for values in callers.values())
+            for caller, values in callers.items():
+                times[category(caller)] += tt * values[2] / total if total else tt / len(callers)
+            main_caller = max(callers, key=lambda caller: callers[caller][2])
+            functions.append((tt, category(main_caller), function))
+
+        times["wait"] = self.waiting
+        times["overhead"] = max(0.0, self.wall - busy - self.waiting)
+        functions.sort(reverse=True)
+        return times, functions
+
+    def allocations(self):
+        """
+        :return: List of (size in bytes, number of blocks, "file:line") of the largest allocation sites
+        """
+
+        result = list()
+        for stat in self.snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            result.append((stat.size, stat.count, f"{os.path.basename(frame.filename)}:{frame.lineno}"))
+        return result
+
+    def summary(self):
+        """
+        This function renders the breakdown as text: one bar per part of the program with its most expensive
+        functions below, like the first two levels of a flame graph, then the largest allocation sites.
+
+        :return: String
+        """
+
+        times, functions = self.breakdown()
+        wall = self.wall or 1.0
+        lines = [f"{self.label}: {self.wall:.3f} s wall time, {self.peak / 1e6:.1f} MB peak of traced memory", ""]
+
+        for part in sorted(CATEGORIES, key=times.get, reverse=True):
+            lines.append(f"{part:10s} {_bar(times[part] / wall)} {times[part] / wall:6.1%} {times[part]:8.3f} s")
+            for seconds, owner, name in [entry for entry in functions if entry[1] == part][:TOP_FUNCTIONS]:
+                lines.append(f"    {name[:60]:60s} {seconds / wall:6.1%} {seconds:8.3f} s")
+
+        lines += ["", "Largest allocations"]
+        for size, count, site in self.allocations():
+            lines.append(f"    {site:40s} {size / 1e3:10.1f} kB in {count} blocks")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """
+        :return: The breakdown and the allocations as dictionary for JSON
+        """
+
+        times, functions = self.breakdown()
+        return {"label": self.label, "wall": self.wall, "peak_memory": self.peak, "parts": times,
+                "functions": [{"function": name, "part": part, "seconds": seconds} for seconds, part, name in functions[:100]],
+                "allocations": [{"site": site, "bytes": size, "blocks": count} for size, count, site in self.allocations()]}
+
+    def save(self, path):
+        """
+        This function exports the profile: a .json file gets the breakdown, any other file the pstats of cProfile,
+        which e.g. snakeviz or "python -m pstats" open.
+
+        :param path: Output file
+        :return: None
+        """
+
+        if path.endswith(".json"):
+            with open(path, "w") as file:
+                json.dump(self.to_dict(), file, indent=2)
+        else:
+            self.profile.dump_stats(path)
@@ -0,0 +1,165 @@
+"""
+Race of several algorithms on the same input.
+
+The traces of the lanes are recorded in a process pool, then all lanes are advanced on one shared step clock.
+No tkinter in here, the GUI draws the lanes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import multiprocessing
+import os
+
+from . import sort_engine
+from .metrics import Metrics
+
+
+### Bytes of the trace of one lane, recorded in a worker and sent to the GUI: 8 lanes stay below 200 MB.
+### A lane stops recording after MAX_EVENTS events of 24 bytes, about a minute of the race at top speed;
+### it is shown as stopped and takes no place in the finish order
+LANE_BUDGET = 24 << 20
+MAX_EVENTS = LANE_BUDGET // 24
+
+### Maximum number of lanes
+MAX_LANES = 8
+
+### Cancel flag of the race in a worker process, see start()
+_cancel = None
+
+
+def _init_worker(cancel):
+    """
+    This function keeps the cancel flag of the race in a new worker process.
+    """
+
+    global _cancel
+    _cancel = cancel
+
+
+def record_lane(name, values, limit=MAX_EVENTS):
+    """
+    This function records the trace of one lane. Runs in a worker process.
+
+    :param name: Name from sort_engine.ALGORITHMS
+    :param values: The input sequence
+    :param limit: Maximum number of events
+    :return: (Trace, True if the algorithm finished within the limit)
+    :raise sort_engine.Cancelled: If the race was cancelled
+    """
+
+    trace = sort_engine.Trace(values, name)
+    extend = trace.ops.extend
+    events = sort_engine.ALGORITHMS[name](list(values))
+
+    ### The events are recorded in chunks, the cancel flag is checked after each of them
+    while limit > 0:
+        chunk = min(limit, sort_engine.CANCEL_EVERY)
+        length = len(trace.ops)
+        for event in islice(events, chunk):
+            extend(event)
+        if len(trace.ops) - length < 3 * chunk:
+            return trace, True
+        limit -= chunk
+        if _cancel is not None and _cancel.is_set():
+            raise sort_engine.Cancelled(name)
+
+    return trace, next(events, None) is None
+
+
+def start(names, values, workers=None):
+    """
+    This function starts recording the traces of all lanes in a process pool.
+
+    :param names: Names from sort_engine.ALGORITHMS
+    :param values: The input sequence, the same for every lane
+    :param workers: Number of processes, default is one per lane up to the number of cores
+    :return: (executor, list of futures in the order of the names, multiprocessing.Event which cancels the recording);
+             shut the executor down when all are done
+    """
+
+    ### The flag is inherited by the workers when they start, see _init_worker()
+    cancel = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=workers or min(len(names), os.cpu_count() or 1),
+                                   initializer=_init_worker, initargs=(cancel,))
+    futures = [executor.submit(record_lane, name, list(values)) for name in names]
+    return executor, futures, cancel
+
+
+class Lane:
+    """
+    One algorithm of the race.
+    """
+
+    __slots__ = ("name", "trace", "complete", "step", "metrics", "place")
+
+    def __init__(self, trace, complete):
+        """
+        Init lane
+
+        :param trace: Recorded trace of the lane
+        :param complete: False if the recording hit the event limit
+        """
+
+        self.name = trace.algorithm
+        self.trace = trace
+        self.complete = complete
+        self.step = 0
+        self.metrics = Metrics()
+        self.place = None
+
+    @property
+    def done(self):
+        return self.step >= len(self.trace)
+
+
+class Race:
+    """
+    Advances all lanes in lockstep and keeps the finish order.
+    """
+
+    def __init__(self, lanes):
+        """
+        Init race
+
+        :param lanes: List of Lane
+        """
+
+        self.lanes = lanes
+        self.clock = 0
+        self.finish_order = list()
+
+    @property
+    def done(self):
+        return all(lane.done for lane in self.lanes)
+
+    def advance(self, steps):
+        """
+        This function moves the shared clock forward. Every running lane gets the same number of steps.
+
+        :param steps: Number of steps
+        :return: List of (lane, list of events of this advance)
+        """
+
+        self.clock += steps
+        advanced = list()
+        finished = list()
+
+        for lane in self.lanes:
+            if lane.done:
+                continue
+
+            stop = min(self.clock, len(lane.trace))
+            events = list(lane.trace.events(lane.step, stop))
+            lane.metrics.count_all(events)
+            lane.step = stop
+            advanced.append((lane, events))
+
+            if lane.done and lane.complete:
+                finished.append(lane)
+
+        ### Lanes finishing in the same advance are ordered by their number of steps
+        for lane in sorted(finished, key=lambda lane: len(lane.trace)):
+            self.finish_order.append(lane)
+            lane.place = len(self.finish_order)
+
+        return advanced
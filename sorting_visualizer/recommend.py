@@ -0,0 +1,488 @@
+"""
+Recommendation of the fastest algorithm for an input.
+
+Usage:
+    $ python visualize_sorting.py recommend --size 1000000 --distribution nearly-sorted
+    $ python visualize_sorting.py recommend --size 10000 --calibration results.json --measure
+
+The input is profiled in linear time: monotone runs, inversions estimated from sampled pairs, distinct keys
+and value range. A cost model per algorithm predicts comparisons, swaps, writes and time from the profile.
+Its coefficients are fitted to the rows of a benchmark, either a JSON file written by 'benchmark --json'
+or a short benchmark run on first use. The profile cannot tell every shape apart, e.g. an organ pipe from a
+random input for a quick sort, so a prediction is left out when the model was off by more than MAX_ERROR on
+the calibration inputs of the most similar shape.
+"""
+
+import argparse
+import json
+import math
+import operator
+import random
+import sys
+import time
+from itertools import islice
+
+from . import distributions
+from . import sort_engine
+
+
+### Number of sampled pairs for the inversion estimate
+SAMPLES = 4096
+
+### Predicted quantities, as named in the benchmark results
+TARGETS = ("comparisons", "swaps", "writes", "time_min")
+
+### Sizes of the benchmark run when no calibration file is given
+CALIBRATION_SIZES = (100, 400, 1600)
+
+### Largest relative error of the fit on the calibration inputs of a similar shape for which a prediction is shown,
+### and number of calibration inputs compared, about one distribution at all calibration sizes
+MAX_ERROR = 0.5
+NEIGHBOURS = 3
+
+
+class Profile:
+    """
+    Shape of an input sequence: size, monotone runs, estimated inversions, distinct keys and value range.
+    """
+
+    __slots__ = ("size", "runs", "inversions", "distinct", "low", "high")
+
+    FIELDS = ("runs", "inversions", "distinct", "value_range")
+
+    def __init__(self, size, runs, inversions, distinct, low, high):
+        self.size = size
+        self.runs = runs
+        self.inversions = inversions
+        self.distinct = distinct
+        self.low = low
+        self.high = high
+
+    @property
+    def pairs(self):
+        return self.size * (self.size - 1) // 2
+
+    @property
+    def disorder(self):
+        """
+        Share of inverted pairs: 0.0 for a sorted input, about 0.5 for a random one, 1.0 for a reversed one.
+        """
+
+        return self.inversions / self.pairs if self.pairs else 0.0
+
+    @property
+    def presorted(self):
+        """
+        1.0 for sorted and reversed inputs, about 0.0 for random ones.
+        """
+
+        return abs(1 - 2 * self.disorder)
+
+    def key(self):
+        """
+        :return: The shape independent of the size: how presorted, how long the runs, how many equal keys, each in [0, 1]
+        """
+
+        scale = math.log(self.size) if self.size > 1 else 1.0
+        return (self.presorted, math.log(self.size / max(self.runs, 1)) / scale,
+                math.log(self.size / max(self.distinct, 1)) / scale)
+
+    def fields(self):
+        """
+        :return: Dictionary with the columns of a benchmark row
+        """
+
+        return {"runs": self.runs, "inversions": self.inversions, "distinct": self.distinct,
+                "value_range": self.high - self.low}
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        :return: Profile of the input of a benchmark row
+        """
+
+        return cls(row["size"], row["runs"], row["inversions"], row["distinct"], 0, row["value_range"])
+
+    def __str__(self):
+        return (f"{self.size} elements, {self.runs} runs, ~{self.inversions} inversions ({self.presorted:.0%} presorted), "
+                f"{self.distinct} distinct keys in [{self.low}, {self.high}]")
+
+
+def profile(values, samples=SAMPLES, seed=0):
+    """
+    This function profiles a sequence in linear time. Every pass runs in a builtin, so 10^6 elements take
+    about 0.3 seconds. A run ends where an ascending part turns into a descending one or vice versa, like
+    the natural runs of TimSort. The inversions are estimated from random pairs; as every descent between
+    neighbours is an inversion, the estimate is at least the number of descents, which keeps nearly sorted
+    inputs apart.
+
+    :param values: The input sequence
+    :param samples: Number of sampled pairs
+    :param seed: Seed of the sampled pairs
+    :return: Profile
+    """
+
+    size = len(values)
+    if size < 2:
+        return Profile(size, size, 0, size, min(values, default=0), max(values, default=0))
+
+    descending = list(map(operator.gt, values, islice(values, 1, None)))
+    descents = sum(descending)
+    turns = sum(map(operator.ne, descending, islice(descending, 1, None)))
+
+    rng = random.Random(seed)
+    inverted = 0
+    for k in range(samples):
+        i, j = rng.randrange(size), rng.randrange(size)
+        if (i < j and values[i] > values[j]) or (j < i and values[j] > values[i]):
+            inverted += 1
+    ### A pair with i == j is no pair, so the share is over samples * (1 - 1/size) pairs
+    share = inverted / (samples * (1 - 1 / size))
+    inversions = max(descents, round(share * size * (size - 1) / 2))
+
+    return Profile(size, (turns + 1) // 2 + 1, inversions, len(set(values)), min(values), max(values))
+
+
+def _log(x):
+    return math.log2(x + 1)
+
+
+def _n_log_n(p):
+    """
+    :return: Terms of an O(n log n) algorithm: the work on random inputs, a linear part, and the extra work
+             (e.g. swaps) on random and on reversed inputs
+    """
+
+    n_log_n = p.size * _log(p.size)
+    return (n_log_n, p.size, n_log_n * (1 - p.presorted), p.size * p.disorder)
+
+
+def _long_runs(p):
+    """
+    :return: Quadratic term of long monotone runs in a disordered input, e.g. an organ pipe or a sawtooth
+    """
+
+    return p.size ** 2 / p.runs * (1 - p.presorted)
+
+
+def _quick(p):
+    """
+    :return: Terms of a quick sort: partitions of equal keys and pivots which go wrong on long runs
+    """
+
+    return _n_log_n(p) + (p.size * _log(p.size / p.distinct), _long_runs(p))
+
+
+def _shell(p):
+    """
+    :return: Terms of a ShellSort: the last gaps move about as far as the inversions per element
+    """
+
+    return _n_log_n(p) + (p.size ** 1.5 * (1 - p.presorted), p.size * _log(p.inversions / p.size))
+
+
+def _tim(p):
+    """
+    :return: Terms of TimSort: merges of the runs, and InsertionSort on the share of the input in runs shorter
+             than the minimum run length
+    """
+
+    min_run = sort_engine._min_run(p.size)
+    short = min(1, min_run * (p.runs - 1) / p.size) if p.size > min_run else 1
+    return (p.size * _log(min(p.runs, p.size // min_run + 1)), p.size, p.size * min_run * short * p.disorder,
+            p.size * short, p.size * p.disorder, p.size * _log(p.size / p.runs))
+
+
+### Algorithm -> function of a Profile which returns the terms of its cost model
+### Every predicted quantity is a non-negative combination of the terms
+TERMS = {
+    "Bubble Sort": lambda p: (p.size ** 2, p.inversions, p.size),
+    "Selection Sort": lambda p: (p.size ** 2, p.size, p.size * (1 - p.presorted), p.size * p.disorder),
+    "Insertion Sort": lambda p: (p.inversions, p.size),
+    ### Merges of long runs take fewer comparisons
+    "Merge Sort": lambda p: _n_log_n(p) + (p.size * _log(p.runs),),
+    "Merge Sort (bottom-up)": lambda p: _n_log_n(p) + (p.size * _log(p.runs),),
+    ### The last element as pivot is quadratic on presorted runs and on many equal keys
+    "Quick Sort (Lomuto)": lambda p: _n_log_n(p) + (p.size ** 2 / p.runs * p.presorted, p.size ** 2 / p.distinct, _long_runs(p)),
+    "Quick Sort (Hoare)": _quick,
+    "Quick Sort (median of 3)": _quick,
+    "Intro Sort": _quick,
+    "Heap Sort": _n_log_n,
+    "Shell Sort (Shell gaps)": _shell,
+    "Shell Sort (Knuth gaps)": _shell,
+    "Shell Sort (Ciura gaps)": _shell,
+    "Shell Sort (Sedgewick gaps)": _shell,
+    ### One pass per byte of the value range
+    "Radix Sort (LSD)": lambda p: (p.size * -(-(p.high - p.low).bit_length() // 8), -(-(p.high - p.low).bit_length() // 8)),
+    "Tim Sort": _tim,
+}
+
+
+def _solve(matrix, vector):
+    """
+    This function solves a small linear system by Gaussian elimination with partial pivoting.
+
+    :return: The solution, None if the matrix is singular
+    """
+
+    k = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for col in range(k):
+        pivot = max(range(col, k), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, k):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, k + 1):
+                rows[r][c] -= factor * rows[col][c]
+
+    solution = [0.0] * k
+    for r in range(k - 1, -1, -1):
+        solution[r] = (rows[r][k] - sum(rows[r][c] * solution[c] for c in range(r + 1, k))) / rows[r][r]
+    return solution
+
+
+def fit(samples):
+    """
+    This function fits y = sum(c_i * x_i) with c_i >= 0 by least squares of the relative error.
+    Terms with a negative coefficient are dropped and the rest is fitted again.
+
+    :param samples: List of (terms, y, floor); the error of y is relative to max(y, floor), so that e.g. no swaps
+                    on a sorted input do not outweigh all other rows
+    :return: List of coefficients, one per term
+    """
+
+    k = len(samples[0][0])
+    active = list(range(k))
+    while active:
+        ### Every row is divided by y, so that small and large inputs count the same
+        matrix = [[0.0] * len(active) for i in active]
+        vector = [0.0] * len(active)
+        for terms, y, floor in samples:
+            scale = 1 / max(y, floor) ** 2
+            for r, i in enumerate(active):
+                vector[r] += terms[i] * y * scale
+                for c, j in enumerate(active):
+                    matrix[r][c] += terms[i] * terms[j] * scale
+
+        solution = _solve(matrix, vector)
+        if solution is None:
+            ### Collinear terms: drop the last one
+            active.pop()
+            continue
+        if min(solution) >= 0:
+            coefficients = [0.0] * k
+            for i, c in zip(active, solution):
+                coefficients[i] = c
+            return coefficients
+        active.pop(solution.index(min(solution)))
+
+    return [0.0] * k
+
+
+def _error(prediction, y, floor):
+    """
+    :return: Relative error of a prediction, relative to max(y, floor) as in fit()
+    """
+
+    return abs(prediction - y) / max(y, floor)
+
+
+class CostModel:
+    """
+    Fitted coefficients per algorithm and predicted quantity, and the errors of the fit on the calibration inputs.
+    """
+
+    __slots__ = ("coefficients", "residuals")
+
+    def __init__(self, coefficients, residuals=None):
+        """
+        :param coefficients: Dictionary algorithm -> dictionary target -> coefficients of TERMS[algorithm]
+        :param residuals: Dictionary algorithm -> list of (Profile.key(), distribution, dictionary target -> relative
+                          error) of the calibration inputs, None to show every prediction
+        """
+
+        self.coefficients = coefficients
+        self.residuals = residuals
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        This function fits the model to benchmark results with input profiles.
+
+        :param results: Result dictionaries of benchmark.run()
+        :return: CostModel
+        """
+
+        samples = dict()
+        for row in results:
+            if row["algorithm"] in TERMS and row["size"] > 1 and all(field in row for field in Profile.FIELDS):
+                samples.setdefault(row["algorithm"], list()).append((TERMS[row["algorithm"]](Profile.from_row(row)), row))
+        if not samples:
+            raise ValueError("the results contain no input profiles, run the benchmark again")
+
+        coefficients = dict()
+        residuals = dict()
+        for name, rows in samples.items():
+            ### Counts are relative to the size, times to a microsecond
+            floors = {target: 1e-6 if target == "time_min" else None for target in TARGETS}
+            coefficients[name] = {target: fit([(terms, row[target], floors[target] or row["size"]) for terms, row in rows])
+                                  for target in TARGETS}
+            residuals[name] = [(Profile.from_row(row).key(), row.get("distribution", ""),
+                                {target: _error(sum(c * x for c, x in zip(coefficients[name][target], terms)),
+                                                row[target], floors[target] or row["size"])
+                                 for target in TARGETS})
+                               for terms, row in rows]
+        return cls(coefficients, residuals)
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: JSON file written by 'benchmark --json'
+        :return: CostModel
+        """
+
+        with open(path) as file:
+            return cls.from_results(json.load(file)["results"])
+
+    def error(self, name, shape):
+        """
+        :param name: Calibrated algorithm
+        :param shape: Profile of an input
+        :return: Dictionary target -> largest relative error on the NEIGHBOURS calibration inputs of the most similar
+                 shape, 0.0 without residuals
+        """
+
+        if not self.residuals:
+            return dict.fromkeys(TARGETS, 0.0)
+
+        key = shape.key()
+        nearest = sorted(self.residuals[name], key=lambda residual: math.dist(residual[0], key))[:NEIGHBOURS]
+        return {target: max(errors[target] for k, distribution, errors in nearest) for target in TARGETS}
+
+    def predict(self, shape):
+        """
+        This function predicts the quantities of every calibrated algorithm on an input. A prediction is None if the
+        model was off by more than MAX_ERROR on calibration inputs of a similar shape.
+
+        :param shape: Profile of the input
+        :return: List of (algorithm, dictionary target -> prediction or None), fastest first, unknown times last
+        """
+
+        predictions = list()
+        for name, targets in self.coefficients.items():
+            terms = TERMS[name](shape)
+            error = self.error(name, shape)
+            predictions.append((name, {target: sum(c * x for c, x in zip(coefficients, terms)) if error[target] <= MAX_ERROR else None
+                                       for target, coefficients in targets.items()}))
+        predictions.sort(key=lambda prediction: (prediction[1]["time_min"] is None, prediction[1]["time_min"] or 0.0))
+        return predictions
+
+    def report(self):
+        """
+        This function summarizes the residuals of the fit: per algorithm and quantity the root mean square of the
+        relative errors on the calibration inputs, and the largest one with its distribution.
+
+        :return: String
+        """
+
+        lines = [f"{'algorithm':28s} " + " ".join(f"{target:>24s}" for target in TARGETS)]
+        for name, residuals in (self.residuals or dict()).items():
+            columns = list()
+            for target in TARGETS:
+                errors = [(errors[target], distribution) for key, distribution, errors in residuals]
+                rms = math.sqrt(sum(error ** 2 for error, distribution in errors) / len(errors))
+                worst, where = max(errors)
+                columns.append(f"{rms:5.0%} (max {worst:5.0%} {where[:8]:8s})")
+            lines.append(f"{name:28s} " + " ".join(columns))
+        return "\n".join(lines)
+
+
+def format_value(value, spec, unit=""):
+    """
+    :return: A predicted value formatted with the spec and followed by the unit, "-" if it is left out
+    """
+
+    return "-" if value is None else format(value, spec) + unit
+
+
+def format_prediction(name, prediction):
+    """
+    :return: One line of the table of predictions
+    """
+
+    return (f"{name:28s} {format_value(prediction['comparisons'], ',.0f'):>14s} {format_value(prediction['writes'], ',.0f'):>14s} "
+            f"{format_value(prediction['time_min'], '.3f', 's'):>10s}")
+
+
+def calibrate(sizes=CALIBRATION_SIZES, seed=0, log=None):
+    """
+    This function fits a model to a short benchmark of all algorithms on all distributions.
+
+    :param sizes: Input sizes
+    :param seed: Base seed of the inputs
+    :param log: Optional stream for progress messages and the residuals of the fit
+    :return: CostModel
+    """
+
+    ### The benchmark is only loaded when there is no calibration file
+    from . import benchmark
+
+    results, growth = benchmark.run(list(sort_engine.ALGORITHMS), sizes, list(distributions.DISTRIBUTIONS), repeats=1,
+                                    seed=seed, max_quadratic=max(sizes), memory=False, log=log)
+    model = CostModel.from_results(results)
+    if log:
+        print(f"\nRelative errors of the fit on the calibration inputs\n{model.report()}", file=log)
+    return model
+
+
+def main(argv=None):
+    """
+    Command line entry point: profile an input and predict the cost of every algorithm.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="recommend", description="Predict the fastest algorithm for an input.")
+    parser.add_argument("--size", type=int, default=100000, help="number of elements")
+    parser.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--calibration", metavar="PATH", help="JSON file written by 'benchmark --json' (default: a short benchmark)")
+    parser.add_argument("--measure", action="store_true", help="also run the algorithms and show the measured figures")
+    parser.add_argument("--max-quadratic", type=int, default=5000, help="largest size measured for the O(n^2) algorithms")
+    parser.add_argument("--residuals", action="store_true", help="show the relative errors of the fit on the calibration inputs")
+    args = parser.parse_args(argv)
+
+    if args.calibration:
+        model = CostModel.load(args.calibration)
+    else:
+        print("Calibrating with a short benchmark ...", file=sys.stderr)
+        model = calibrate()
+
+    if args.residuals:
+        print(f"Relative errors of the fit on the calibration inputs\n{model.report()}\n")
+
+    values = distributions.generate(args.distribution, args.size, args.seed)
+    start = time.perf_counter()
+    shape = profile(values)
+    print(f"{shape}\nprofiled in {time.perf_counter() - start:.3f} s\n")
+
+    ### Measured runs are timed like in the benchmark
+    from .benchmark import QUADRATIC, measure
+
+    print(f"{'algorithm':28s} {'comparisons':>14s} {'writes':>14s} {'time':>10s}" + ("   measured" if args.measure else ""))
+    for name, prediction in model.predict(shape):
+        line = format_prediction(name, prediction)
+        if args.measure and not (name in QUADRATIC and args.size > args.max_quadratic):
+            metrics = measure(sort_engine.ALGORITHMS[name], list(values))
+            line += f"   {metrics.comparisons:14,d} {metrics.writes:14,d} {metrics.elapsed:9.3f}s"
+        print(line)
+    print(f"\n'-': left out, the model was off by more than {MAX_ERROR:.0%} on calibration inputs of a similar shape")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
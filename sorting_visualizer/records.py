@@ -0,0 +1,334 @@
+"""
+Records from CSV or JSON Lines files, sorted by one key column.
+
+Usage:
+    $ python visualize_sorting.py records orders.csv --key price --output sorted.csv
+    $ python visualize_sorting.py records events.jsonl --key user --algorithm "Heap Sort"
+
+The file is read as a stream, one record per line. Only the key of every record is kept, in an array('q'),
+together with the byte offset of the record in the file: 16 bytes per record. Integer keys are stored as
+they are; floats, strings and integers beyond 64 bits as their rank among the distinct keys, which sorts the
+same. The distinct keys are only held while the file is read. The records are
+sorted by decorate-sort-undecorate: the keys are extracted once, the row indices are sorted by them and
+the records are written in that order by seeking to their offsets.
+"""
+
+from array import array
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+
+from . import sort_engine
+
+
+class Table:
+    """
+    Keys and file offsets of the records of one file.
+    """
+
+    __slots__ = ("path", "format", "column", "header", "keys", "offsets", "distinct")
+
+    def __init__(self, path, format, column, header, keys, offsets, distinct):
+        """
+        :param path: Path of the file
+        :param format: "csv" or "jsonl"
+        :param column: Name of the key column
+        :param header: First line of a CSV file, None for JSON Lines
+        :param keys: array('q') with the key of every record
+        :param offsets: array('q') with the byte offset of every record
+        :param distinct: Number of distinct keys when the keys are ranks, None for integer keys
+        """
+
+        self.path = path
+        self.format = format
+        self.column = column
+        self.header = header
+        self.keys = keys
+        self.offsets = offsets
+        self.distinct = distinct
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class _KeyColumn:
+    """
+    Collects the keys of a column while the file is read. The keys stay integers until the first key which is not
+    an integer of 64 bits written plainly; from then on every key is the code of its field text, and the codes are replaced
+    by ranks at the end. A column with any text which is no number is compared by the original texts, else by the numbers.
+    """
+
+    __slots__ = ("keys", "codes", "values")
+
+    def __init__(self):
+        self.keys = array("q")
+        self.codes = None
+        self.values = None
+
+    def add(self, value, text):
+        """
+        :param value: The key as int, float or string
+        :param text: The key as written in the file
+        """
+
+        if self.codes is None:
+            if type(value) is int and -2**63 <= value < 2**63 and text == str(value):
+                self.keys.append(value)
+                return
+            self._relabel()
+
+        code = self.codes.get(text)
+        if code is None:
+            code = self.codes[text] = len(self.values)
+            self.values.append(value)
+        self.keys.append(code)
+
+    def _relabel(self):
+        """
+        This function turns the integer keys so far into codes of their texts.
+        """
+
+        integers = self.keys
+        self.keys = array("q")
+        self.codes = dict()
+        self.values = list()
+        for value in integers:
+            self.add(value, str(value))
+
+    def finish(self):
+        """
+        This function replaces the codes by ranks in place and frees the distinct keys.
+
+        :return: (keys, number of distinct keys or None for integer keys)
+        """
+
+        if self.codes is None:
+            return self.keys, None
+
+        ### The codes are the positions in the dictionary, so its keys in order are the texts by code
+        if any(isinstance(value, str) for value in self.values):
+            values = list(self.codes)
+        else:
+            values = self.values
+        self.codes = self.values = None
+
+        ### Codes in ascending order of their keys; equal numbers written differently, e.g. 1.5 and 1.50, share a rank
+        ranks = array("q", bytes(8 * len(values)))
+        rank, previous = -1, None
+        for code in sorted(range(len(values)), key=values.__getitem__):
+            if rank < 0 or values[code] != previous:
+                rank, previous = rank + 1, values[code]
+            ranks[code] = rank
+        del values
+
+        keys = self.keys
+        for index, code in enumerate(keys):
+            keys[index] = ranks[code]
+        return keys, rank + 1
+
+
+def _parse(text):
+    """
+    :return: A CSV field as int or float, the text itself if it is no finite number without underscores
+    """
+
+    if "_" in text:
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        value = float(text)
+    except ValueError:
+        return text
+    return value if math.isfinite(value) else text
+
+
+def load(path, column, format=None):
+    """
+    This function reads the keys of all records of a file in one pass. Each line is one record.
+
+    :param path: Path of a CSV file with a header line or of a JSON Lines file
+    :param column: Name of the key column
+    :param format: "csv" or "jsonl", by default from the file extension
+    :return: Table
+    """
+
+    format = format or ("jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv")
+    keys = _KeyColumn()
+    offsets = array("q")
+    header = None
+
+    with open(path, "rb") as file:
+        offset = 0
+        if format == "csv":
+            header = file.readline()
+            fields = next(csv.reader((header.decode("utf-8-sig"),)), [])
+            if column not in fields:
+                raise ValueError(f"'{path}' has no column '{column}', but {', '.join(fields)}")
+            position = fields.index(column)
+            offset = len(header)
+
+        for number, line in enumerate(file, 2 if header else 1):
+            if line.strip():
+                try:
+                    if format == "csv":
+                        text = next(csv.reader((line.decode("utf-8"),)))[position]
+                        value = _parse(text)
+                    else:
+                        value = json.loads(line)[column]
+                        text = value if isinstance(value, str) else json.dumps(value)
+                        ### NaN and Infinity of JSON are compared as their text
+                        if isinstance(value, float) and not math.isfinite(value):
+                            value = text
+                except (IndexError, KeyError, ValueError) as error:
+                    raise ValueError(f"line {number} of '{path}' has no valid key: {error!r}") from None
+                if value is None or isinstance(value, (list, dict)):
+                    raise ValueError(f"line {number} of '{path}' has no valid key: {value!r}")
+                keys.add(value, text)
+                offsets.append(offset)
+            offset += len(line)
+
+    keys, distinct = keys.finish()
+    return Table(path, format, column, header, keys, offsets, distinct)
+
+
+def order(keys):
+    """
+    This function sorts the row indices by their keys. The keys are looked up once per row, not per comparison,
+    and the sort is stable.
+
+    :param keys: array('q') of a Table
+    :return: array('q') of the row indices in sorted order
+    """
+
+    return array("q", sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def unstable_pairs(keys, rows):
+    """
+    This function checks if equal keys kept the order of their rows.
+
+    :param keys: The keys
+    :param rows: Row indices in sorted order
+    :return: Number of neighbours with equal keys whose rows are in the wrong order, 0 for a stable order
+    """
+
+    sorted_keys = [keys[row] for row in rows]
+    return sum(1 for k in range(1, len(rows)) if sorted_keys[k - 1] == sorted_keys[k] and rows[k - 1] > rows[k])
+
+
+class Tagged:
+    """
+    Key tagged with its row, compared by the key only. Supports the arithmetic of RadixSort.
+    """
+
+    __slots__ = ("key", "row")
+
+    def __init__(self, key, row):
+        self.key = key
+        self.row = row
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+    def __sub__(self, other):
+        return self.key - other.key
+
+
+def algorithm_order(name, keys):
+    """
+    This function sorts the rows with an algorithm of sort_engine, so that its stability can be checked.
+    The algorithm moves tagged keys, which tell the row they came from.
+
+    :param name: Name from sort_engine.ALGORITHMS
+    :param keys: The keys
+    :return: array('q') of the row indices in the order of the algorithm
+    """
+
+    tagged = [Tagged(key, row) for row, key in enumerate(keys)]
+    for event in sort_engine.ALGORITHMS[name](tagged):
+        pass
+    return array("q", [item.row for item in tagged])
+
+
+def write(table, rows, path):
+    """
+    This function writes the records in the given order, a CSV file starts with its header.
+
+    :param table: Table
+    :param rows: Row indices
+    :param path: Output file, "-" for stdout
+    :return: None
+    """
+
+    output = sys.stdout.buffer if path == "-" else open(path, "wb")
+    try:
+        with open(table.path, "rb") as source:
+            if table.header:
+                output.write(table.header)
+            for row in rows:
+                source.seek(table.offsets[row])
+                line = source.readline()
+                output.write(line if line.endswith(b"\n") else line + b"\n")
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+
+def main(argv=None):
+    """
+    Command line entry point: sort the records of a file by a key column.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="records", description="Sort the records of a CSV or JSON Lines file by a key.")
+    parser.add_argument("path", help="CSV file with a header line or JSON Lines file")
+    parser.add_argument("--key", required=True, help="name of the key column")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="file format (default: from the extension)")
+    parser.add_argument("--algorithm", choices=list(sort_engine.ALGORITHMS), metavar="NAME",
+                        help="sort with an algorithm of the visualizer instead of the built-in sort")
+    parser.add_argument("--output", metavar="PATH", help="write the sorted records ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    log = sys.stderr if args.output == "-" else sys.stdout
+    start = time.perf_counter()
+    try:
+        table = load(args.path, args.key, args.format)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    print(f"{len(table)} records, {'integer' if table.distinct is None else f'{table.distinct} distinct'} keys, "
+          f"read in {time.perf_counter() - start:.2f} s", file=log)
+
+    start = time.perf_counter()
+    if args.algorithm:
+        rows = algorithm_order(args.algorithm, table.keys)
+    else:
+        rows = order(table.keys)
+    print(f"sorted by '{args.key}' with {args.algorithm or 'the built-in sort'} in {time.perf_counter() - start:.2f} s", file=log)
+
+    wrong = unstable_pairs(table.keys, rows)
+    print("stable: equal keys kept their order" if not wrong else f"not stable: {wrong} pairs of equal keys changed their order", file=log)
+
+    if args.output:
+        write(table, rows, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,470 @@
+"""
+Views which draw the array that is being sorted on a tkinter canvas.
+
+Both views have the same interface: compare(), swap(), write(), mark(), unmark() and color_range() change the
+displayed state, flush() sends the changes of one frame to the canvas. Between two flushes no
+canvas calls are made, so the number of Tcl round-trips per frame does not grow with the events.
+"""
+
+import tkinter
+
+from . import sort_engine
+from .layout import Layout
+
+
+### Colors of the runs formed and merged by the external merge sort
+RUN_COLOR = "#ffaa00"
+MERGE_COLOR = "#99ccff"
+
+
+class BoxView:
+    """
+    Draws every element as a box with its value. Only suited for a few elements.
+
+    The rectangle and the text of a box stay at the slot of their index. The events only change the
+    state of the view; flush() compares it with the state drawn last and sends the differences.
+    """
+
+    MAX_ELEMENTS = 10
+
+    def __init__(self, canvas, values, box_color, layout=None):
+        """
+        Init view and create the boxes on the canvas
+
+        :param canvas: tkinter.Canvas
+        :param values: The sequence to show
+        :param box_color: Default fill color of the boxes
+        :param layout: layout.Layout with the slots of the boxes, the default row if None
+        """
+
+        self.canvas = canvas
+        self.box_color = box_color
+        self.layout = layout or Layout(len(values))
+
+        self.data = list(values)
+        self.sorted_indices = set()
+        self.highlight = dict()
+        self.arrow = None
+        self.dirty = set()
+
+        ### IDs of the rectangle and the text at each index and what they show on the canvas
+        self.rects = list()
+        self.texts = list()
+        for i, value in enumerate(self.data):
+            self.rects.append(canvas.create_rectangle(*self.layout.box(i), fill=box_color))
+            self.texts.append(canvas.create_text(*self.layout.center(i), text=value, font=("italic",15,"bold")))
+
+        self.drawn_values = list(self.data)
+        self.drawn_fills = [box_color] * len(self.data)
+
+        ### The arrow showing a swap is created once and hidden while there is no swap
+        self.arrow_id = canvas.create_line(0, 0, 0, 0, arrow="both", state="hidden")
+        self.drawn_arrow = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def values(self):
+        """
+        :return: List of the displayed values
+        """
+
+        return list(self.data)
+
+    def show(self, values):
+        """
+        This function shows a new state of the same length, e.g. after seeking in a trace. All marks are removed.
+
+        :param values: The new values
+        :return: None
+        """
+
+        self.dirty.update(self.sorted_indices)
+        self.sorted_indices = set()
+        for index, value in enumerate(values):
+            if self.data[index] != value:
+                self.data[index] = value
+                self.dirty.add(index)
+
+    def swap(self, index_left, index_right):
+        """
+        This function swaps the values of two boxes.
+        The boxes stay red and an arrow shows the swap until the highlighting is cleared.
+
+        :param index_left: Index left
+        :param index_right: Index right
+        :return: None
+        """
+
+        data = self.data
+        data[index_left], data[index_right] = data[index_right], data[index_left]
+        self.set_highlight(index_left, "#ee0000")
+        self.set_highlight(index_right, "#ee0000")
+        self.arrow = (index_left, index_right)
+
+    def compare(self, index_left, index_right):
+        """
+        This function colors two compared boxes green until the highlighting is cleared.
+
+        :param index_left: Index left
+        :param index_right: Index right
+        :return: None
+        """
+
+        ### A swap in the same frame stays red
+        for index in (index_left, index_right):
+            if index not in self.highlight:
+                self.set_highlight(index, "#55cc55")
+
+    def write(self, index, value):
+        """
+        This function writes a new value into a box and colors it orange until the highlighting is cleared.
+
+        :param index: Index of the box
+        :param value: New value
+        :return: None
+        """
+
+        self.data[index] = value
+        self.set_highlight(index, "#ff9900")
+
+    def mark(self, index):
+        """
+        This function marks a box as sorted.
+
+        :param index: Index of the box
+        :return: None
+        """
+
+        self.sorted_indices.add(index)
+        self.dirty.add(index)
+
+    def unmark(self, index):
+        """
+        This function removes the sorted mark of a box, e.g. when stepping backwards.
+
+        :param index: Index of the box
+        :return: None
+        """
+
+        self.sorted_indices.discard(index)
+        self.dirty.add(index)
+
+    def color_range(self, start, stop, color=None):
+        """
+        This function colors the boxes in [start, stop) until the highlighting is cleared.
+
+        :param start: First index
+        :param stop: Last index (exclusive)
+        :param color: Fill color, None for the default color
+        :return: None
+        """
+
+        for index in range(start, min(stop, len(self.data))):
+            if color:
+                self.set_highlight(index, color)
+            else:
+                self.highlight.pop(index, None)
+                self.dirty.add(index)
+
+    def set_highlight(self, index, color):
+        """
+        This function colors a box until the highlighting is cleared.
+
+        :param index: Index of the box
+        :param color: Fill color
+        :return: None
+        """
+
+        self.highlight[index] = color
+        self.dirty.add(index)
+
+    def clear_highlight(self):
+        """
+        This function removes all highlighting and the swap arrow with the next flush.
+
+        :return: None
+        """
+
+        self.dirty.update(self.highlight)
+        self.highlight = dict()
+        self.arrow = None
+
+    def flush(self):
+        """
+        This function sends the changes since the last flush to the canvas: one itemconfig per changed
+        text or fill and at most two calls for the arrow, however many events happened in the frame.
+
+        :return: None
+        """
+
+        itemconfig = self.canvas.itemconfig
+        for index in self.dirty:
+            value = self.data[index]
+            if value != self.drawn_values[index]:
+                itemconfig(self.texts[index], text=value)
+                self.drawn_values[index] = value
+
+            fill = self.highlight.get(index)
+            if fill is None:
+                fill = "#00ff00" if index in self.sorted_indices else self.box_color
+            if fill != self.drawn_fills[index]:
+                itemconfig(self.rects[index], fill=fill)
+                self.drawn_fills[index] = fill
+        self.dirty = set()
+
+        if self.arrow != self.drawn_arrow:
+            if self.arrow is None:
+                itemconfig(self.arrow_id, state="hidden")
+            else:
+                self.canvas.coords(self.arrow_id, *self.layout.arrow(*self.arrow))
+                if self.drawn_arrow is None:
+                    itemconfig(self.arrow_id, state="normal")
+            self.drawn_arrow = self.arrow
+
+
+class BarView:
+    """
+    Draws the elements as a bar chart into a single PhotoImage.
+    Only the columns touched since the last frame are redrawn.
+    """
+
+    MAX_ELEMENTS = 100000
+
+    def __init__(self, canvas, values, bar_color, x=50, y=40, width=1000, height=320, background="#ffffff"):
+        """
+        Init view and draw the whole chart once
+
+        :param canvas: tkinter.Canvas
+        :param values: The sequence to show
+        :param bar_color: Default color of the bars
+        :param x: Left border of the chart on the canvas
+        :param y: Top border of the chart on the canvas
+        :param width: Maximum width of the chart in pixels
+        :param height: Height of the chart in pixels
+        :param background: Background color of the chart
+        """
+
+        self.canvas = canvas
+        self.bar_color = bar_color
+        self.background = background
+        self.data = list(values)
+
+        ### Each column shows one element; with more elements than pixels only every stride-th element is shown.
+        ### An empty sequence is an empty chart
+        count = len(self.data)
+        if count <= width:
+            self.stride = 1
+            self.bar_width = width // max(count, 1)
+        else:
+            self.stride = -(-count // width)
+            self.bar_width = 1
+        self.columns = -(-count // self.stride)
+        self.height = height
+
+        ### Scale the values to the height of the chart
+        self.low = min(self.data, default=0)
+        self.scale = (height - 1) / ((max(self.data, default=0) - self.low) or 1)
+
+        self.sorted_indices = set()
+        self.highlight = dict()
+        self.dirty = set(range(self.columns))
+
+        self.image = tkinter.PhotoImage(width=self.columns * self.bar_width, height=height)
+        if self.columns:
+            self.image.put(background, to=(0, 0, self.columns * self.bar_width, height))
+        self.image_id = canvas.create_image(x, y, image=self.image, anchor="nw")
+
+        self.flush()
+
+    def __len__(self):
+        return len(self.data)
+
+    def values(self):
+        """
+        :return: List of the displayed values
+        """
+
+        return list(self.data)
+
+    def show(self, values):
+        """
+        This function shows a new state of the same length, e.g. after seeking in a trace. All marks are removed.
+        Only columns whose value changed are redrawn.
+
+        :param values: The new values
+        :return: None
+        """
+
+        stride = self.stride
+        for column in range(self.columns):
+            if self.data[column * stride] != values[column * stride]:
+                self.dirty.add(column)
+        self.dirty.update(index // stride for index in self.sorted_indices)
+
+        self.sorted_indices = set()
+        self.data = list(values)
+
+    def swap(self, index_left, index_right):
+        """
+        This function swaps two elements and colors their columns red.
+
+        :param index_left: Index left
+        :param index_right: Index right
+        :return: None
+        """
+
+        data = self.data
+        data[index_left], data[index_right] = data[index_right], data[index_left]
+        self.set_highlight(index_left // self.stride, "#ee0000")
+        self.set_highlight(index_right // self.stride, "#ee0000")
+
+    def compare(self, index_left, index_right):
+        """
+        This function colors the columns of two compared elements green.
+
+        :param index_left: Index left
+        :param index_right: Index right
+        :return: None
+        """
+
+        ### A swap in the same frame stays red
+        for column in (index_left // self.stride, index_right // self.stride):
+            if column not in self.highlight:
+                self.set_highlight(column, "#55cc55")
+
+    def write(self, index, value):
+        """
+        This function writes a new value into an element and colors its column orange.
+
+        :param index: Index of the element
+        :param value: New value
+        :return: None
+        """
+
+        self.data[index] = value
+        self.set_highlight(index // self.stride, "#ff9900")
+
+    def mark(self, index):
+        """
+        This function marks an element as sorted.
+
+        :param index: Index of the element
+        :return: None
+        """
+
+        self.sorted_indices.add(index)
+        self.dirty.add(index // self.stride)
+
+    def unmark(self, index):
+        """
+        This function removes the sorted mark of an element, e.g. when stepping backwards.
+
+        :param index: Index of the element
+        :return: None
+        """
+
+        self.sorted_indices.discard(index)
+        self.dirty.add(index // self.stride)
+
+    def color_range(self, start, stop, color=None):
+        """
+        This function colors the columns of the elements in [start, stop) until the highlighting is cleared.
+
+        :param start: First index
+        :param stop: Last index (exclusive)
+        :param color: Fill color, None for the default color
+        :return: None
+        """
+
+        for column in range(start // self.stride, -(-min(stop, len(self.data)) // self.stride)):
+            if color:
+                self.set_highlight(column, color)
+            else:
+                self.highlight.pop(column, None)
+                self.dirty.add(column)
+
+    def set_highlight(self, column, color):
+        """
+        This function colors a column until the highlighting is cleared.
+
+        :param column: Index of the column
+        :param color: Fill color
+        :return: None
+        """
+
+        self.highlight[column] = color
+        self.dirty.add(column)
+
+    def clear_highlight(self):
+        """
+        This function removes all highlighting with the next flush.
+
+        :return: None
+        """
+
+        self.dirty.update(self.highlight)
+        self.highlight = dict()
+
+    def flush(self):
+        """
+        This function redraws the columns changed since the last flush.
+
+        :return: None
+        """
+
+        for column in self.dirty:
+            self.draw_column(column)
+        self.dirty = set()
+
+    def draw_column(self, column):
+        """
+        This function draws one column: background on top, the bar below.
+
+        :param column: Index of the column
+        :return: None
+        """
+
+        index = column * self.stride
+        bar = 1 + int((self.data[index] - self.low) * self.scale)
+        color = self.highlight.get(column)
+        if color is None:
+            color = "#00ff00" if index in self.sorted_indices else self.bar_color
+
+        x_left = column * self.bar_width
+        x_right = x_left + self.bar_width
+        top = self.height - bar
+        if top > 0:
+            self.image.put(self.background, to=(x_left, 0, x_right, top))
+        self.image.put(color, to=(x_left, top, x_right, self.height))
+
+
+def show_event(view, op, a, b):
+    """
+    This function shows a single event of a trace on a view.
+
+    :param view: BoxView or BarView
+    :param op: Event code
+    :param a: First operand
+    :param b: Second operand
+    :return: None
+    """
+
+    if op == sort_engine.COMPARE:
+        view.compare(min(a, b), max(a, b))
+
+    elif op == sort_engine.SWAP:
+        view.swap(min(a, b), max(a, b))
+
+    elif op == sort_engine.MARK:
+        ### Mark the element as sorted
+        view.mark(a)
+
+    elif op == sort_engine.WRITE:
+        view.write(a, b)
+
+    elif op == sort_engine.RUN:
+        view.color_range(a, b, RUN_COLOR)
+
+    elif op == sort_engine.MERGE:
+        view.color_range(a, b, MERGE_COLOR)
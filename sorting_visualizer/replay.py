@@ -0,0 +1,231 @@
+"""
+Keyframes for seeking in a trace and the binary trace file.
+
+File layout, all integers are little-endian int64 so the file can be memory-mapped:
+
+    header      MAGIC, version, elements, steps, keyframe interval, keyframes, length of the name
+    name        UTF-8, padded to a multiple of 8 bytes
+    initial     one value per element
+    events      steps records of (op, a, b)
+    keyframes   per keyframe: the counters of metrics.Metrics.snapshot(), then the array state
+"""
+
+from array import array
+from bisect import bisect_right
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from . import distributions
+from . import sort_engine
+from .metrics import Metrics
+
+
+MAGIC = int.from_bytes(b"SORTRACE", "little")
+VERSION = 1
+HEADER = struct.Struct("<7q")
+COUNTERS = 6
+
+### Keyframes may use this many bytes in memory
+KEYFRAME_BUDGET = 64 * 2**20
+
+
+class Keyframes:
+    """
+    Periodic snapshots of the array state and the counters of a trace.
+    Seeking to a step finds the last keyframe before it in O(log n) and replays at most one interval of events.
+    """
+
+    def __init__(self, trace, interval=None, steps=None, counters=None, states=None):
+        """
+        Init keyframes, computed from the trace unless steps, counters and states are given
+
+        :param trace: sort_engine.Trace
+        :param interval: Steps between two keyframes, None to choose it from KEYFRAME_BUDGET
+        """
+
+        self.trace = trace
+
+        if steps is not None:
+            self.interval = interval
+            self.steps, self.counters, self.states = steps, counters, states
+            return
+
+        count = len(trace)
+        if interval is None:
+            max_keyframes = max(1, KEYFRAME_BUDGET // (8 * max(len(trace.initial), 1)))
+            interval = max(256, -(-count // max_keyframes))
+        self.interval = interval
+
+        self.steps = list()
+        self.counters = list()
+        self.states = list()
+
+        values = list(trace.initial)
+        metrics = Metrics()
+        for step, (op, a, b) in enumerate(trace.events()):
+            if step % interval == 0:
+                self.steps.append(step)
+                self.counters.append(metrics.snapshot())
+                self.states.append(array("q", values))
+            sort_engine.apply_event(values, op, a, b)
+            metrics.count(op, a, b)
+
+        ### The state after the last event is a keyframe as well
+        self.steps.append(count)
+        self.counters.append(metrics.snapshot())
+        self.states.append(array("q", values))
+
+    def __len__(self):
+        return len(self.steps)
+
+    def seek(self, step):
+        """
+        This function computes the state before the event with the given index.
+
+        :param step: Index of the next event, len(trace) for the end
+        :return: (list of values, Metrics at this step)
+        """
+
+        step = max(0, min(step, len(self.trace)))
+        k = bisect_right(self.steps, step) - 1
+
+        values = list(self.states[k])
+        metrics = Metrics()
+        metrics.restore(tuple(self.counters[k]))
+
+        for op, a, b in self.trace.events(self.steps[k], step):
+            sort_engine.apply_event(values, op, a, b)
+            metrics.count(op, a, b)
+
+        return values, metrics
+
+
+def save(path, trace, keyframes=None):
+    """
+    This function writes a trace and its keyframes to a binary file.
+    The file is written next to the target and then renamed, since a loaded trace maps the file it came from.
+
+    :param path: Path of the file
+    :param trace: sort_engine.Trace
+    :param keyframes: Keyframes of the trace, computed if None
+    :return: Keyframes
+    """
+
+    if keyframes is None:
+        keyframes = Keyframes(trace)
+
+    name = trace.algorithm.encode("utf-8")
+    name += b"\0" * (-len(name) % 8)
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(trace.initial), len(trace), keyframes.interval, len(keyframes), len(name)))
+            file.write(name)
+            file.write(_little_endian(trace.initial))
+            file.write(_little_endian(trace.ops))
+            for step, counters, state in zip(keyframes.steps, keyframes.counters, keyframes.states):
+                file.write(_little_endian(array("q", (step,) + tuple(counters))))
+                file.write(_little_endian(state))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+    return keyframes
+
+
+def load(path):
+    """
+    This function maps a trace file into memory. Events and keyframes are read from the mapping on access.
+
+    :param path: Path of the file
+    :return: (sort_engine.Trace, Keyframes)
+    :raise ValueError: If the file is not a trace file or is truncated
+    """
+
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapping) < HEADER.size:
+        raise ValueError(f"'{path}' is not a trace file of version {VERSION}")
+    magic, version, elements, steps, interval, count, name_length = HEADER.unpack_from(mapping)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"'{path}' is not a trace file of version {VERSION}")
+
+    ### The sizes in the header must describe the file exactly before any part of it is cast or sliced
+    if min(elements, steps, count, name_length) < 0 or name_length % 8:
+        raise ValueError(f"'{path}' has a corrupt header")
+    size = HEADER.size + name_length + 8 * (elements + 3 * steps + count * (1 + COUNTERS + elements))
+    if len(mapping) != size:
+        raise ValueError(f"'{path}' has {len(mapping)} bytes instead of {size}, it is truncated or corrupt")
+
+    if sys.byteorder == "little":
+        words = memoryview(mapping).cast("q")
+    else:
+        words = array("q", mapping)
+        words.byteswap()
+
+    position = (HEADER.size + name_length) // 8
+    name = mapping[HEADER.size:HEADER.size + name_length].rstrip(b"\0").decode("utf-8")
+
+    initial = words[position:position + elements]
+    position += elements
+    ops = words[position:position + 3 * steps]
+    position += 3 * steps
+
+    trace = sort_engine.Trace.from_buffers(initial, ops, name)
+
+    keyframe_steps, counters, states = list(), list(), list()
+    for k in range(count):
+        keyframe_steps.append(words[position])
+        counters.append(words[position + 1:position + 1 + COUNTERS])
+        position += 1 + COUNTERS
+        states.append(words[position:position + elements])
+        position += elements
+
+    return trace, Keyframes(trace, interval, keyframe_steps, counters, states)
+
+
+def _little_endian(values):
+    """
+    :return: The bytes of an int64 sequence in little-endian order
+    """
+
+    values = array("q", values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def main(argv=None):
+    """
+    Command line entry point: record a trace headless and write it to a file.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="record", description="Record the trace of a sort into a binary file.")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--algorithm", default="Quick Sort (Hoare)", choices=list(sort_engine.ALGORITHMS), metavar="NAME")
+    parser.add_argument("--size", type=int, default=1000, help="number of elements")
+    parser.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--interval", type=int, help="steps between two keyframes")
+    args = parser.parse_args(argv)
+
+    values = distributions.generate(args.distribution, args.size, args.seed)
+    trace = sort_engine.record(sort_engine.ALGORITHMS[args.algorithm], values, args.algorithm)
+    keyframes = save(args.path, trace, Keyframes(trace, args.interval))
+
+    print(f"{args.path}: {len(trace)} events, {len(keyframes)} keyframes every {keyframes.interval} steps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Audio track of a sort: every compared, swapped or written element sounds with a pitch depending on its value.
+
+The tones are synthesized once per pitch bucket for the length of one animation frame. The trace is cut
+into frames at a given rate of events per second, the same way the GUI plays it, and the tones of the
+elements touched in a frame are mixed into one block of samples. Nothing is synthesized per event.
+
+Usage:
+    $ python visualize_sorting.py sonify quick.wav --algorithm "Quick Sort (Hoare)" --size 1000 --duration 20
+"""
+
+from array import array
+import argparse
+import math
+import sys
+import wave
+
+from . import distributions
+from . import replay
+from . import sort_engine
+
+
+SAMPLE_RATE = 22050
+
+### Number of distinct pitches between LOW_FREQUENCY and HIGH_FREQUENCY, spaced logarithmically
+BUCKETS = 64
+LOW_FREQUENCY = 120
+HIGH_FREQUENCY = 1200
+
+### Maximum number of tones mixed into one frame
+VOICES = 8
+
+### Peak amplitude of a single tone, a mix of several tones is scaled down to it
+AMPLITUDE = 12000
+
+### Length of the fade in and out of a tone in samples, avoids clicks between frames
+FADE = 48
+
+### Length of the audio in seconds when no rate is given
+DURATION = 20.0
+
+### Number of mixes kept for reuse
+MIX_CACHE = 4096
+
+
+class ToneBank:
+    """
+    Precomputed tones for all pitch buckets, each exactly one frame long, and a cache of mixes.
+    """
+
+    def __init__(self, frame_rate, sample_rate=SAMPLE_RATE, buckets=BUCKETS):
+        """
+        Init tone bank and synthesize all tones
+
+        :param frame_rate: Frames per second of the animation
+        :param sample_rate: Samples per second of the audio
+        :param buckets: Number of pitches
+        """
+
+        self.samples = max(1, round(sample_rate / frame_rate))
+        self.silence = array("h", bytes(2 * self.samples))
+        self.mixes = dict()
+
+        fade = min(FADE, self.samples // 2) or 1
+        envelope = [min(1.0, k / fade, (self.samples - 1 - k) / fade) for k in range(self.samples)]
+
+        self.tones = list()
+        for bucket in range(buckets):
+            frequency = LOW_FREQUENCY * (HIGH_FREQUENCY / LOW_FREQUENCY) ** (bucket / max(buckets - 1, 1))
+            step = 2 * math.pi * frequency / sample_rate
+            self.tones.append(array("h", [int(AMPLITUDE * envelope[k] * math.sin(step * k)) for k in range(self.samples)]))
+
+    def mix(self, buckets):
+        """
+        This function mixes the tones of some pitch buckets into one frame.
+
+        :param buckets: Tuple of distinct buckets, at most VOICES
+        :return: array('h') with the samples of the frame; do not modify, mixes are shared
+        """
+
+        if not buckets:
+            return self.silence
+
+        mixed = self.mixes.get(buckets)
+        if mixed is None:
+            if len(buckets) == 1:
+                mixed = self.tones[buckets[0]]
+            else:
+                count = len(buckets)
+                mixed = array("h", [sum(column) // count for column in zip(*[self.tones[bucket] for bucket in buckets])])
+            if len(self.mixes) >= MIX_CACHE:
+                self.mixes.clear()
+            self.mixes[buckets] = mixed
+        return mixed
+
+
+def frames(trace, rate, frame_rate=60, bank=None):
+    """
+    This function plays a trace at a rate of events per second and yields the audio of each frame.
+
+    :param trace: sort_engine.Trace
+    :param rate: Events per second
+    :param frame_rate: Frames per second, as in the GUI
+    :param bank: ToneBank for the frame rate, created if None
+    :return: Generator of array('h'), one per frame
+    """
+
+    bank = bank or ToneBank(frame_rate)
+    values = list(trace.initial)
+    if not values:
+        return
+
+    low = min(values)
+    scale = (BUCKETS - 1) / ((max(values) - low) or 1)
+    per_frame = rate / frame_rate
+
+    budget = 0.0
+    touched = dict()
+    for op, a, b in trace.events():
+
+        if op == sort_engine.COMPARE:
+            touched[values[a]] = None
+            touched[values[b]] = None
+        elif op == sort_engine.SWAP:
+            values[a], values[b] = values[b], values[a]
+            touched[values[a]] = None
+            touched[values[b]] = None
+        elif op == sort_engine.WRITE:
+            values[a] = b
+            touched[b] = None
+
+        ### Paced like the GUI: a mark is silent but takes its step
+        budget -= sort_engine.STEPS[op]
+        while budget < 0:
+            yield bank.mix(_buckets(touched, low, scale))
+            touched = dict()
+            budget += per_frame
+
+    if touched:
+        yield bank.mix(_buckets(touched, low, scale))
+
+
+def _buckets(touched, low, scale):
+    """
+    :return: Sorted tuple of the distinct pitch buckets of the last VOICES touched values
+    """
+
+    values = list(touched)[-VOICES:]
+    return tuple(sorted({int((value - low) * scale) for value in values}))
+
+
+def rate_for(trace, duration):
+    """
+    :return: Events per second so that the audio of the trace lasts the duration in seconds
+    """
+
+    steps = sum(count * sort_engine.STEPS[op] for op, count in enumerate(trace.counts()))
+    return max(1.0, steps / duration)
+
+
+def write(path, trace, rate, frame_rate=60, sample_rate=SAMPLE_RATE):
+    """
+    This function writes the audio track of a trace as mono 16 bit WAV file, "-" writes raw samples to stdout.
+
+    :param path: Path of the file
+    :param trace: sort_engine.Trace
+    :param rate: Events per second
+    :param frame_rate: Frames per second, as in the GUI
+    :param sample_rate: Samples per second
+    :return: Duration in seconds
+    """
+
+    bank = ToneBank(frame_rate, sample_rate)
+    samples = 0
+
+    if path == "-":
+        output = sys.stdout.buffer
+        with_header = None
+    else:
+        with_header = wave.open(path, "wb")
+        with_header.setnchannels(1)
+        with_header.setsampwidth(2)
+        with_header.setframerate(sample_rate)
+        output = with_header
+
+    try:
+        ### Frames are written in chunks, a mix of the cache is never modified
+        chunk = array("h")
+        for frame in frames(trace, rate, frame_rate, bank):
+            chunk.extend(frame)
+            if len(chunk) >= sample_rate:
+                samples += len(chunk)
+                _write_samples(output, chunk)
+                chunk = array("h")
+        samples += len(chunk)
+        _write_samples(output, chunk)
+    finally:
+        if with_header is not None:
+            with_header.close()
+
+    return samples / sample_rate
+
+
+def _write_samples(output, chunk):
+    """
+    This function writes 16 bit samples in little-endian order.
+
+    :return: None
+    """
+
+    if sys.byteorder != "little":
+        chunk.byteswap()
+    if hasattr(output, "writeframesraw"):
+        output.writeframesraw(chunk.tobytes())
+    else:
+        output.write(chunk.tobytes())
+
+
+def main(argv=None):
+    """
+    Command line entry point: write the audio track of a sort or of a trace file.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="sonify", description="Write the audio track of a sort as WAV file.")
+    parser.add_argument("path", help="output WAV file ('-' for raw 16 bit mono samples on stdout)")
+    parser.add_argument("--trace", metavar="FILE", help="trace file written by 'record' or the GUI instead of a new sort")
+    parser.add_argument("--algorithm", default="Quick Sort (Hoare)", choices=list(sort_engine.ALGORITHMS), metavar="NAME")
+    parser.add_argument("--size", type=int, default=1000, help="number of elements")
+    parser.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    speed = parser.add_mutually_exclusive_group()
+    speed.add_argument("--rate", type=float, help="events per second")
+    speed.add_argument("--duration", type=float, default=DURATION, help=f"length of the audio in seconds (default: {DURATION:g})")
+    parser.add_argument("--frame-rate", type=int, default=60, help="frames per second of the animation")
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        trace, keyframes = replay.load(args.trace)
+    else:
+        values = distributions.generate(args.distribution, args.size, args.seed)
+        trace = sort_engine.record(sort_engine.ALGORITHMS[args.algorithm], values, args.algorithm)
+
+    rate = args.rate or rate_for(trace, args.duration)
+    duration = write(args.path, trace, rate, args.frame_rate, args.sample_rate)
+
+    print(f"{args.path}: {len(trace)} events at {rate:,.0f} ops/s, {duration:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,758 @@
+"""
+Headless sorting engine.
+
+Every algorithm is a generator which sorts a mutable sequence in place and yields compact
+events (op, a, b) while doing so. The events are collected in an array-backed Trace which
+the GUI replays on the canvas. No tkinter in here.
+"""
+
+from array import array
+from functools import partial
+
+
+### Event codes
+COMPARE = 0     ### (COMPARE, i, j): a[i] is compared with a[j]
+SWAP = 1        ### (SWAP, i, j): a[i] and a[j] are exchanged
+MARK = 2        ### (MARK, i, 0): a[i] is at its final position
+WRITE = 3       ### (WRITE, i, value): value is written to a[i]
+AUX = 4         ### (AUX, words, 0): auxiliary memory grows (> 0) or shrinks (< 0) by a number of elements
+RUN = 5         ### (RUN, lo, hi): a[lo:hi] is a sorted run, see external
+MERGE = 6       ### (MERGE, lo, hi): the runs in a[lo:hi] are merged next, see external
+
+OP_NAMES = ("compare", "swap", "mark", "write", "aux", "run", "merge")
+
+### Steps of the speed an event takes when it is played, by event code: the changes of the auxiliary memory are
+### not shown and take none. The GUI, the audio track and the exported animation are paced alike with it
+STEPS = (1, 1, 1, 1, 0, 1, 1)
+
+### Events recorded between two checks of the cancel flag of a recording in the background
+CANCEL_EVERY = 65536
+
+
+class Cancelled(Exception):
+    """
+    Raised by a recording in the background whose cancel flag was set.
+    """
+
+
+class Trace:
+    """
+    Array-backed recording of the events of one sorting run.
+
+    The events are stored flat in one integer array, three entries (op, a, b) per event.
+    """
+
+    __slots__ = ("algorithm", "initial", "ops")
+
+    def __init__(self, values, algorithm=""):
+        """
+        Init trace
+
+        :param values: The unsorted input sequence
+        :param algorithm: Name of the algorithm which produced the trace
+        """
+
+        self.algorithm = algorithm
+        self.initial = array("q", values)
+        self.ops = array("q")
+
+    @classmethod
+    def from_buffers(cls, initial, ops, algorithm=""):
+        """
+        This function creates a trace around existing buffers without copying them, e.g. memoryviews of a mapped file.
+
+        :param initial: Buffer with the input sequence
+        :param ops: Buffer with the flat events
+        :param algorithm: Name of the algorithm
+        :return: Trace
+        """
+
+        trace = cls.__new__(cls)
+        trace.algorithm = algorithm
+        trace.initial = initial
+        trace.ops = ops
+        return trace
+
+    def __len__(self):
+        return len(self.ops) // 3
+
+    def __getitem__(self, step):
+        k = 3 * step
+        return self.ops[k], self.ops[k+1], self.ops[k+2]
+
+    def __iter__(self):
+        return self.events()
+
+    def append(self, op, a, b=0):
+        """
+        This function appends one event to the trace.
+
+        :param op: Event code
+        :param a: First operand
+        :param b: Second operand
+        :return: None
+        """
+
+        self.ops.extend((op, a, b))
+
+    def events(self, start=0, stop=None):
+        """
+        This function iterates over the events in the range [start, stop).
+
+        :param start: First step
+        :param stop: Last step (exclusive), None for the end of the trace
+        :return: Iterator of (op, a, b) tuples
+        """
+
+        ops = self.ops
+        stop = len(self) if stop is None else stop
+        for k in range(3 * start, 3 * stop, 3):
+            yield ops[k], ops[k+1], ops[k+2]
+
+    def counts(self):
+        """
+        This function counts the events per event code.
+
+        :return: List with one counter per event code
+        """
+
+        counts = [0] * len(OP_NAMES)
+        for op in self.ops[0::3]:
+            counts[op] += 1
+        return counts
+
+    def final(self):
+        """
+        This function replays the trace on a copy of the input.
+
+        :return: The sequence after the last event
+        """
+
+        values = list(self.initial)
+        for op, a, b in self.events():
+            apply_event(values, op, a, b)
+        return values
+
+
+def apply_event(values, op, a, b):
+    """
+    This function applies a single event to a sequence. Events which do not change the data are ignored.
+
+    :param values: Mutable sequence
+    :param op: Event code
+    :param a: First operand
+    :param b: Second operand
+    :return: None
+    """
+
+    if op == SWAP:
+        values[a], values[b] = values[b], values[a]
+    elif op == WRITE:
+        values[a] = b
+
+
+def record(algorithm, values, name=""):
+    """
+    This function runs an algorithm on a copy of the values and records all events.
+
+    :param algorithm: Generator function from ALGORITHMS
+    :param values: The unsorted input sequence
+    :param name: Name stored in the trace
+    :return: Trace
+    """
+
+    trace = Trace(values, name)
+    extend = trace.ops.extend
+    for event in algorithm(list(values)):
+        extend(event)
+    return trace
+
+
+def bubble_sort(a):
+    """
+    This function implements the BubbleSort algorithm.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    len_arr = len(a)
+
+    for i in range(len_arr):
+        for j in range(0, len_arr-i-1):
+            yield COMPARE, j, j+1
+            if a[j] > a[j+1]:
+                a[j], a[j+1] = a[j+1], a[j]
+                yield SWAP, j, j+1
+
+        yield MARK, len_arr-i-1, 0
+
+
+def insertion_sort(a):
+    """
+    This function implements the InsertionSort algorithm.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    yield from _insertion_sort_range(a, 0, len(a))
+
+
+def selection_sort(a):
+    """
+    This function implements the SelectionSort algorithm.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    len_arr = len(a)
+
+    for i in range(len_arr):
+
+        min_index = i
+        for j in range(i+1, len_arr):
+            yield COMPARE, min_index, j
+            if a[j] < a[min_index]:
+                min_index = j
+
+        if min_index != i:
+            a[i], a[min_index] = a[min_index], a[i]
+            yield SWAP, i, min_index
+
+        ### The i-th element is sorted
+        yield MARK, i, 0
+
+
+def _insertion_sort_range(a, lo, hi):
+    """
+    This function sorts a[lo:hi] with InsertionSort.
+
+    :param a: Mutable sequence
+    :param lo: First index
+    :param hi: Last index (exclusive)
+    :return: Generator of events
+    """
+
+    for i in range(lo + 1, hi):
+
+        j = i
+        while j > lo:
+            yield COMPARE, j-1, j
+            if a[j-1] <= a[j]:
+                break
+            a[j-1], a[j] = a[j], a[j-1]
+            yield SWAP, j-1, j
+            j -= 1
+
+
+def _merge(a, lo, mid, hi):
+    """
+    This function merges the sorted ranges a[lo:mid] and a[mid:hi] through a buffer.
+    Comparisons refer to the positions the compared values had when the buffer was filled.
+
+    :param a: Mutable sequence
+    :param lo: First index of the left range
+    :param mid: First index of the right range
+    :param hi: Last index of the right range (exclusive)
+    :return: Generator of events
+    """
+
+    buffer = a[lo:hi]
+    yield AUX, hi - lo, 0
+
+    i, j = 0, mid - lo
+    left_end, right_end = mid - lo, hi - lo
+
+    for k in range(lo, hi):
+
+        ### The rest of the right range is already in place
+        if i == left_end:
+            break
+
+        if j < right_end:
+            yield COMPARE, lo + i, lo + j
+            if buffer[j] < buffer[i]:
+                value = buffer[j]
+                j += 1
+            else:
+                value = buffer[i]
+                i += 1
+        else:
+            value = buffer[i]
+            i += 1
+
+        a[k] = value
+        yield WRITE, k, value
+
+    yield AUX, lo - hi, 0
+
+
+def merge_sort(a):
+    """
+    This function implements the top-down MergeSort algorithm.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    def split(lo, hi):
+        if hi - lo < 2:
+            return
+        mid = (lo + hi) // 2
+        yield from split(lo, mid)
+        yield from split(mid, hi)
+        yield from _merge(a, lo, mid, hi)
+
+    yield from split(0, len(a))
+
+
+def merge_sort_bottom_up(a):
+    """
+    This function implements the bottom-up MergeSort algorithm which merges runs of width 1, 2, 4, ...
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    len_arr = len(a)
+
+    width = 1
+    while width < len_arr:
+        for lo in range(0, len_arr - width, 2 * width):
+            yield from _merge(a, lo, lo + width, min(lo + 2 * width, len_arr))
+        width *= 2
+
+
+def _lomuto_partition(a, lo, hi):
+    """
+    This function partitions a[lo:hi+1] around the last element.
+
+    :return: Generator of events, returns the bounds (left_hi, right_lo) of the two partitions
+    """
+
+    i = lo
+    for j in range(lo, hi):
+        yield COMPARE, j, hi
+        if a[j] < a[hi]:
+            if i != j:
+                a[i], a[j] = a[j], a[i]
+                yield SWAP, i, j
+            i += 1
+
+    if i != hi:
+        a[i], a[hi] = a[hi], a[i]
+        yield SWAP, i, hi
+
+    ### The pivot is at its final position
+    yield MARK, i, 0
+    return i - 1, i + 1
+
+
+def _hoare_partition(a, lo, hi, pivot_index=None):
+    """
+    This function partitions a[lo:hi+1] with Hoare's scheme, by default around the middle element.
+
+    :return: Generator of events, returns the bounds (left_hi, right_lo) of the two partitions
+    """
+
+    if pivot_index is None:
+        pivot_index = (lo + hi) // 2
+    pivot = a[pivot_index]
+
+    i, j = lo - 1, hi + 1
+    while True:
+
+        i += 1
+        yield COMPARE, i, pivot_index
+        while a[i] < pivot:
+            i += 1
+            yield COMPARE, i, pivot_index
+
+        j -= 1
+        yield COMPARE, j, pivot_index
+        while a[j] > pivot:
+            j -= 1
+            yield COMPARE, j, pivot_index
+
+        if i >= j:
+            return j, j + 1
+
+        a[i], a[j] = a[j], a[i]
+        yield SWAP, i, j
+
+        ### Follow the pivot so that the events point to the right element
+        if pivot_index == i:
+            pivot_index = j
+        elif pivot_index == j:
+            pivot_index = i
+
+
+def _median_of_three_partition(a, lo, hi):
+    """
+    This function orders a[lo], a[mid] and a[hi] and partitions with Hoare's scheme around the median.
+
+    :return: Generator of events, returns the bounds (left_hi, right_lo) of the two partitions
+    """
+
+    mid = (lo + hi) // 2
+    for i, j in ((lo, mid), (mid, hi), (lo, mid)):
+        yield COMPARE, i, j
+        if a[j] < a[i]:
+            a[i], a[j] = a[j], a[i]
+            yield SWAP, i, j
+
+    return (yield from _hoare_partition(a, lo, hi, mid))
+
+
+def _quick_sort(a, partition, depth_limit=None, small=1):
+    """
+    This function implements QuickSort with an explicit stack. The smaller partition is handled first,
+    so the stack never holds more than O(log n) ranges.
+
+    :param a: Mutable sequence, sorted in place
+    :param partition: Partition scheme
+    :param depth_limit: Depth after which a range is sorted with HeapSort (IntroSort), None for no limit
+    :param small: Ranges with fewer elements are sorted with InsertionSort
+    :return: Generator of events
+    """
+
+    ### One stack entry (lo, hi, depth) is counted as two elements of auxiliary memory
+    stack = [(0, len(a) - 1, 0)]
+    yield AUX, 2, 0
+
+    while stack:
+
+        lo, hi, depth = stack.pop()
+        yield AUX, -2, 0
+
+        if hi - lo + 1 < small:
+            yield from _insertion_sort_range(a, lo, hi + 1)
+            continue
+        if hi <= lo:
+            continue
+        if depth_limit is not None and depth >= depth_limit:
+            yield from _heap_sort(a, lo, hi + 1)
+            continue
+
+        left_hi, right_lo = yield from partition(a, lo, hi)
+
+        ### Push the larger partition first
+        ranges = sorted(((lo, left_hi), (right_lo, hi)), key=lambda r: r[0] - r[1])
+        for bounds in ranges:
+            if bounds[1] > bounds[0]:
+                stack.append((bounds[0], bounds[1], depth + 1))
+                yield AUX, 2, 0
+
+
+def quick_sort_lomuto(a):
+    """
+    This function implements QuickSort with Lomuto's partition scheme and the last element as pivot.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    yield from _quick_sort(a, _lomuto_partition)
+
+
+def quick_sort_hoare(a):
+    """
+    This function implements QuickSort with Hoare's partition scheme and the middle element as pivot.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    yield from _quick_sort(a, _hoare_partition)
+
+
+def quick_sort_median_of_three(a):
+    """
+    This function implements QuickSort with the median of the first, middle and last element as pivot.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    yield from _quick_sort(a, _median_of_three_partition)
+
+
+def intro_sort(a):
+    """
+    This function implements IntroSort: median-of-3 QuickSort which falls back to HeapSort
+    after 2*log2(n) levels and uses InsertionSort for ranges with less than 16 elements.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    yield from _quick_sort(a, _median_of_three_partition, 2 * max(len(a), 1).bit_length(), 16)
+
+
+def _sift_down(a, lo, root, size):
+    """
+    This function restores the max-heap property of the heap a[lo:lo+size] below root.
+
+    :return: Generator of events
+    """
+
+    while (child := 2 * root + 1) < size:
+
+        if child + 1 < size:
+            yield COMPARE, lo + child, lo + child + 1
+            if a[lo + child] < a[lo + child + 1]:
+                child += 1
+
+        yield COMPARE, lo + root, lo + child
+        if a[lo + root] >= a[lo + child]:
+            return
+
+        a[lo + root], a[lo + child] = a[lo + child], a[lo + root]
+        yield SWAP, lo + root, lo + child
+        root = child
+
+
+def _heap_sort(a, lo, hi):
+    """
+    This function sorts a[lo:hi] with HeapSort.
+
+    :return: Generator of events
+    """
+
+    size = hi - lo
+
+    for root in range(size // 2 - 1, -1, -1):
+        yield from _sift_down(a, lo, root, size)
+
+    for end in range(size - 1, 0, -1):
+        ### Move the maximum behind the heap
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        yield SWAP, lo, lo + end
+        yield MARK, lo + end, 0
+        yield from _sift_down(a, lo, 0, end)
+
+    if size:
+        yield MARK, lo, 0
+
+
+def heap_sort(a):
+    """
+    This function implements the HeapSort algorithm.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    yield from _heap_sort(a, 0, len(a))
+
+
+def _shell_gaps(n):
+    gaps, gap = [], n // 2
+    while gap > 0:
+        gaps.insert(0, gap)
+        gap //= 2
+    return gaps
+
+
+def _knuth_gaps(n):
+    gaps, gap = [], 1
+    while gap < n:
+        gaps.append(gap)
+        gap = 3 * gap + 1
+    return gaps
+
+
+def _ciura_gaps(n):
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+    while gaps[-1] < n:
+        gaps.append(int(gaps[-1] * 2.25))
+    return [gap for gap in gaps if gap < n] or [1]
+
+
+def _sedgewick_gaps(n):
+    gaps, k = [1], 1
+    while (gap := 4 ** k + 3 * 2 ** (k - 1) + 1) < n:
+        gaps.append(gap)
+        k += 1
+    return gaps
+
+
+### Name -> function returning the ascending gaps for n elements
+GAP_SEQUENCES = {
+    "shell": _shell_gaps,
+    "knuth": _knuth_gaps,
+    "ciura": _ciura_gaps,
+    "sedgewick": _sedgewick_gaps,
+}
+
+
+def shell_sort(a, gaps="ciura"):
+    """
+    This function implements the ShellSort algorithm.
+
+    :param a: Mutable sequence, sorted in place
+    :param gaps: Name of the gap sequence from GAP_SEQUENCES
+    :return: Generator of events
+    """
+
+    len_arr = len(a)
+
+    for gap in reversed(GAP_SEQUENCES[gaps](len_arr)):
+        for i in range(gap, len_arr):
+
+            j = i
+            while j >= gap:
+                yield COMPARE, j-gap, j
+                if a[j-gap] <= a[j]:
+                    break
+                a[j-gap], a[j] = a[j], a[j-gap]
+                yield SWAP, j-gap, j
+                j -= gap
+
+
+def radix_sort(a, base=256):
+    """
+    This function implements the LSD RadixSort algorithm for integers. It does not compare elements,
+    every pass distributes the elements by one digit into a buffer and writes them back.
+
+    :param a: Mutable sequence of integers, sorted in place
+    :param base: Base of the digits
+    :return: Generator of events
+    """
+
+    len_arr = len(a)
+    if len_arr < 2:
+        return
+
+    ### Shift the values so that negative numbers work as well
+    low = min(a)
+    high = max(a) - low
+
+    buffer = [0] * len_arr
+    yield AUX, len_arr + base, 0
+
+    exp = 1
+    while exp <= high:
+
+        ### Count the digits and compute the first position of each digit in the buffer
+        counts = [0] * base
+        for value in a:
+            counts[(value - low) // exp % base] += 1
+
+        position = 0
+        for digit in range(base):
+            counts[digit], position = position, position + counts[digit]
+
+        for value in a:
+            digit = (value - low) // exp % base
+            buffer[counts[digit]] = value
+            counts[digit] += 1
+
+        for k in range(len_arr):
+            a[k] = buffer[k]
+            yield WRITE, k, buffer[k]
+
+        exp *= base
+
+    yield AUX, -(len_arr + base), 0
+
+
+def _min_run(n):
+    """
+    :return: Minimum run length for TimSort, between 16 and 32 so that n / min_run is close to a power of two
+    """
+
+    rest = 0
+    while n >= 32:
+        rest |= n & 1
+        n >>= 1
+    return n + rest
+
+
+def tim_sort(a):
+    """
+    This function implements a simplified TimSort: natural runs extended to a minimum length by InsertionSort,
+    merged while keeping the stack invariants. No galloping.
+
+    :param a: Mutable sequence, sorted in place
+    :return: Generator of events
+    """
+
+    len_arr = len(a)
+    min_run = _min_run(len_arr)
+    runs = list()
+
+    def merge_at(i):
+        lo, mid = runs[i][0], runs[i+1][0]
+        hi = mid + runs[i+1][1]
+        runs[i:i+2] = [(lo, hi - lo)]
+        yield from _merge(a, lo, mid, hi)
+
+    lo = 0
+    while lo < len_arr:
+
+        ### Find the next natural run, a strictly descending run is reversed
+        hi = lo + 1
+        if hi < len_arr:
+            yield COMPARE, lo, hi
+            descending = a[hi] < a[lo]
+            hi += 1
+            while hi < len_arr:
+                yield COMPARE, hi-1, hi
+                if (a[hi] < a[hi-1]) != descending:
+                    break
+                hi += 1
+
+            if descending:
+                i, j = lo, hi - 1
+                while i < j:
+                    a[i], a[j] = a[j], a[i]
+                    yield SWAP, i, j
+                    i, j = i + 1, j - 1
+
+        ### Extend short runs with InsertionSort
+        end = min(lo + min_run, len_arr)
+        if hi < end:
+            yield from _insertion_sort_range(a, lo, end)
+            hi = end
+
+        runs.append((lo, hi - lo))
+        lo = hi
+
+        ### Merge until the run lengths shrink faster than the Fibonacci numbers
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n-1][1] <= runs[n][1] + runs[n+1][1]) or (n > 1 and runs[n-2][1] <= runs[n-1][1] + runs[n][1]):
+                if runs[n-1][1] < runs[n+1][1]:
+                    n -= 1
+                yield from merge_at(n)
+            elif runs[n][1] <= runs[n+1][1]:
+                yield from merge_at(n)
+            else:
+                break
+
+    while len(runs) > 1:
+        yield from merge_at(len(runs) - 2)
+
+
+### Name shown in the GUI -> generator function
+ALGORITHMS = {
+    "Bubble Sort": bubble_sort,
+    "Selection Sort": selection_sort,
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort,
+    "Merge Sort (bottom-up)": merge_sort_bottom_up,
+    "Quick Sort (Lomuto)": quick_sort_lomuto,
+    "Quick Sort (Hoare)": quick_sort_hoare,
+    "Quick Sort (median of 3)": quick_sort_median_of_three,
+    "Intro Sort": intro_sort,
+    "Heap Sort": heap_sort,
+    "Shell Sort (Shell gaps)": partial(shell_sort, gaps="shell"),
+    "Shell Sort (Knuth gaps)": partial(shell_sort, gaps="knuth"),
+    "Shell Sort (Ciura gaps)": partial(shell_sort, gaps="ciura"),
+    "Shell Sort (Sedgewick gaps)": partial(shell_sort, gaps="sedgewick"),
+    "Radix Sort (LSD)": radix_sort,
+    "Tim Sort": tim_sort,
+}
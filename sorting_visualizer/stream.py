@@ -0,0 +1,516 @@
+"""
+Streaming of one sort to many viewers over a local TCP socket.
+
+Usage:
+    $ python visualize_sorting.py stream serve --algorithm "Merge Sort" --size 10000 --rate 20000 --port 8765
+    $ python visualize_sorting.py stream watch --port 8765
+
+The server records the trace once and plays it on its own clock at --rate events per second. The events of
+one frame are encoded once and queued for every viewer, so each further viewer only costs the bytes sent.
+
+Every message is a header of kind and payload length followed by the payload, all integers little-endian:
+
+    HELLO       JSON with the algorithm, the number of elements and steps, the rate and the frame rate
+    KEYFRAME    int64: step, the counters of Metrics.snapshot() and the values of the array at this step
+    DELTA       int64: step and number of events, then zlib of the event codes as bytes, the differences of
+                the first operands and the differences of the second operands as int64
+    END         int64: number of steps of the trace
+
+The producer never waits for a viewer: each viewer has a queue of QUEUE_FRAMES messages. A viewer whose queue
+is full is behind, its queued frames are dropped and it gets the keyframe after the current frame instead.
+"""
+
+from array import array
+from itertools import accumulate, chain
+import argparse
+import asyncio
+import json
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from . import distributions
+from . import replay
+from . import sort_engine
+from .metrics import Metrics
+
+
+HELLO, KEYFRAME, DELTA, END = range(4)
+HEADER = struct.Struct("<BI")
+STEP = struct.Struct("<q")
+BATCH = struct.Struct("<qq")
+
+### Frames per second of the server and of the window of a viewer
+FRAME_RATE = 30
+
+### Messages queued per viewer before it is considered behind
+QUEUE_FRAMES = 8
+
+PORT = 8765
+
+
+def _int64(values):
+    """
+    :return: The bytes of an int64 sequence in little-endian order
+    """
+
+    values = array("q", values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_int64(data):
+    """
+    :return: array('q') of little-endian int64 bytes
+    """
+
+    values = array("q")
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def message(kind, payload):
+    """
+    :return: The bytes of one message
+    """
+
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_keyframe(step, metrics, values):
+    """
+    :param step: Index of the next event
+    :param metrics: Metrics at this step
+    :param values: The array at this step
+    :return: KEYFRAME message
+    """
+
+    return message(KEYFRAME, _int64(chain((step,), metrics.snapshot(), values)))
+
+
+def encode_delta(ops, start, stop):
+    """
+    This function encodes the events [start, stop) of a trace. Consecutive operands are mostly close to each other,
+    so their differences are small numbers which zlib compresses well.
+
+    :param ops: Flat events of a sort_engine.Trace
+    :param start: First step
+    :param stop: Last step (exclusive)
+    :return: DELTA message
+    """
+
+    flat = ops[3 * start:3 * stop]
+    firsts, seconds = flat[1::3], flat[2::3]
+    data = (array("B", flat[0::3]).tobytes()
+            + _int64(x - y for x, y in zip(firsts, chain((0,), firsts)))
+            + _int64(x - y for x, y in zip(seconds, chain((0,), seconds))))
+    return message(DELTA, BATCH.pack(start, stop - start) + zlib.compress(data, 1))
+
+
+def decode_delta(payload):
+    """
+    :param payload: Payload of a DELTA message
+    :return: (step of the first event, iterator of (op, a, b))
+    """
+
+    step, count = BATCH.unpack_from(payload)
+    data = zlib.decompress(payload[BATCH.size:])
+    firsts = accumulate(_from_int64(data[count:9 * count]))
+    seconds = accumulate(_from_int64(data[9 * count:]))
+    return step, zip(data[:count], firsts, seconds)
+
+
+class Viewer:
+    """
+    One connected viewer: its connection and the messages not sent yet.
+    """
+
+    __slots__ = ("writer", "queue", "frames", "resyncs")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.queue = asyncio.Queue(QUEUE_FRAMES)
+        self.frames = 0
+        self.resyncs = 0
+
+
+class Server:
+    """
+    Plays one trace to all connected viewers.
+    """
+
+    def __init__(self, trace, rate, frame_rate=FRAME_RATE, repeat=False):
+        """
+        :param trace: sort_engine.Trace
+        :param rate: Events per second
+        :param frame_rate: Frames per second, each is one DELTA message
+        :param repeat: Start again after the end of the trace
+        """
+
+        self.trace = trace
+        self.keyframes = replay.Keyframes(trace)
+        self.rate = rate
+        self.frame_rate = frame_rate
+        self.repeat = repeat
+        self.step = 0
+        self.viewers = set()
+        self.cached_keyframe = (None, None)
+        self.hello = message(HELLO, json.dumps({"algorithm": trace.algorithm, "elements": len(trace.initial), "steps": len(trace),
+                                                "rate": rate, "frame_rate": frame_rate}).encode("utf-8"))
+
+    def keyframe(self, step):
+        """
+        This function encodes the state at a step, once for all viewers which need it.
+
+        :return: KEYFRAME message
+        """
+
+        if self.cached_keyframe[0] != step:
+            values, metrics = self.keyframes.seek(step)
+            self.cached_keyframe = (step, encode_keyframe(step, metrics, values))
+        return self.cached_keyframe[1]
+
+    def send(self, viewer, data, step):
+        """
+        This function queues a message for a viewer without waiting. A viewer which is behind gets the keyframe
+        of the given step instead of its queued messages; the end of the trace is still sent after it.
+
+        :param viewer: Viewer
+        :param data: Message
+        :param step: Step after the message
+        :return: None
+        """
+
+        try:
+            viewer.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            while not viewer.queue.empty():
+                viewer.queue.get_nowait()
+            viewer.queue.put_nowait(self.keyframe(step))
+            viewer.resyncs += 1
+            if data[0] == END:
+                viewer.queue.put_nowait(data)
+
+    async def handle(self, reader, writer):
+        """
+        This function serves one viewer: it starts at the current step and gets the frames until the end
+        or until it disconnects.
+
+        :return: None
+        """
+
+        viewer = Viewer(writer)
+        viewer.queue.put_nowait(self.hello)
+        viewer.queue.put_nowait(self.keyframe(self.step))
+        self.viewers.add(viewer)
+        try:
+            while (data := await viewer.queue.get()) is not None:
+                writer.write(data)
+                ### Waits while the socket buffer is full, the queue of the viewer fills meanwhile
+                await writer.drain()
+                viewer.frames += 1
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.viewers.discard(viewer)
+            writer.close()
+
+    async def play(self):
+        """
+        This function plays the trace once: each frame the events due are sent as one DELTA message.
+
+        :return: None
+        """
+
+        ops = self.trace.ops
+        steps = len(self.trace)
+        budget = 0.0
+        last = time.perf_counter()
+
+        while self.step < steps:
+            ### Events due since the last frame, so that a late frame keeps the rate; at most one second of events
+            frame_start = time.perf_counter()
+            budget = min(budget + self.rate * (frame_start - last), self.rate)
+            last = frame_start
+
+            stop = min(steps, self.step + int(budget))
+            budget -= stop - self.step
+            if stop > self.step:
+                data = encode_delta(ops, self.step, stop)
+                self.step = stop
+                for viewer in list(self.viewers):
+                    self.send(viewer, data, stop)
+
+            await asyncio.sleep(max(0.0, 1 / self.frame_rate - (time.perf_counter() - frame_start)))
+
+        data = message(END, STEP.pack(steps))
+        for viewer in list(self.viewers):
+            self.send(viewer, data, steps)
+
+    async def serve(self, host="127.0.0.1", port=PORT, viewers=0, log=None):
+        """
+        This function accepts viewers and plays the trace, repeatedly if self.repeat is set.
+
+        :param host: Address to listen on
+        :param port: TCP port, 0 for any free port
+        :param viewers: Number of viewers to wait for before the first play
+        :param log: File for progress messages, None for none
+        :return: None
+        """
+
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            if log:
+                address = server.sockets[0].getsockname()
+                print(f"serving {self.trace.algorithm} on {address[0]}:{address[1]}, {len(self.trace)} events", file=log)
+            while len(self.viewers) < viewers:
+                await asyncio.sleep(0.05)
+
+            while True:
+                start = time.perf_counter()
+                await self.play()
+                if log:
+                    resyncs = sum(viewer.resyncs for viewer in self.viewers)
+                    print(f"played in {time.perf_counter() - start:.2f} s to {len(self.viewers)} viewers, {resyncs} keyframes to slow viewers", file=log)
+                if not self.repeat:
+                    break
+                await asyncio.sleep(2)
+                self.step = 0
+                for viewer in list(self.viewers):
+                    self.send(viewer, self.keyframe(0), 0)
+
+            ### Let the viewers receive the end, then close their connections
+            for viewer in list(self.viewers):
+                try:
+                    viewer.queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    viewer.writer.close()
+            deadline = time.perf_counter() + 5
+            while self.viewers and time.perf_counter() < deadline:
+                await asyncio.sleep(0.05)
+
+
+class Watcher:
+    """
+    State of the stream on the side of a viewer.
+    """
+
+    __slots__ = ("algorithm", "elements", "steps", "values", "step", "metrics", "frames", "keyframes", "done")
+
+    def __init__(self):
+        self.algorithm = ""
+        self.elements = 0
+        self.steps = 0
+        self.values = list()
+        self.step = 0
+        self.metrics = Metrics()
+        self.frames = 0
+        self.keyframes = 0
+        self.done = False
+
+    def apply(self, kind, payload):
+        """
+        This function applies one message to the state.
+
+        :param kind: Message kind
+        :param payload: Message payload
+        :return: List of the events of a DELTA message, else an empty list
+        """
+
+        if kind == HELLO:
+            hello = json.loads(payload)
+            self.algorithm, self.elements, self.steps = hello["algorithm"], hello["elements"], hello["steps"]
+
+        elif kind == KEYFRAME:
+            words = _from_int64(payload)
+            self.step = words[0]
+            self.metrics.restore(tuple(words[1:1 + replay.COUNTERS]))
+            self.values = words[1 + replay.COUNTERS:].tolist()
+            self.keyframes += 1
+            self.done = False
+
+        elif kind == DELTA:
+            step, events = decode_delta(payload)
+            events = list(events)
+            values, count = self.values, self.metrics.count
+            for op, a, b in events:
+                sort_engine.apply_event(values, op, a, b)
+                count(op, a, b)
+            self.step = step + len(events)
+            self.frames += 1
+            return events
+
+        elif kind == END:
+            self.done = True
+
+        return []
+
+    def __str__(self):
+        return (f"{self.algorithm}: step {self.step} of {self.steps}, {self.metrics.comparisons} comparisons, "
+                f"{self.metrics.writes} writes, {self.frames} frames, {self.keyframes} keyframes")
+
+
+async def receive(host="127.0.0.1", port=PORT):
+    """
+    This function connects to a server and yields its messages until the connection closes.
+
+    :return: Async generator of (kind, payload)
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+                payload = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                return
+            yield kind, payload
+    finally:
+        writer.close()
+
+
+async def watch_headless(host, port, log):
+    """
+    This function follows a stream without a window and reports the state at its end.
+
+    :return: Watcher
+    """
+
+    watcher = Watcher()
+    async for kind, payload in receive(host, port):
+        watcher.apply(kind, payload)
+        if watcher.done:
+            print(watcher, file=log)
+    return watcher
+
+
+def watch_window(host, port):
+    """
+    This function shows a stream in a Tk window. The messages are received in a thread and drawn once per frame.
+
+    :return: Watcher
+    """
+
+    import tkinter
+    from . import layout
+    from . import render
+
+    messages = queue.Queue()
+
+    def network():
+        async def run():
+            async for item in receive(host, port):
+                messages.put(item)
+        try:
+            asyncio.run(run())
+        except OSError as error:
+            messages.put((None, str(error)))
+        messages.put((None, "connection closed"))
+
+    main = tkinter.Tk()
+    main.title(f"Sorting stream {host}:{port}")
+    canvas = tkinter.Canvas(main, width=1100, height=380, bg="#ffffff")
+    canvas.grid(row=0, column=0, padx=10, pady=10)
+    watcher = Watcher()
+    state = {"view": None, "caption": canvas.create_text(550, 370, text="connecting ...", font=("italic", 11, "normal"))}
+
+    def new_view(values):
+        canvas.delete("all")
+        state["caption"] = canvas.create_text(550, 370, font=("italic", 11, "normal"))
+        if len(values) <= render.BoxView.MAX_ELEMENTS:
+            return render.BoxView(canvas, values, "#5555ff", layout.Layout(len(values)))
+        return render.BarView(canvas, values, "#5555ff")
+
+    def frame():
+        view = state["view"]
+        while True:
+            try:
+                kind, payload = messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind is None:
+                canvas.itemconfig(state["caption"], text=f"{watcher}, {payload}")
+                return
+
+            events = watcher.apply(kind, payload)
+            if kind == KEYFRAME and (view is None or len(view) != len(watcher.values)):
+                view = state["view"] = new_view(watcher.values)
+            elif kind == KEYFRAME:
+                view.clear_highlight()
+                view.show(watcher.values)
+            elif events:
+                view.clear_highlight()
+                for op, a, b in events:
+                    render.show_event(view, op, a, b)
+            if watcher.done:
+                view.color_range(0, len(view), "#00ff00")
+
+        if view is not None:
+            view.flush()
+            canvas.itemconfig(state["caption"], text=str(watcher))
+        main.after(1000 // FRAME_RATE, frame)
+
+    threading.Thread(target=network, daemon=True).start()
+    main.after(0, frame)
+    main.mainloop()
+    return watcher
+
+
+def main(argv=None):
+    """
+    Command line entry point: serve a sort to viewers or watch a served sort.
+
+    :param argv: Arguments without the program name, None for sys.argv
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="stream", description="Stream one sort to many viewers over local TCP.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="record a sort and play it to all connected viewers")
+    serve.add_argument("--algorithm", default="Quick Sort (Hoare)", choices=list(sort_engine.ALGORITHMS), metavar="NAME")
+    serve.add_argument("--size", type=int, default=1000, help="number of elements")
+    serve.add_argument("--distribution", default="uniform", choices=list(distributions.DISTRIBUTIONS))
+    serve.add_argument("--seed", type=int, default=0)
+    serve.add_argument("--trace", metavar="PATH", help="play a trace file instead of recording a sort")
+    serve.add_argument("--rate", type=float, default=1000, help="events per second (default: 1000)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=PORT, help=f"TCP port, 0 for any (default: {PORT})")
+    serve.add_argument("--viewers", type=int, default=0, help="wait for this many viewers before playing")
+    serve.add_argument("--repeat", action="store_true", help="play the sort again and again")
+
+    watch = commands.add_parser("watch", help="show a served sort")
+    watch.add_argument("--host", default="127.0.0.1")
+    watch.add_argument("--port", type=int, default=PORT)
+    watch.add_argument("--headless", action="store_true", help="no window, print the state at the end")
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        if args.headless:
+            watcher = asyncio.run(watch_headless(args.host, args.port, sys.stdout))
+        else:
+            watcher = watch_window(args.host, args.port)
+        return 0 if watcher.done and watcher.values == sorted(watcher.values) else 1
+
+    if args.trace:
+        trace = replay.load(args.trace)[0]
+    else:
+        values = distributions.generate(args.distribution, args.size, args.seed)
+        trace = sort_engine.record(sort_engine.ALGORITHMS[args.algorithm], values, args.algorithm)
+    server = Server(trace, args.rate, repeat=args.repeat)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.viewers, sys.stderr))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Instrumented array which counts every element access of an algorithm.
+
+The algorithms in sort_engine sort any mutable sequence; wrapping the input in a TrackedArray counts
+the reads and writes they really do, not the ones derived from the events, and records how far apart
+consecutive accesses are as a proxy for cache locality. Uninstrumented runs pass the plain sequence,
+so there is no cost when the instrumentation is off.
+"""
+
+from array import array
+
+
+### Buckets of the access-distance histogram: bucket k counts distances in [2^(k-1), 2^k), bucket 0 distance 0
+BUCKETS = 64
+
+### Accesses at least this many elements away from the previous one likely miss the cache line (8 int64 = 64 bytes)
+FAR = 8
+
+
+class TrackedArray:
+    """
+    Wraps a mutable sequence and counts reads, writes and the distances between consecutive accesses.
+    """
+
+    __slots__ = ("data", "reads", "writes", "last", "histogram")
+
+    def __init__(self, data):
+        """
+        Init tracked array; the data is sorted in place through the wrapper
+
+        :param data: Mutable sequence, e.g. array('q') or list
+        """
+
+        self.data = data
+        self.reads = 0
+        self.writes = 0
+        self.last = 0
+        self.histogram = array("q", bytes(8 * BUCKETS))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if index.__class__ is slice:
+            indices = range(*index.indices(len(self.data)))
+            for i in indices:
+                self._access(i)
+            self.reads += len(indices)
+            return self.data[index]
+
+        if index < 0:
+            index += len(self.data)
+        self.reads += 1
+        self.histogram[abs(index - self.last).bit_length()] += 1
+        self.last = index
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += len(self.data)
+        self.writes += 1
+        self.histogram[abs(index - self.last).bit_length()] += 1
+        self.last = index
+        self.data[index] = value
+
+    def __iter__(self):
+        for i in range(len(self.data)):
+            yield self[i]
+
+    def _access(self, index):
+        """
+        This function records the distance of an access without counting it as read or write.
+
+        :param index: Index of the access
+        :return: None
+        """
+
+        self.histogram[abs(index - self.last).bit_length()] += 1
+        self.last = index
+
+    def accesses(self):
+        """
+        :return: Number of reads and writes
+        """
+
+        return self.reads + self.writes
+
+    def far_share(self, distance=FAR):
+        """
+        :param distance: Minimum distance of a far access
+        :return: Share of the accesses at least the distance away from the previous access, 0.0 without accesses
+        """
+
+        total = sum(self.histogram)
+        if not total:
+            return 0.0
+        return sum(self.histogram[distance.bit_length():]) / total
+
+    def trimmed_histogram(self):
+        """
+        :return: The histogram as list without the empty buckets at the end
+        """
+
+        histogram = list(self.histogram)
+        while histogram and not histogram[-1]:
+            histogram.pop()
+        return histogram
@@ -0,0 +1,37 @@
+import unittest
+
+from sorting_visualizer import debugger
+from sorting_visualizer import distributions
+from sorting_visualizer import replay
+from sorting_visualizer import sort_engine
+
+
+class UndoTest(unittest.TestCase):
+
+    def test_undo_restores_previous_state(self):
+        values = distributions.generate("nearly-sorted", 150, seed=3)
+        for name in ("Merge Sort", "Heap Sort", "Radix Sort (LSD)", "Tim Sort"):
+            with self.subTest(algorithm=name):
+                trace = sort_engine.record(sort_engine.ALGORITHMS[name], values, name)
+                keyframes = replay.Keyframes(trace, interval=50)
+                log = debugger.undo_log(trace)
+
+                ### Step backwards from the end as the GUI does and compare with the replay up to each step
+                values_now, metrics = keyframes.seek(len(trace))
+                for step in reversed(range(len(trace))):
+                    op, a, b = trace[step]
+                    old = log[step]
+                    if op == sort_engine.WRITE:
+                        values_now[a] = old
+                    else:
+                        sort_engine.apply_event(values_now, op, a, b)
+                    metrics.uncount(op, a, b, old)
+                    if step % 23 == 0:
+                        expected_values, expected_metrics = keyframes.seek(step)
+                        self.assertEqual(values_now, expected_values)
+                        self.assertEqual(metrics.snapshot(), expected_metrics.snapshot())
+                self.assertEqual(values_now, list(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
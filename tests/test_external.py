@@ -0,0 +1,54 @@
+from array import array
+import os
+import random
+import tempfile
+import unittest
+
+from sorting_visualizer import external
+
+
+class ExternalTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        rng = random.Random(4)
+        self.values = [rng.randrange(-1000, 1000) for _ in range(1000)]
+
+    def sort(self, width, **options):
+        source = os.path.join(self.directory, "input")
+        target = os.path.join(self.directory, "output")
+        with open(source, "wb") as file:
+            file.write(array(external.TYPECODES[width], self.values))
+
+        events = external.sort_file(source, target, width=width, **options)
+        stats = external.complete(events)
+
+        with open(target, "rb") as file:
+            result = array(external.TYPECODES[width], file.read())
+        self.assertEqual(list(result), sorted(self.values))
+        self.assertEqual(sorted(os.listdir(self.directory)), ["input", "output"])
+        return stats
+
+    def test_sort_file(self):
+        for width in external.TYPECODES:
+            with self.subTest(width=width):
+                stats = self.sort(width, memory=100 * width, fan_in=3, buffer=16 * width)
+                self.assertEqual(stats.items, len(self.values))
+                self.assertEqual(stats.runs, 10)
+                self.assertEqual(stats.passes, 4)
+
+    def test_one_run(self):
+        stats = self.sort(8)
+        self.assertEqual((stats.runs, stats.passes), (1, 1))
+
+    def test_record(self):
+        trace, stats = external.record(self.values, runs=8, fan_in=4)
+        self.assertEqual(list(trace.initial), self.values)
+        self.assertEqual(trace.final(), sorted(self.values))
+        self.assertEqual(stats.runs, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
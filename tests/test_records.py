@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+
+from sorting_visualizer import records
+
+
+class RecordsTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write("\n".join(lines) + "\n")
+        return path
+
+    def test_csv_integer_keys(self):
+        path = self.write("orders.csv", ["id,price"] + [f"{row},{row * 7 % 5}" for row in range(40)])
+        table = records.load(path, "price")
+        self.assertEqual(len(table), 40)
+        self.assertIsNone(table.distinct)
+        self.assertEqual(list(table.keys), [row * 7 % 5 for row in range(40)])
+
+        rows = records.order(table.keys)
+        self.assertEqual(records.unstable_pairs(table.keys, rows), 0)
+
+        output = os.path.join(self.directory, "sorted.csv")
+        records.write(table, rows, output)
+        with open(output, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines[0], "id,price")
+        self.assertEqual([int(line.split(",")[1]) for line in lines[1:]], sorted(table.keys))
+
+    def test_jsonl_text_keys_are_ranks(self):
+        users = ["carol", "alice", "bob", "alice", "carol", "dave"]
+        path = self.write("events.jsonl", [json.dumps({"user": user, "n": n}) for n, user in enumerate(users)])
+        table = records.load(path, "user")
+        self.assertEqual(table.distinct, 4)
+        self.assertEqual(list(table.keys), [2, 0, 1, 0, 2, 3])
+
+    def test_integers_beyond_64_bits(self):
+        values = [5, 2**63, -2**63 - 1, 2**63 - 1, -2**63, 0]
+        path = self.write("big.csv", ["key"] + [str(value) for value in values])
+        table = records.load(path, "key")
+        self.assertEqual(table.distinct, len(values))
+        self.assertEqual([values[row] for row in records.order(table.keys)], sorted(values))
+
+    def test_stability_detection(self):
+        keys = [row % 3 for row in range(60)]
+        path = self.write("keys.csv", ["key"] + [str(key) for key in keys])
+        table = records.load(path, "key")
+
+        for name in ("Merge Sort", "Insertion Sort", "Tim Sort"):
+            with self.subTest(algorithm=name):
+                rows = records.algorithm_order(name, table.keys)
+                self.assertEqual([keys[row] for row in rows], sorted(keys))
+                self.assertEqual(records.unstable_pairs(table.keys, rows), 0)
+
+        for name in ("Heap Sort", "Selection Sort", "Quick Sort (Hoare)"):
+            with self.subTest(algorithm=name):
+                rows = records.algorithm_order(name, table.keys)
+                self.assertEqual([keys[row] for row in rows], sorted(keys))
+                self.assertGreater(records.unstable_pairs(table.keys, rows), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
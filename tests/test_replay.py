@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from sorting_visualizer import distributions
+from sorting_visualizer import replay
+from sorting_visualizer import sort_engine
+from sorting_visualizer.metrics import Metrics
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        values = distributions.generate("uniform", 200, seed=2)
+        self.trace = sort_engine.record(sort_engine.ALGORITHMS["Merge Sort"], values, "Merge Sort")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "merge.trace")
+
+    def assertSameTrace(self, loaded, trace):
+        self.assertEqual(loaded.algorithm, trace.algorithm)
+        self.assertEqual(list(loaded.initial), list(trace.initial))
+        self.assertEqual(list(loaded.ops), list(trace.ops))
+
+    def test_round_trip(self):
+        keyframes = replay.save(self.path, self.trace, replay.Keyframes(self.trace, interval=100))
+        trace, loaded = replay.load(self.path)
+        self.assertSameTrace(trace, self.trace)
+        self.assertEqual(loaded.interval, keyframes.interval)
+        self.assertEqual(list(loaded.steps), keyframes.steps)
+        self.assertEqual(trace.final(), sorted(self.trace.initial))
+
+    def test_save_over_loaded_file(self):
+        replay.save(self.path, self.trace)
+        trace, keyframes = replay.load(self.path)
+        replay.save(self.path, trace, keyframes)
+
+        ### The first mapping still reads the old file
+        self.assertSameTrace(trace, self.trace)
+        self.assertEqual(keyframes.seek(len(trace))[0], sorted(self.trace.initial))
+        self.assertSameTrace(replay.load(self.path)[0], self.trace)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.path))], ["merge.trace"])
+
+    def test_truncated_file(self):
+        replay.save(self.path, self.trace)
+        size = os.path.getsize(self.path)
+        for length in (0, replay.HEADER.size - 1, replay.HEADER.size, size - 8, size - 1):
+            with self.subTest(length=length):
+                with open(self.path, "r+b") as file:
+                    file.truncate(length)
+                with self.assertRaises(ValueError):
+                    replay.load(self.path)
+
+    def test_seek_equals_linear_replay(self):
+        keyframes = replay.Keyframes(self.trace, interval=64)
+        values, metrics = list(self.trace.initial), Metrics()
+        for step, (op, a, b) in enumerate(self.trace.events()):
+            if step % 37 == 0:
+                seek_values, seek_metrics = keyframes.seek(step)
+                self.assertEqual(seek_values, values)
+                self.assertEqual(seek_metrics.snapshot(), metrics.snapshot())
+            sort_engine.apply_event(values, op, a, b)
+            metrics.count(op, a, b)
+
+        seek_values, seek_metrics = keyframes.seek(len(self.trace))
+        self.assertEqual(seek_values, values)
+        self.assertEqual(seek_metrics.snapshot(), metrics.snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from sorting_visualizer import distributions
+from sorting_visualizer import sort_engine
+
+
+class AlgorithmsTest(unittest.TestCase):
+
+    def test_sorts_and_replays(self):
+        for distribution in ("uniform", "reversed", "few-unique", "sawtooth"):
+            values = distributions.generate(distribution, 300, seed=1)
+            for name, algorithm in sort_engine.ALGORITHMS.items():
+                with self.subTest(algorithm=name, distribution=distribution):
+                    data = list(values)
+                    for event in algorithm(data):
+                        pass
+                    self.assertEqual(data, sorted(values))
+
+                    trace = sort_engine.record(algorithm, values, name)
+                    self.assertEqual(list(trace.initial), list(values))
+                    self.assertEqual(trace.final(), sorted(values))
+
+    def test_small_inputs(self):
+        for values in ([], [1], [2, 1], [1, 1, 1]):
+            for name, algorithm in sort_engine.ALGORITHMS.items():
+                with self.subTest(algorithm=name, values=values):
+                    self.assertEqual(sort_engine.record(algorithm, values).final(), sorted(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import unittest
+
+from sorting_visualizer import distributions
+from sorting_visualizer import replay
+from sorting_visualizer import sort_engine
+from sorting_visualizer import stream
+
+
+def split(data):
+    """
+    :return: List of (kind, payload) of concatenated messages
+    """
+
+    messages, position = list(), 0
+    while position < len(data):
+        kind, length = stream.HEADER.unpack_from(data, position)
+        position += stream.HEADER.size
+        messages.append((kind, data[position:position + length]))
+        position += length
+    return messages
+
+
+class StreamTest(unittest.TestCase):
+
+    def setUp(self):
+        values = distributions.generate("uniform", 100, seed=5)
+        self.trace = sort_engine.record(sort_engine.ALGORITHMS["Quick Sort (Hoare)"], values, "Quick Sort (Hoare)")
+        self.server = stream.Server(self.trace, rate=1000)
+
+    def test_delta_round_trip(self):
+        step, events = stream.decode_delta(split(stream.encode_delta(self.trace.ops, 10, 60))[0][1])
+        self.assertEqual(step, 10)
+        self.assertEqual(list(events), list(self.trace.events(10, 60)))
+
+    def test_decode(self):
+        steps = len(self.trace)
+        middle = steps // 2
+        data = (self.server.hello + self.server.keyframe(0)
+                + stream.encode_delta(self.trace.ops, 0, middle)
+                + stream.encode_delta(self.trace.ops, middle, steps)
+                + stream.message(stream.END, stream.STEP.pack(steps)))
+        messages = split(data)
+        self.assertEqual([kind for kind, payload in messages],
+                         [stream.HELLO, stream.KEYFRAME, stream.DELTA, stream.DELTA, stream.END])
+        self.assertEqual(json.loads(messages[0][1])["steps"], steps)
+
+        watcher = stream.Watcher()
+        for kind, payload in messages:
+            watcher.apply(kind, payload)
+        values, metrics = replay.Keyframes(self.trace).seek(steps)
+        self.assertEqual((watcher.algorithm, watcher.elements, watcher.steps), ("Quick Sort (Hoare)", 100, steps))
+        self.assertEqual(watcher.values, values)
+        self.assertEqual(watcher.metrics.snapshot(), metrics.snapshot())
+        self.assertEqual((watcher.step, watcher.frames, watcher.keyframes, watcher.done), (steps, 2, 1, True))
+
+    def test_resync_with_keyframe(self):
+        step = len(self.trace) // 3
+        watcher = stream.Watcher()
+        for kind, payload in split(self.server.hello + self.server.keyframe(step)):
+            watcher.apply(kind, payload)
+        self.assertEqual(watcher.step, step)
+        self.assertEqual(watcher.values, self.server.keyframes.seek(step)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()